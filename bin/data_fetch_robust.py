@@ -20,11 +20,14 @@ import time
 import json
 import logging
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 import requests
+import numpy as np
 import pandas as pd
 import sqlalchemy
 from sqlalchemy import create_engine, text
@@ -36,6 +39,7 @@ CONFIG = {
     'max_retries': 3,                # 最大重试次数
     'retry_delay': 5,                # 重试延迟（秒）
     'log_level': 'INFO',
+    'postgres_probe_timeout': 3,     # PostgreSQL可达性探测超时（秒）
     'postgres_config': {
         'host': 'localhost',
         'port': 5432,
@@ -45,6 +49,38 @@ CONFIG = {
     }
 }
 
+# 缓存CSV列定义 - 显式声明列和类型，跳过pandas的类型推断
+# 读取时按列名过滤（usecols传可调用对象），旧版缓存缺少某列时照常读取
+NCBI_DTYPES = {
+    'id': 'string',
+    'sequence': 'string',
+    'length': 'Int64',
+    'fetched_at': 'string'
+}
+GEO_DTYPES = {
+    'geo_id': 'string',
+    'title': 'string',
+    'organisms': 'string',
+    'source': 'string',
+    'fetched_at': 'string'
+}
+HSD_DTYPES = {
+    'peptide_id': 'string',
+    'secretion_level': 'float64',
+    'units': 'string',
+    'cell_line': 'string',
+    'experimental_condition': 'string',
+    'fetched_at': 'string'
+}
+
+# 合并数据中的来源标签，使用分类类型存储（每行1字节编码）
+DATA_SOURCE_CATEGORIES = ['NCBI', 'GEO', 'HSD']
+
+def _data_source_column(source: str, length: int) -> pd.Categorical:
+    """构造长度为length、取值恒为source的分类列"""
+    codes = np.full(length, DATA_SOURCE_CATEGORIES.index(source), dtype=np.int8)
+    return pd.Categorical.from_codes(codes, categories=DATA_SOURCE_CATEGORIES)
+
 @dataclass
 class FetchResult:
     """数据获取操作结果容器"""
@@ -272,12 +308,20 @@ class DataFetcher:
         self.protein_id = protein_id
         self.force_refresh = force_refresh  # 强制刷新缓存
         self.cache = DataCache(CONFIG['cache_base_dir'])
-        self.api_client = RobustAPIClient(CONFIG['request_timeout'])
+        self._local = threading.local()
         self.results: List[FetchResult] = []
         
         # 设置日志
         self._setup_logging()
     
+    @property
+    def api_client(self) -> RobustAPIClient:
+        """当前线程的API客户端（requests.Session不保证线程安全，每个线程各用一个）"""
+        client = getattr(self._local, 'api_client', None)
+        if client is None:
+            client = self._local.api_client = RobustAPIClient(CONFIG['request_timeout'])
+        return client
+    
     def _setup_logging(self):
         """设置综合日志"""
         log_dir = Path('logs')
@@ -789,26 +833,29 @@ class DataFetcher:
             # 加载NCBI数据
             ncbi_cache = self.cache.get_cache_dir('ncbi') / 'sequence_cache.csv'
             if ncbi_cache.exists():
-                ncbi_df = pd.read_csv(ncbi_cache, encoding='utf-8')
-                ncbi_df['data_source'] = 'NCBI'
+                ncbi_df = pd.read_csv(ncbi_cache, usecols=lambda c: c in NCBI_DTYPES,
+                                      dtype=NCBI_DTYPES, engine='c', encoding='utf-8')
+                ncbi_df['data_source'] = _data_source_column('NCBI', len(ncbi_df))
                 merged_data.append(ncbi_df)
             
             # 加载GEO数据
             geo_cache = self.cache.get_cache_dir('geo') / 'geo_cache.csv'
             if geo_cache.exists():
-                geo_df = pd.read_csv(geo_cache, encoding='utf-8')
-                geo_df['data_source'] = 'GEO'
+                geo_df = pd.read_csv(geo_cache, usecols=lambda c: c in GEO_DTYPES,
+                                     dtype=GEO_DTYPES, engine='c', encoding='utf-8')
+                geo_df['data_source'] = _data_source_column('GEO', len(geo_df))
                 merged_data.append(geo_df)
             
             # 加载HSD数据
             hsd_cache = self.cache.get_cache_dir('hsd') / 'hsd_cache.csv'
             if hsd_cache.exists():
-                hsd_df = pd.read_csv(hsd_cache, encoding='utf-8')
-                hsd_df['data_source'] = 'HSD'
+                hsd_df = pd.read_csv(hsd_cache, usecols=lambda c: c in HSD_DTYPES,
+                                    dtype=HSD_DTYPES, engine='c', encoding='utf-8')
+                hsd_df['data_source'] = _data_source_column('HSD', len(hsd_df))
                 merged_data.append(hsd_df)
             
             if merged_data:
-                final_df = pd.concat(merged_data, ignore_index=True)
+                final_df = pd.concat(merged_data, ignore_index=True, copy=False)
                 logging.info(f"成功合并 {len(merged_data)} 个数据源")
                 return final_df
             else:
@@ -823,9 +870,26 @@ class DataFetcher:
         """保存合并数据到PostgreSQL数据库（可选）"""
         logging.info("尝试保存数据到PostgreSQL...")
         
+        pg_config = CONFIG['postgres_config']
+        
+        # 快速探测数据库是否可达，避免create_engine/to_sql在TCP重试上长时间阻塞
+        try:
+            import psycopg2
+            psycopg2.connect(
+                host=pg_config['host'],
+                port=pg_config['port'],
+                user=pg_config['user'],
+                password=pg_config['password'],
+                dbname=pg_config['database'],
+                connect_timeout=CONFIG['postgres_probe_timeout']
+            ).close()
+        except Exception as e:
+            logging.warning(f"PostgreSQL不可达，跳过保存（这是可选的）: {str(e)}")
+            logging.info("数据已保存到本地缓存文件，PostgreSQL连接失败不影响工作流执行")
+            return False
+        
         try:
             # 创建数据库连接
-            pg_config = CONFIG['postgres_config']
             connection_string = f"postgresql://{pg_config['user']}:{pg_config['password']}@{pg_config['host']}:{pg_config['port']}/{pg_config['database']}"
             
             engine = create_engine(connection_string)
@@ -854,89 +918,75 @@ class DataFetcher:
                 logging.warning("NCBI序列缓存文件不存在，跳过target_proteins表更新")
                 return
             
-            import pandas as pd
             sequences_df = pd.read_csv(ncbi_cache_file)
             
-            with engine.connect() as conn:
-                # 清空target_proteins表
-                conn.execute(text("DELETE FROM target_proteins"))
-                conn.commit()
-                
-                # 插入新的蛋白质数据
-                for _, row in sequences_df.iterrows():
-                    if 'Error' in str(row['sequence']):
-                        continue  # 跳过错误的序列
-                    
-                    # 解析蛋白质信息
-                    protein_info = self._parse_protein_info(row['id'], row['sequence'])
-                    
-                    # 插入到target_proteins表
-                    conn.execute(text("""
+            # 整列解析后批量插入
+            protein_df = self._parse_protein_frame(sequences_df)
+            protein_df['created_at'] = datetime.now()
+            rows = list(protein_df.itertuples(index=False, name=None))
+            
+            # 清空与插入在同一个原生连接的同一事务中完成，插入失败时旧数据随回滚保留
+            conn = engine.raw_connection()
+            try:
+                cursor = conn.cursor()
+                cursor.execute("DELETE FROM target_proteins")
+                if rows:
+                    from psycopg2.extras import execute_values
+                    execute_values(cursor, """
                         INSERT INTO target_proteins 
                         (protein_id, protein_name, gene_name, sequence, organism, uniprot_id, created_at)
-                        VALUES (:protein_id, :protein_name, :gene_name, :sequence, :organism, :uniprot_id, :created_at)
-                    """), {
-                        'protein_id': protein_info['protein_id'],
-                        'protein_name': protein_info['protein_name'],
-                        'gene_name': protein_info['gene_name'],
-                        'sequence': protein_info['sequence'],
-                        'organism': protein_info['organism'],
-                        'uniprot_id': protein_info['uniprot_id'],
-                        'created_at': datetime.now()
-                    })
-                
+                        VALUES %s
+                    """, rows)
                 conn.commit()
-                logging.info(f"成功更新target_proteins表，插入了 {len(sequences_df)} 个蛋白质记录")
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.close()
+            
+            logging.info(f"成功更新target_proteins表，插入了 {len(protein_df)} 个蛋白质记录")
                 
         except Exception as e:
             logging.error(f"保存蛋白质数据到target_proteins表失败: {e}")
     
-    def _parse_protein_info(self, protein_id: str, sequence: str) -> Dict[str, str]:
-        """解析蛋白质信息"""
-        # 从FASTA序列中提取信息
-        lines = sequence.strip().split('\n')
-        header = lines[0] if lines else ""
+    def _parse_protein_frame(self, sequences_df: pd.DataFrame) -> pd.DataFrame:
+        """使用向量化字符串操作批量解析蛋白质信息，跳过错误序列"""
+        # UniProt格式: >sp|Q8K4Z2.2|FNDC5_MOUSE RecName: Full=Fibronectin type III domain-containing protein 5
+        raw = sequences_df['sequence'].astype(str)
+        keep = ~raw.str.contains('Error', regex=False)
+        raw = raw[keep]
+        protein_ids = sequences_df['id'][keep].astype(str)
         
-        # 提取蛋白质名称和基因名称
-        protein_name = ""
-        gene_name = ""
-        organism = ""
-        uniprot_id = protein_id
+        # 拆分FASTA头部和序列主体
+        lines = raw.str.strip().str.split('\n', n=1, expand=True).reindex(columns=range(2))
+        header = lines[0].fillna('')
+        body = lines[1]
         
-        if "|" in header:
-            # UniProt格式: >sp|Q8K4Z2.2|FNDC5_MOUSE RecName: Full=Fibronectin type III domain-containing protein 5
-            parts = header.split("|")
-            if len(parts) >= 3:
-                uniprot_id = parts[1]
-                protein_desc = parts[2]
-                
-                # 提取基因名称
-                if "_" in protein_desc:
-                    gene_name = protein_desc.split("_")[0]
-                
-                # 提取蛋白质名称
-                if "RecName: Full=" in protein_desc:
-                    protein_name = protein_desc.split("RecName: Full=")[1].split(";")[0]
-                else:
-                    protein_name = protein_desc.split()[0] if protein_desc.split() else protein_id
-                
-                # 提取物种信息
-                if "MOUSE" in protein_desc:
-                    organism = "Mus musculus"
-                elif "HUMAN" in protein_desc:
-                    organism = "Homo sapiens"
+        parts = header.str.split('|', n=3, expand=True).reindex(columns=range(3))
+        has_desc = parts[2].notna()
+        desc = parts[2].fillna('')
         
-        # 清理序列（移除FASTA头部）
-        clean_sequence = ''.join(lines[1:]) if len(lines) > 1 else sequence
+        # 提取基因名称和蛋白质名称
+        gene_name = desc.str.split('_').str[0].where(desc.str.contains('_', regex=False), '')
+        rec_name = desc.str.extract(r'RecName: Full=([^;]*)', expand=False)
+        protein_name = rec_name.fillna(desc.str.split().str[0]).fillna(protein_ids)
         
-        return {
-            'protein_id': protein_id,
-            'protein_name': protein_name,
-            'gene_name': gene_name,
-            'sequence': clean_sequence,
-            'organism': organism,
-            'uniprot_id': uniprot_id
-        }
+        # 提取物种信息
+        organism = np.select(
+            [desc.str.contains('MOUSE', regex=False), desc.str.contains('HUMAN', regex=False)],
+            ['Mus musculus', 'Homo sapiens'],
+            default=''
+        )
+        
+        return pd.DataFrame({
+            'protein_id': protein_ids,
+            'protein_name': protein_name.where(has_desc, ''),
+            'gene_name': gene_name.where(has_desc, ''),
+            # 清理序列（移除FASTA头部）
+            'sequence': body.str.replace('\n', '', regex=False).where(body.notna(), raw),
+            'organism': np.where(has_desc, organism, ''),
+            'uniprot_id': parts[1].where(has_desc, protein_ids)
+        }).reset_index(drop=True)
     
     def generate_excel_report(self, df: pd.DataFrame) -> str:
         """生成带错误详情的Excel报告"""
@@ -955,28 +1005,26 @@ class DataFetcher:
                 df.to_excel(writer, sheet_name='Peptide_Data', index=False)
                 
                 # 汇总表（带错误详情）
-                summary_data = []
-                for result in self.results:
-                    summary_data.append({
-                        'Data_Source': result.source,
-                        'Success': result.success,
-                        'Records_Count': result.records_count,
-                        'Error_Message': result.error_message or 'None',
-                        'Duration_Seconds': round(result.duration, 2),
-                        'Cache_Path': result.cache_path or 'N/A'
-                    })
+                summary_data = {
+                    'Data_Source': [r.source for r in self.results],
+                    'Success': [r.success for r in self.results],
+                    'Records_Count': [r.records_count for r in self.results],
+                    'Error_Message': [r.error_message or 'None' for r in self.results],
+                    'Duration_Seconds': [round(r.duration, 2) for r in self.results],
+                    'Cache_Path': [r.cache_path or 'N/A' for r in self.results]
+                }
                 
                 summary_df = pd.DataFrame(summary_data)
                 summary_df.to_excel(writer, sheet_name='Summary', index=False)
                 
-                # 错误日志表
+                # 错误日志表 - 直接逐行写入openpyxl工作表，无需构造DataFrame
                 error_log_path = 'logs/error.log'
                 if Path(error_log_path).exists():
+                    ws_err = writer.book.create_sheet('Error_Log')
+                    ws_err.append(['Error_Log'])
                     with open(error_log_path, 'r', encoding='utf-8') as f:
-                        error_lines = f.readlines()
-                    
-                    error_df = pd.DataFrame({'Error_Log': error_lines})
-                    error_df.to_excel(writer, sheet_name='Error_Log', index=False)
+                        for line in f:
+                            ws_err.append([line.rstrip('\n')])
             
             logging.info(f"Excel报告已生成: {report_file}")
             return report_file
@@ -990,29 +1038,41 @@ class DataFetcher:
         logging.info("开始健壮数据获取流程...")
         overall_start = time.time()
         
-        # 定义获取任务
-        fetch_tasks = [
-            ('NCBI序列获取', self.fetch_ncbi_sequences),
-            ('PDB结构获取', self.fetch_pdb_structures),
-            ('GEO表达数据获取', self.fetch_geo_expressions),
-            ('HSD分泌数据获取', self.fetch_hsd_secretion)
+        # 定义获取任务，按访问的服务分组：同组任务依次执行，不同组并发执行
+        # NCBI序列与GEO表达数据都调用NCBI eutils，放在同一组，避免合计超过NCBI的请求频率限制
+        task_groups = [
+            [('NCBI序列获取', self.fetch_ncbi_sequences),
+             ('GEO表达数据获取', self.fetch_geo_expressions)],
+            [('PDB结构获取', self.fetch_pdb_structures)],
+            [('HSD分泌数据获取', self.fetch_hsd_secretion)]
         ]
+        fetch_tasks = [task for group in task_groups for task in group]
         
         # 执行任务并跟踪进度
         print(f"\n🚀 开始获取 {len(fetch_tasks)} 个数据源的数据...")
+        print("📡 " + " | ".join(" → ".join(name for name, _ in group) for group in task_groups))
         
-        for i, (task_name, fetch_func) in enumerate(fetch_tasks):
-            print(f"\n📡 {task_name}...")
-            result = fetch_func()
-            self.results.append(result)
-            
-            # 状态更新
-            if result.success:
-                print(f"✅ {task_name} 完成: {result.records_count} 条记录")
-            else:
-                print(f"❌ {task_name} 失败: {result.error_message}")
+        def run_group(group):
+            # 每个工作线程通过 api_client 属性使用自己的Session
+            return [(task_name, fetch_func()) for task_name, fetch_func in group]
+        
+        # 每个任务写入各自的缓存目录；完成时逐条打印，每行都带任务名
+        task_results = {}
+        with ThreadPoolExecutor(max_workers=len(task_groups)) as executor:
+            futures = [executor.submit(run_group, group) for group in task_groups]
             
-            print(f"   耗时: {result.duration:.2f}秒")
+            for future in as_completed(futures):
+                for task_name, result in future.result():
+                    task_results[task_name] = result
+                    
+                    # 状态更新
+                    if result.success:
+                        print(f"✅ {task_name} 完成: {result.records_count} 条记录 (耗时 {result.duration:.2f}秒)")
+                    else:
+                        print(f"❌ {task_name} 失败: {result.error_message} (耗时 {result.duration:.2f}秒)")
+        
+        # 按任务定义顺序保存结果，保证汇总表顺序稳定
+        self.results.extend(task_results[task_name] for task_name, _ in fetch_tasks)
         
         # 处理结果
         print(f"\n📊 处理结果...")
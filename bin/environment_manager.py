@@ -10,13 +10,21 @@ for environment setup, validation, and management.
 import os
 import sys
 import json
+import time
+import site
+import hashlib
 import subprocess
 import platform
 import importlib
+import shutil
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import logging
 
+# Seconds a cached environment report stays valid
+REPORT_CACHE_TTL = 3600
+
 class PeptideEnvironmentManager:
     """Main class for managing the peptide development environment"""
     
@@ -81,21 +89,71 @@ class PeptideEnvironmentManager:
             
     def verify_command_line_tool(self, command: str) -> Tuple[bool, str]:
         """Verify if a command line tool is available"""
+        if shutil.which(command) is None:
+            return False, "Not available"
         try:
             result = subprocess.run([command, '--version'], 
-                                  capture_output=True, text=True, check=True)
-            return True, result.stdout.strip()
-        except (subprocess.CalledProcessError, FileNotFoundError):
+                                  capture_output=True, text=True,
+                                  timeout=5, check=False)
+        except (subprocess.TimeoutExpired, OSError):
             return False, "Not available"
+        output = (result.stdout or result.stderr).strip()
+        version = output.splitlines()[0] if output else "Not available"
+        return result.returncode == 0, version
             
-    def create_comprehensive_report(self) -> str:
-        """Generate comprehensive environment validation report"""
-        
-        # System info
-        system_info = self.get_system_info()
+    def _environment_key(self) -> str:
+        """Hash the interpreter, PATH and installed package state"""
+        key_parts = [sys.executable, os.environ.get('PATH', ''),
+                     os.environ.get('CONDA_DEFAULT_ENV', '')]
+        
+        # Package installs/removals touch these directories
+        package_dirs = [Path(sys.prefix) / 'conda-meta']
+        package_dirs.extend(Path(p) for p in site.getsitepackages())
+        for package_dir in package_dirs:
+            if package_dir.exists():
+                key_parts.append(str(package_dir.stat().st_mtime_ns))
+                
+        return hashlib.sha256('|'.join(key_parts).encode()).hexdigest()
+        
+    def create_comprehensive_report(self, use_cache: bool = True) -> str:
+        """Generate comprehensive environment validation report
+        
+        The check results are cached in the config directory keyed by the
+        environment hash and reused for REPORT_CACHE_TTL seconds; the report
+        text, including its timestamp, is rendered fresh on every call.
+        """
+        cache_path = self.config_dir / f'report_{self._environment_key()}.json'
+        checks = None
+        
+        if use_cache and cache_path.exists():
+            if time.time() - cache_path.stat().st_mtime < REPORT_CACHE_TTL:
+                try:
+                    with open(cache_path, 'r') as f:
+                        checks = json.load(f)['checks']
+                except (OSError, ValueError, KeyError):
+                    self.logger.warning(f"Ignoring unreadable report cache {cache_path}")
+                    
+        if checks is None:
+            checks = self._run_environment_checks()
+            
+            try:
+                with open(cache_path, 'w') as f:
+                    json.dump({'checks': checks}, f)
+            except OSError as e:
+                self.logger.warning(f"Could not write report cache {cache_path}: {e}")
+            
+            # Caches for earlier environment states can never be hit again
+            for stale_path in self.config_dir.glob('report_*.json'):
+                if stale_path != cache_path:
+                    try:
+                        stale_path.unlink()
+                    except OSError:
+                        pass
+            
+        return self._render_report(checks)
         
-        # Check conda environment
-        conda_env_ok = self.check_conda_environment()
+    def _run_environment_checks(self) -> Dict:
+        """Run all environment checks and return the JSON-serializable results"""
         
         # Define tools and packages to check
         command_line_tools = {
@@ -120,11 +178,33 @@ class PeptideEnvironmentManager:
             'psycopg2': 'Psycopg2',
         }
         
+        tools = []
+        for cmd, name in command_line_tools.items():
+            available, version = self.verify_command_line_tool(cmd)
+            tools.append([name, available, str(version)])
+            
+        packages = []
+        for package, name in python_packages.items():
+            installed, version = self.verify_package_installation(package)
+            packages.append([name, installed, str(version)])
+            
+        return {
+            'system_info': self.get_system_info(),
+            'conda_env_ok': self.check_conda_environment(),
+            'tools': tools,
+            'packages': packages,
+        }
+        
+    def _render_report(self, checks: Dict) -> str:
+        """Render the report text from environment check results"""
+        system_info = checks['system_info']
+        conda_env_ok = checks['conda_env_ok']
+        
         # Generate report
         report_lines = [
             "="*80,
             "PEPTIDE AI DEVELOPMENT ENVIRONMENT - COMPREHENSIVE REPORT",
-            f"Generated: {subprocess.run(['date'], capture_output=True, text=True).stdout.strip()}",
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
             "="*80,
             "",
             "SYSTEM INFORMATION:",
@@ -151,8 +231,7 @@ class PeptideEnvironmentManager:
             "-"*40,
         ])
         
-        for cmd, name in command_line_tools.items():
-            available, version = self.verify_command_line_tool(cmd)
+        for name, available, version in checks['tools']:
             status = "✓ AVAILABLE" if available else "✗ NOT FOUND"
             report_lines.append(f"{name:20} | {status}")
             if available and version:
@@ -166,8 +245,7 @@ class PeptideEnvironmentManager:
             "-"*40,
         ])
         
-        for package, name in python_packages.items():
-            installed, version = self.verify_package_installation(package)
+        for name, installed, version in checks['packages']:
             status = "✓ INSTALLED" if installed else "✗ NOT INSTALLED"
             report_lines.append(f"{name:20} | {status}")
             if installed and version:
@@ -243,6 +321,8 @@ Sample Peptide Analysis Script
 Demonstrates basic functionality of the peptide development environment
 """
 
+from collections import Counter
+
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -251,6 +331,36 @@ from Bio.Seq import Seq
 from Bio.Alphabet import generic_protein
 import streamlit as st
 
+# Amino acid weights in Daltons
+AA_WEIGHTS = {
+    'A': 89.09, 'R': 174.20, 'N': 132.12, 'D': 133.10, 'C': 121.16,
+    'Q': 146.15, 'E': 147.13, 'G': 75.07, 'H': 155.16, 'I': 131.17,
+    'L': 131.17, 'K': 146.19, 'M': 149.21, 'F': 165.19, 'P': 115.13,
+    'S': 105.09, 'T': 119.12, 'W': 204.23, 'Y': 181.19, 'V': 117.15
+}
+
+# Kyte-Doolittle hydropathy scale
+HYDROPATHY_SCALE = {
+    'A': 1.8, 'R': -4.5, 'N': -3.5, 'D': -3.5, 'C': 2.5,
+    'Q': -3.5, 'E': -3.5, 'G': -0.4, 'H': -3.2, 'I': 4.5,
+    'L': 3.8, 'K': -3.9, 'M': 1.9, 'F': 2.8, 'P': -1.6,
+    'S': -0.8, 'T': -0.7, 'W': -0.9, 'Y': -1.3, 'V': 4.2
+}
+
+def build_lookup_table(scale: dict) -> np.ndarray:
+    """Build a byte-indexed lookup table; unknown residues map to 0"""
+    table = np.zeros(256)
+    for aa, value in scale.items():
+        table[ord(aa)] = value
+    return table
+
+WEIGHT_TABLE = build_lookup_table(AA_WEIGHTS)
+HYDROPATHY_TABLE = build_lookup_table(HYDROPATHY_SCALE)
+
+def encode_peptide(peptide) -> np.ndarray:
+    """View the peptide sequence as an array of byte codes"""
+    return np.frombuffer(str(peptide).encode('ascii'), dtype=np.uint8)
+
 def analyze_peptide_sequence(sequence: str) -> dict:
     """Basic peptide sequence analysis"""
     
@@ -260,7 +370,7 @@ def analyze_peptide_sequence(sequence: str) -> dict:
         'sequence': str(peptide),
         'length': len(peptide),
         'molecular_weight': calculate_molecular_weight(peptide),
-        'amino_acid_composition': dict(peptide.count()),
+        'amino_acid_composition': dict(Counter(str(peptide))),
         'hydrophobicity': calculate_hydrophobicity(peptide),
     }
     
@@ -268,29 +378,13 @@ def analyze_peptide_sequence(sequence: str) -> dict:
 
 def calculate_molecular_weight(peptide):
     """Calculate approximate molecular weight"""
-    # Amino acid weights in Daltons
-    weights = {
-        'A': 89.09, 'R': 174.20, 'N': 132.12, 'D': 133.10, 'C': 121.16,
-        'Q': 146.15, 'E': 147.13, 'G': 75.07, 'H': 155.16, 'I': 131.17,
-        'L': 131.17, 'K': 146.19, 'M': 149.21, 'F': 165.19, 'P': 115.13,
-        'S': 105.09, 'T': 119.12, 'W': 204.23, 'Y': 181.19, 'V': 117.15
-    }
-    
     # Subtract water (18.015) for each peptide bond
-    total_weight = sum(weights.get(aa, 0) for aa in peptide)
+    total_weight = WEIGHT_TABLE[encode_peptide(peptide)].sum()
     return total_weight - (len(peptide) - 1) * 18.015
 
 def calculate_hydrophobicity(peptide):
     """Calculate hydrophobicity using Kyte-Doolittle scale"""
-    
-    hydropathy_scale = {
-        'A': 1.8, 'R': -4.5, 'N': -3.5, 'D': -3.5, 'C': 2.5,
-        'Q': -3.5, 'E': -3.5, 'G': -0.4, 'H': -3.2, 'I': 4.5,
-        'L': 3.8, 'K': -3.9, 'M': 1.9, 'F': 2.8, 'P': -1.6,
-        'S': -0.8, 'T': -0.7, 'W': -0.9, 'Y': -1.3, 'V': 4.2
-    }
-    
-    return sum(hydropathy_scale.get(aa, 0) for aa in peptide) / len(peptide)
+    return HYDROPATHY_TABLE[encode_peptide(peptide)].mean()
 
 def create_streamlit_app():
     """Create a simple Streamlit app for peptide analysis"""
@@ -395,6 +489,8 @@ def main():
     parser = argparse.ArgumentParser(description="Peptide Environment Manager")
     parser.add_argument('--report', action='store_true', 
                        help='Generate comprehensive environment report')
+    parser.add_argument('--no-cache', action='store_true',
+                       help='Ignore any cached report and re-run all checks')
     parser.add_argument('--test', action='store_true',
                        help='Run environment test')
     parser.add_argument('--sample-script', action='store_true',
@@ -405,7 +501,7 @@ def main():
     manager = PeptideEnvironmentManager()
     
     if args.report:
-        report = manager.create_comprehensive_report()
+        report = manager.create_comprehensive_report(use_cache=not args.no_cache)
         print(report)
         
         # Save report to file
@@ -14,17 +14,32 @@ Features:
 - Includes email sending functionality with SMTP
 """
 
+import io
 import os
+import copy
+import atexit
+import re
 import sys
+import mmap
+import time
+import queue
+import socket
+import threading
+import contextlib
+import base64
 import json
 import yaml
 import logging
 import argparse
-import smtplib
 import sqlite3
 import subprocess
+import functools
+import string
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Iterator, TYPE_CHECKING
 from pathlib import Path
 import pandas as pd
 import numpy as np
@@ -36,7 +51,7 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch, cm
 from reportlab.platypus import (
     SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-    PageBreak, Image, Frame, PageTemplate, NextPageTemplate
+    PageBreak, Image, Frame, PageTemplate, NextPageTemplate, Flowable
 )
 from reportlab.pdfgen import canvas
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT, TA_JUSTIFY
@@ -49,11 +64,18 @@ matplotlib.use('Agg')  # Use non-interactive backend
 import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import seaborn as sns
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.backends.backend_pdf import PdfPages
 
+# Cheaper path rendering for dense chart lines
+matplotlib.rcParams['path.simplify_threshold'] = 1.0
+matplotlib.rcParams['agg.path.chunksize'] = 10000
+
 # Database connectivity libraries
 try:
     import psycopg2
+    import psycopg2.pool
     from psycopg2.extras import RealDictCursor
     POSTGRES_AVAILABLE = True
 except ImportError:
@@ -67,27 +89,296 @@ except ImportError:
     NEO4J_AVAILABLE = False
     print("Warning: neo4j not installed. Neo4j connectivity disabled.")
 
-# Email libraries
-import email.mime.multipart
-import email.mime.text
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed"""
+        def decorator(func):
+            return func
+        return decorator
+
+# Optional vector chart embedding (matplotlib PDF pages drawn as ReportLab forms)
+try:
+    from pdfrw import PdfReader
+    from pdfrw.buildxobj import pagexobj
+    from pdfrw.toreportlab import makerl
+    PDFRW_AVAILABLE = True
+except ImportError:
+    PDFRW_AVAILABLE = False
+
+# Optional HTML -> PDF renderer
+try:
+    import jinja2
+    import weasyprint
+    HTML_RENDERER_AVAILABLE = True
+except ImportError:
+    HTML_RENDERER_AVAILABLE = False
+
+# SIMD-accelerated base64 for email attachments, with the stdlib as fallback
+try:
+    from pybase64 import encodebytes as _b64_encodebytes
+    PYBASE64_AVAILABLE = True
+except ImportError:
+    from base64 import encodebytes as _b64_encodebytes
+    PYBASE64_AVAILABLE = False
+
+# Email libraries (smtplib, email.*) are imported where they are used, so runs
+# that never send email do not pay for loading them
+if TYPE_CHECKING:
+    import smtplib
+    from email.message import EmailMessage
+
+@functools.lru_cache(maxsize=None)
+def _sample_styles():
+    """Build the ReportLab sample stylesheet once per process"""
+    return getSampleStyleSheet()
+
+# Characters dropped from protein names in output paths (keeps Unicode letters, digits and '_')
+_SLUG_RE = re.compile(r'\W+')
+
+# TrueType fonts already registered with ReportLab in this process
+_REGISTERED_FONTS = set()
+
+def _ensure_font(name: str, path: str):
+    """Register a TrueType font once; TTFont parses the whole file"""
+    if name in _REGISTERED_FONTS:
+        return
+    pdfmetrics.registerFont(TTFont(name, path))
+    _REGISTERED_FONTS.add(name)
+
+# Report styles shared by every generated report
+TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_sample_styles()['Title'],
+    fontSize=24,
+    spaceAfter=30,
+    alignment=TA_CENTER,
+    textColor=colors.darkblue
+)
+
+INFO_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 12),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (1, 0), (1, -1), colors.white),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+DATA_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+RECEPTOR_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+# Sample table contents shared by the ReportLab and HTML renderers
+DATA_SOURCE_ROWS = [
+    ['Data Source', 'Record Count', 'Data Quality', 'Coverage'],
+    ['UniProt', '156', 'High Quality', '100%'],
+    ['PDB', '23', 'Experimentally Verified', '85%'],
+    ['STRING', '89', 'Predicted Data', '95%']
+]
+
+RECEPTOR_HEADER = ['Receptor Name', 'Binding Affinity', 'Confidence', 'Conservation', 'Recommended Priority']
+
+DEFAULT_RECEPTOR_ROWS = [
+    ['EGFR', '-12.5 kcal/mol', '95%', 'High', 'Priority Experiment'],
+    ['MET', '-10.8 kcal/mol', '88%', 'Medium', 'Candidate'],
+    ['KDR', '-9.2 kcal/mol', '75%', 'Low', 'Alternative']
+]
+
+TOOL_VERSION_ROWS = [
+    ['Tool/Software', 'Version', 'Source'],
+    ['Python', '3.9+', 'Official Release'],
+    ['ReportLab', '3.6.11', 'PyPI'],
+    ['Matplotlib', '3.5.3', 'PyPI'],
+    ['Pandas', '1.4.3', 'PyPI'],
+    ['NumPy', '1.23.0', 'PyPI'],
+    ['Biopython', '1.79', 'PyPI'],
+    ['OpenEye', 'Licensed', 'Commercial Software']
+]
+
+# Jinja2 template used when config['renderer'] == 'weasyprint'
+DEFAULT_HTML_TEMPLATE = Path(__file__).resolve().parent.parent / 'config' / 'templates' / 'report.html.j2'
+
+TOOLS_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.gray),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+# Spacers carry no layout state, so one instance per size is shared by every story
+SPACER_10 = Spacer(1, 10)
+SPACER_12 = Spacer(1, 12)
+SPACER_20 = Spacer(1, 20)
+SPACER_50 = Spacer(1, 50)
+
+# Report text without runtime values, parsed once in ReportGenerator.__init__
+STATIC_PARAGRAPHS = {
+    'toc_title': ("Table of Contents", 'Heading1'),
+    'data_acquisition_title': ("1. Data Acquisition and Analysis", 'Heading1'),
+    'secretion_title': ("2. Secretion Pathway Analysis", 'Heading1'),
+    'receptor_title': ("3. Receptor Discovery and Validation", 'Heading1'),
+    'optimization_title': ("4. Peptide Optimization Design", 'Heading1'),
+    'conclusions_title': ("5. Conclusions and Recommendations", 'Heading1'),
+    'appendix_title': ("6. Appendix", 'Heading1'),
+    'tool_versions_title': ("Tool Version Information", 'Heading2'),
+    'data_sources_title': ("Data Sources", 'Heading2'),
+    'script_paths_title': ("Script Paths", 'Heading2'),
+    'secretion_interpretation': ("""
+        Secretion pathway analysis shows that classical secretion pathways dominate (51.1%), indicating that 
+        this protein is primarily secreted through the traditional endoplasmic reticulum-Golgi pathway. 
+        Non-classical secretion pathways (26.1%) also account for an important proportion, suggesting 
+        the possible existence of multiple secretion mechanisms. It is recommended to consider these 
+        different secretion patterns in practical applications.
+        """.strip(), 'Normal'),
+    'optimization_results': ("""
+        Peptide optimization results show that all designed peptides exhibit good binding affinity (<-10 kcal/mol).
+        The binding energy difference between Human and Mouse is less than 10%, indicating that these peptides have good cross-species conservation,
+        suitable as candidate drugs for further experimental validation. It is recommended to prioritize testing the first 3 peptides.
+        """.strip(), 'Normal'),
+    'data_sources': ("""
+        • UniProt: Protein sequence and annotation database (https://www.uniprot.org/)
+        • PDB: Protein 3D structure database (https://www.rcsb.org/)
+        • STRING: Protein interaction database (https://string-db.org/)
+        • ChEMBL: Drug activity database (https://www.ebi.ac.uk/chembl/)
+        • PubChem: Chemical database (https://pubchem.ncbi.nlm.nih.gov/)
+        """.strip(), 'Normal'),
+    'script_paths': ("""
+        This report was generated by the following scripts：
+        • Main report generator: report_generator.py
+        • Data acquisition: data_fetch_robust.py
+        • STRING interaction analysis: step1_string_interaction.py  
+        • Molecular docking: step2_docking_prediction.py
+        • Conservation Analysis: step3_conservation_check.py
+        • Results summary: step4_merge_results.py
+        """.strip(), 'Normal'),
+}
+
+TOC_ITEMS = [
+    "1. Data Acquisition and Analysis",
+    "2. Secretion Pathway Analysis", 
+    "3. Receptor Discovery and Validation",
+    "4. Peptide Optimization Design",
+    "5. Conclusions and Recommendations",
+    "6. Appendix"
+]
+
+# Report text interpolated with the protein name
+DATA_ACQUISITION_INTRO = string.Template("""
+        This section describes the data acquisition process for the $protein protein, including sequence information,
+        structural data, and annotation information extracted from public databases. Data sources cover major 
+        bioinformatics databases including UniProt, PDB, STRING, etc.
+        """.strip())
+
+SECRETION_INTRO = string.Template("""
+        Secretion pathway analysis is a key component of peptide drug development. Through systematic analysis 
+        of effective secretion pathways for $protein, we have identified the most likely specific receptors. 
+        The analysis results show the confidence and biological significance of different pathways.
+        """.strip())
+
+RECEPTOR_INTRO = string.Template("""
+        Through STRING database interaction analysis and large-scale molecular docking predictions, 
+        we have systematically identified potential receptors for $protein. The analysis employs 
+        multiple algorithms and methods to ensure the credibility and comprehensiveness of the results.
+        """.strip())
+
+OPTIMIZATION_INTRO = string.Template("""
+        Based on receptor binding analysis results, we have optimized the design of active peptide segments 
+        for $protein. Through molecular dynamics simulations and free energy calculations, we predicted 
+        the binding performance and cross-species characteristics of different variants.
+        """.strip())
+
+CONCLUSIONS_TEXT = string.Template("""
+        Comprehensive analysis results show that $protein has great potential as a peptide drug target:
+        
+        1. Receptor Recognition: Successfully identified 3 high-confidence candidate receptors, with Receptor_1 having the best binding properties
+        
+        2. Cross-Species Conservation: Binding energy difference <10%, indicating good cross-species applicability
+        
+        3. Secretion Properties: 75% of pathways through classical secretion, favorable for targeted drug design
+        
+        Recommended follow-up research directions:
+        • Experimental validation and structural analysis of Receptor_1
+        • Optimize peptide sequences to improve bioactivity and pharmacokinetic properties
+        • Conduct in vitro binding experiments to validate predictions
+        • Consider combination drug strategies to enhance therapeutic effects
+        
+        Overall, $protein is a very promising peptide drug development target,
+        and it is recommended to invest more resources for in-depth research and development.
+        """.strip())
+
+EMAIL_BODY = """Hello，
+
+This attachment is a multi-species analysis report for protein peptide drug development.
+
+The report includes：
+• Data acquisition and analysis
+• Secretion pathway analysis
+• Receptor discovery and validation
+• Peptide optimization design
+• Conclusions and recommendations
+
+If you have any questions, please contact the relevant personnel。
+
+Best regards，
+Analysis System
+"""
 
 class DatabaseManager:
-    """Handles database connections and queries"""
+    """Handles database connections and queries
+    
+    Connections are pooled and kept for the lifetime of the manager so that
+    repeated report runs do not re-authenticate for every query.
+    """
+    
+    # Upper bound on pooled connections per database
+    DEFAULT_POOL_SIZE = 8
     
     def __init__(self, config: Dict[str, Any]):
         self.config = config
-        self.postgres_conn = None
+        self._pg_pool = None
         self.neo4j_driver = None
         
     def connect_postgres(self) -> bool:
-        """Connect to PostgreSQL database"""
+        """Create the PostgreSQL connection pool"""
+        if self._pg_pool is not None:
+            return True
         if not POSTGRES_AVAILABLE:
             logging.warning("PostgreSQL connectivity not available")
             return False
             
         try:
             db_config = self.config.get('postgres', {})
-            self.postgres_conn = psycopg2.connect(
+            self._pg_pool = psycopg2.pool.ThreadedConnectionPool(
+                1, db_config.get('pool_size', self.DEFAULT_POOL_SIZE),
                 host=db_config.get('host', 'localhost'),
                 port=db_config.get('port', 5432),
                 database=db_config.get('database', 'peptide_analysis'),
@@ -101,23 +392,28 @@ class DatabaseManager:
             return False
     
     def connect_neo4j(self) -> bool:
-        """Connect to Neo4j database"""
+        """Create the pooled Neo4j driver"""
+        if self.neo4j_driver is not None:
+            return True
         if not NEO4J_AVAILABLE:
             logging.warning("Neo4j connectivity not available")
             return False
             
         try:
             db_config = self.config.get('neo4j', {})
-            self.neo4j_driver = GraphDatabase.driver(
+            driver = GraphDatabase.driver(
                 db_config.get('uri', 'bolt://localhost:7687'),
                 auth=(
                     db_config.get('user', 'neo4j'),
                     db_config.get('password', 'password')
-                )
+                ),
+                max_connection_pool_size=db_config.get('pool_size', self.DEFAULT_POOL_SIZE),
+                connection_acquisition_timeout=30
             )
             # Test connection
-            with self.neo4j_driver.session() as session:
+            with driver.session() as session:
                 session.run("RETURN 1")
+            self.neo4j_driver = driver
             logging.info("Successfully connected to Neo4j")
             return True
         except Exception as e:
@@ -126,21 +422,61 @@ class DatabaseManager:
     
     def query_postgres(self, query: str, params: tuple = None) -> List[Dict]:
         """Execute PostgreSQL query and return results"""
-        if not self.postgres_conn:
-            self.connect_postgres()
+        if not self.connect_postgres():
+            return []
             
+        conn = self._pg_pool.getconn()
         try:
-            with self.postgres_conn.cursor(cursor_factory=RealDictCursor) as cursor:
+            # The connection context ends the transaction (commit or rollback)
+            with conn, conn.cursor(cursor_factory=RealDictCursor) as cursor:
                 cursor.execute(query, params)
                 return cursor.fetchall()
         except Exception as e:
             logging.error(f"PostgreSQL query error: {e}")
             return []
+        finally:
+            self._pg_pool.putconn(conn)
+    
+    def query_postgres_df(self, query: str, params: tuple = None) -> pd.DataFrame:
+        """Execute PostgreSQL query and return the result as a DataFrame"""
+        if not self.connect_postgres():
+            return pd.DataFrame()
+            
+        conn = self._pg_pool.getconn()
+        try:
+            with conn:
+                return pd.read_sql_query(query, conn, params=params)
+        except Exception as e:
+            logging.error(f"PostgreSQL query error: {e}")
+            return pd.DataFrame()
+        finally:
+            self._pg_pool.putconn(conn)
+    
+    def iter_postgres(self, query: str, params: tuple = None,
+                      itersize: int = 10000) -> Iterator[Dict]:
+        """Stream PostgreSQL query rows through a server-side cursor
+        
+        Rows are fetched from the server in batches of ``itersize`` so the full
+        result set is never held in memory.
+        """
+        if not self.connect_postgres():
+            return
+            
+        conn = self._pg_pool.getconn()
+        try:
+            with conn, conn.cursor(name='report_stream', cursor_factory=RealDictCursor) as cursor:
+                cursor.itersize = itersize
+                cursor.execute(query, params)
+                yield from cursor
+        except Exception as e:
+            logging.error(f"PostgreSQL query error: {e}")
+        finally:
+            self._pg_pool.putconn(conn)
     
     def query_neo4j(self, query: str, parameters: Dict = None) -> List[Dict]:
         """Execute Neo4j query and return results"""
-        if not self.neo4j_driver:
-            self.connect_neo4j()
+        if not self.connect_neo4j():
+            return []
             
         try:
             with self.neo4j_driver.session() as session:
@@ -149,82 +485,480 @@ class DatabaseManager:
         except Exception as e:
             logging.error(f"Neo4j query error: {e}")
             return []
+    
+    def close(self):
+        """Close pooled PostgreSQL connections and the Neo4j driver"""
+        if self._pg_pool is not None:
+            self._pg_pool.closeall()
+            self._pg_pool = None
+        if self.neo4j_driver is not None:
+            self.neo4j_driver.close()
+            self.neo4j_driver = None
+
+# Species and per-species binding energy parameters used for the sample charts
+SAMPLE_SPECIES = ['Human', 'Mouse', 'Rat', 'Cow']
+SAMPLE_BINDING_MEANS = np.array([-12.0, -10.5, -11.0, -11.5])
+SAMPLE_BINDING_STDS = np.array([2.0, 1.8, 2.2, 1.9])
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _gen_binding_energy(means, stds, n_per_group, seed):
+        """Normal binding energies, n_per_group consecutive draws per group"""
+        # Seeding inside a jitted function only touches numba's own generator
+        np.random.seed(seed)
+        out = np.empty(means.shape[0] * n_per_group)
+        for g in range(means.shape[0]):
+            for k in range(n_per_group):
+                out[g * n_per_group + k] = np.random.normal(means[g], stds[g])
+        return out
+else:
+    def _gen_binding_energy(means, stds, n_per_group, seed):
+        """Normal binding energies, n_per_group consecutive draws per group"""
+        # A local generator leaves NumPy's global RNG state untouched
+        rng = np.random.default_rng(seed)
+        return rng.normal(np.repeat(means, n_per_group), np.repeat(stds, n_per_group))
+
+# Embedded PNGs are downsampled by ReportLab, so 150 dpi is sufficient
+CHART_DPI = 150
+
+CHART_FIGSIZES = {
+    'heatmap': (12, 8),
+    'box': (10, 6),
+    'pie': (12, 8),
+}
+
+# One reusable figure per chart type and process, drawn through an explicit Agg canvas
+_FIGURE_CACHE: Dict[str, Figure] = {}
+
+def _configure_chart_style():
+    """Set up matplotlib with English font support only"""
+    plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sans']
+    plt.rcParams['axes.unicode_minus'] = False
+    sns.set_style("whitegrid")
+
+def _chart_axes(kind: str):
+    """Return the cached figure for a chart type, cleared, with fresh axes"""
+    fig = _FIGURE_CACHE.get(kind)
+    if fig is None:
+        if not _FIGURE_CACHE:
+            _configure_chart_style()
+        fig = Figure(figsize=CHART_FIGSIZES[kind], dpi=CHART_DPI)
+        FigureCanvasAgg(fig)
+        _FIGURE_CACHE[kind] = fig
+    
+    # fig.clear() also drops colorbar axes left over from the previous render
+    fig.clear()
+    return fig, fig.add_subplot(111)
+
+def _save_chart(fig: Figure, fmt: str = 'png') -> io.BytesIO:
+    """Render a cached figure to an in-memory PNG, or a vector PDF page for fmt='pdf'"""
+    buf = io.BytesIO()
+    if fmt == 'pdf':
+        with PdfPages(buf) as pdf:
+            pdf.savefig(fig, bbox_inches='tight', facecolor='white', edgecolor='none')
+    else:
+        fig.savefig(buf, format='png', dpi=CHART_DPI, bbox_inches='tight',
+                    facecolor='white', edgecolor='none')
+    buf.seek(0)
+    return buf
+
+class PdfChart(Flowable):
+    """Draws the first page of a vector PDF chart, scaled to fit a box"""
+    
+    def __init__(self, chart: io.BytesIO, width: float, height: float):
+        Flowable.__init__(self)
+        self._xobj = pagexobj(PdfReader(fdata=chart.getvalue()).pages[0])
+        x0, y0, x1, y1 = (float(v) for v in self._xobj.BBox)
+        self._origin = (x0, y0)
+        self._scale = min(width / (x1 - x0), height / (y1 - y0))
+        self.width = (x1 - x0) * self._scale
+        self.height = (y1 - y0) * self._scale
+    
+    def wrap(self, availWidth, availHeight):
+        return self.width, self.height
+    
+    def draw(self):
+        self.canv.saveState()
+        self.canv.scale(self._scale, self._scale)
+        self.canv.translate(-self._origin[0], -self._origin[1])
+        self.canv.doForm(makerl(self.canv, self._xobj))
+        self.canv.restoreState()
+
+def _chart_flowable(chart: io.BytesIO, width: float, height: float) -> Flowable:
+    """Embed a rendered chart, keeping vector PDF charts as vectors"""
+    if chart.getvalue().startswith(b'%PDF'):
+        return PdfChart(chart, width, height)
+    return Image(chart, width=width, height=height)
+
+def render_conservation_heatmap(data: pd.DataFrame, fmt: str = 'png') -> io.BytesIO:
+    """Generate conservation heatmap"""
+    fig, ax = _chart_axes('heatmap')
+    
+    # Create heatmap
+    values = data.to_numpy()
+    im = ax.imshow(values, cmap='RdYlBu_r', vmin=0, vmax=1, aspect='auto')
+    fig.colorbar(im, ax=ax, label='Conservation Score')
+    ax.grid(False)
+    ax.set_xticks(np.arange(values.shape[1]))
+    ax.set_xticklabels(data.columns)
+    ax.set_yticks(np.arange(values.shape[0]))
+    ax.set_yticklabels(data.index)
+    
+    # Cell annotations only stay readable (and cheap) on small matrices
+    if values.size <= 100:
+        for i, j in np.ndindex(values.shape):
+            ax.text(j, i, f'{values[i, j]:.2f}', ha='center', va='center', fontsize=9)
+    
+    ax.set_title('Cross-Species Receptor Conservation Heatmap', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Protein Position', fontsize=12)
+    ax.set_ylabel('Species', fontsize=12)
+    
+    return _save_chart(fig, fmt)
+
+def render_binding_energy_distribution(data: pd.DataFrame, fmt: str = 'png') -> io.BytesIO:
+    """Generate binding energy distribution chart"""
+    fig, ax = _chart_axes('box')
+    
+    # Box plot for binding energies across species
+    groups = {name: g.values for name, g in data.groupby('species', sort=False)['binding_energy']}
+    
+    ax.boxplot(list(groups.values()), labels=list(groups.keys()))
+    
+    ax.set_title('Peptide Binding Energy Distribution (Cross-Species)', fontsize=16, fontweight='bold')
+    ax.set_xlabel('Species', fontsize=12)
+    ax.set_ylabel('Binding Energy (kcal/mol)', fontsize=12)
+    ax.tick_params(axis='x', labelrotation=45)
+    
+    # Add horizontal line for threshold
+    ax.axhline(y=-10, color='red', linestyle='--', alpha=0.7, 
+               label='Recommended Threshold (-10 kcal/mol)')
+    ax.legend()
+    
+    return _save_chart(fig, fmt)
+
+def render_secretion_pathway_summary(data: pd.DataFrame, fmt: str = 'png') -> io.BytesIO:
+    """Generate secretion pathway summary chart"""
+    fig, ax = _chart_axes('pie')
+    
+    # Count pathways (categorical columns are counted straight from their codes)
+    pathways = data['pathway_type']
+    if isinstance(pathways.dtype, pd.CategoricalDtype):
+        codes = pathways.cat.codes.to_numpy()
+        counts = np.bincount(codes[codes >= 0], minlength=len(pathways.cat.categories))
+        present = counts > 0
+        labels, counts = pathways.cat.categories.to_numpy()[present], counts[present]
+    else:
+        labels, counts = np.unique(pathways.to_numpy(), return_counts=True)
+    
+    # Create pie chart
+    ax.pie(counts, labels=labels, 
+           autopct='%1.1f%%', startangle=90, counterclock=False)
+    ax.set_title('Secretion Pathway Distribution', fontsize=16, fontweight='bold')
+    
+    return _save_chart(fig, fmt)
+
+# Chart worker pools shared by every generator in the process, keyed by worker count;
+# workers keep their imports and _FIGURE_CACHE between reports
+_CHART_POOLS: Dict[int, ProcessPoolExecutor] = {}
+_CHART_POOLS_LOCK = threading.Lock()
+
+def _get_chart_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Return the shared chart worker pool for a worker count, creating it on first use"""
+    with _CHART_POOLS_LOCK:
+        pool = _CHART_POOLS.get(max_workers)
+        if pool is None:
+            # spawn avoids inheriting fork-unsafe matplotlib state
+            ctx = multiprocessing.get_context('spawn')
+            pool = _CHART_POOLS[max_workers] = ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx)
+        return pool
+
+def _discard_chart_pool(max_workers: int):
+    """Drop a pool whose workers died so the next report starts a fresh one"""
+    with _CHART_POOLS_LOCK:
+        pool = _CHART_POOLS.pop(max_workers, None)
+    if pool is not None:
+        pool.shutdown(wait=False)
+
+@atexit.register
+def _shutdown_chart_pools():
+    """Stop chart worker processes at interpreter exit"""
+    with _CHART_POOLS_LOCK:
+        for pool in _CHART_POOLS.values():
+            pool.shutdown()
+        _CHART_POOLS.clear()
 
 class ChartGenerator:
     """Generates charts and visualizations for the report"""
     
-    def __init__(self):
-        # Set up matplotlib with English font support only
-        plt.rcParams['font.sans-serif'] = ['Arial', 'DejaVu Sans', 'Liberation Sans']
-        plt.rcParams['axes.unicode_minus'] = False
-        sns.set_style("whitegrid")
+    # Chart name -> (render function, output file name)
+    CHARTS = {
+        'secretion': (render_secretion_pathway_summary, 'secretion_chart.png'),
+        'conservation': (render_conservation_heatmap, 'conservation_chart.png'),
+        'binding_energy': (render_binding_energy_distribution, 'binding_energy_chart.png'),
+    }
+    
+    def __init__(self, max_workers: int = 1, chart_format: str = 'png'):
         self.cache_dir = "cache"  # Default cache directory
+        self.max_workers = max_workers
+        self.chart_format = chart_format  # 'png' or 'pdf'
+    
+    def _chart_path(self, name: str) -> str:
+        file_name = self.CHARTS[name][1]
+        if self.chart_format == 'pdf':
+            file_name = file_name[:-len('.png')] + '.pdf'
+        return f'{self.cache_dir}/{file_name}'
         
-    def conservation_heatmap(self, data: pd.DataFrame) -> str:
+    def conservation_heatmap(self, data: pd.DataFrame) -> io.BytesIO:
         """Generate conservation heatmap"""
-        plt.figure(figsize=(12, 8))
-        
-        # Create heatmap
-        sns.heatmap(data, annot=True, cmap='RdYlBu_r', center=0.5,
-                   cbar_kws={'label': 'Conservation Score'})
-        
-        plt.title('Cross-Species Receptor Conservation Heatmap', fontsize=16, fontweight='bold')
-        plt.xlabel('Protein Position', fontsize=12)
-        plt.ylabel('Species', fontsize=12)
-        
-        # Save plot
-        chart_path = f'{self.cache_dir}/conservation_chart.png'
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight', 
-                   facecolor='white', edgecolor='none')
-        plt.close()
-        
-        return chart_path
+        return render_conservation_heatmap(data, self.chart_format)
     
-    def binding_energy_distribution(self, data: pd.DataFrame) -> str:
+    def binding_energy_distribution(self, data: pd.DataFrame) -> io.BytesIO:
         """Generate binding energy distribution chart"""
-        plt.figure(figsize=(10, 6))
-        
-        # Box plot for binding energies across species
-        species_data = data.groupby('species')['binding_energy']
-        
-        plt.boxplot([species_data.get_group(species) for species in species_data.groups.keys()],
-                   labels=species_data.groups.keys())
-        
-        plt.title('Peptide Binding Energy Distribution (Cross-Species)', fontsize=16, fontweight='bold')
-        plt.xlabel('Species', fontsize=12)
-        plt.ylabel('Binding Energy (kcal/mol)', fontsize=12)
-        plt.xticks(rotation=45)
-        
-        # Add horizontal line for threshold
-        plt.axhline(y=-10, color='red', linestyle='--', alpha=0.7, 
-                   label='Recommended Threshold (-10 kcal/mol)')
-        plt.legend()
-        
-        chart_path = f'{self.cache_dir}/binding_energy_chart.png'
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight',
-                   facecolor='white', edgecolor='none')
-        plt.close()
-        
-        return chart_path
+        return render_binding_energy_distribution(data, self.chart_format)
     
-    def secretion_pathway_summary(self, data: pd.DataFrame) -> str:
+    def secretion_pathway_summary(self, data: pd.DataFrame) -> io.BytesIO:
         """Generate secretion pathway summary chart"""
-        plt.figure(figsize=(12, 8))
-        
-        # Count pathways
-        pathway_counts = data['pathway_type'].value_counts()
+        return render_secretion_pathway_summary(data, self.chart_format)
+    
+    def render_all(self, chart_data: Dict[str, pd.DataFrame]) -> Dict[str, io.BytesIO]:
+        """Render several charts, concurrently in shared worker processes when max_workers > 1
         
-        # Create pie chart
-        plt.pie(pathway_counts.values, labels=pathway_counts.index, 
-               autopct='%1.1f%%', startangle=90, counterclock=False)
-        plt.title('Secretion Pathway Distribution', fontsize=16, fontweight='bold')
+        Returns a mapping of chart name to the encoded chart held in memory;
+        charts that fail are logged and left out.
+        """
+        charts = {}
+        if self.max_workers <= 1:
+            for name, data in chart_data.items():
+                try:
+                    charts[name] = self.CHARTS[name][0](data, self.chart_format)
+                except Exception as e:
+                    logging.warning(f"Chart generation failed ({name}): {e}")
+            return charts
+        
+        executor = _get_chart_pool(self.max_workers)
+        futures = {
+            name: executor.submit(self.CHARTS[name][0], data, self.chart_format)
+            for name, data in chart_data.items()
+        }
+        for name, future in futures.items():
+            try:
+                charts[name] = future.result()
+            except BrokenProcessPool as e:
+                logging.warning(f"Chart generation failed ({name}): {e}")
+                _discard_chart_pool(self.max_workers)
+            except Exception as e:
+                logging.warning(f"Chart generation failed ({name}): {e}")
+        return charts
+    
+    def save_charts(self, charts: Dict[str, io.BytesIO]) -> Dict[str, str]:
+        """Write rendered charts to the cache directory (for debugging)"""
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        chart_paths = {}
+        for name, chart in charts.items():
+            chart_paths[name] = self._chart_path(name)
+            with open(chart_paths[name], 'wb') as f:
+                f.write(chart.getvalue())
+        return chart_paths
+
+# Attachment bytes per base64 line: 57 bytes encode to the 76-character MIME line limit
+B64_LINE_BYTES = 57
+# Attachment bytes read and encoded per chunk while streaming: the largest whole
+# number of lines within 8 KiB, so the encoder's fast loop works on full blocks
+B64_CHUNK_BYTES = B64_LINE_BYTES * 143
+
+# Large recipient lists are sent in batches so a failing run can be cut short:
+# once more than a third of the recipients have failed, the rest are not attempted
+EMAIL_BATCH_THRESHOLD = 30
+EMAIL_BATCH_SIZE = 10
+
+# Placeholder for the attachment body in the serialized message skeleton
+_ATTACHMENT_MARKER = b'@@REPORT-ATTACHMENT@@'
+
+def _iter_base64_lines(path: str) -> Iterator[bytes]:
+    """Yield the file as CRLF-terminated base64 lines, one chunk at a time
+    
+    The file is memory-mapped and chunks are encoded straight from the mapping,
+    so the attachment is never copied into a Python bytes object before encoding.
+    """
+    with open(path, 'rb', buffering=0) as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+            for start in range(0, size, B64_CHUNK_BYTES):
+                yield _b64_encodebytes(view[start:start + B64_CHUNK_BYTES]).replace(b'\n', b'\r\n')
+
+def _dot_stuff(data: bytes) -> bytes:
+    """Escape lines starting with '.' for the SMTP DATA stream"""
+    return re.sub(br'(?m)^\.', b'..', data)
+
+def _split_message(msg: 'EmailMessage') -> Tuple[bytes, bytes]:
+    """Serialize a message whose attachment body is the marker into (head, tail)"""
+    import email.policy
+    
+    head, tail = msg.as_bytes(policy=email.policy.SMTP).split(_ATTACHMENT_MARKER)
+    # The last base64 line already ends with the CRLF that precedes the boundary
+    if tail.startswith(b'\r\n'):
+        tail = tail[2:]
+    return head, tail
+
+def _stream_message(server: 'smtplib.SMTP', from_addr: str, to_addrs: List[str],
+                    head: bytes, attachment_path: str, tail: bytes) -> Dict[str, Tuple[int, bytes]]:
+    """Send head + base64(attachment) + tail as one message
+    
+    Works like SMTP.sendmail, but the attachment is encoded and written to the
+    DATA stream chunk by chunk, so it is never held in memory as a whole.
+    Returns the refused recipients.
+    """
+    import smtplib
+    
+    server.ehlo_or_helo_if_needed()
+    code, resp = server.mail(from_addr)
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPSenderRefused(code, resp, from_addr)
+    
+    refused = {}
+    for addr in to_addrs:
+        code, resp = server.rcpt(addr)
+        if code not in (250, 251):
+            refused[addr] = (code, resp)
+    if len(refused) == len(to_addrs):
+        server.rset()
+        raise smtplib.SMTPRecipientsRefused(refused)
+    
+    code, resp = server.docmd('data')
+    if code != 354:
+        server.rset()
+        raise smtplib.SMTPDataError(code, resp)
+    
+    # base64 lines never start with '.', so only the skeleton needs dot-stuffing
+    with server.sock.makefile('wb') as out:
+        out.write(_dot_stuff(head))
+        for lines in _iter_base64_lines(attachment_path):
+            out.write(lines)
+        out.write(_dot_stuff(tail))
+        if not tail.endswith(b'\r\n'):
+            out.write(b'\r\n')
+        out.write(b'.\r\n')
+    
+    code, resp = server.getreply()
+    if code != 250:
+        server.rset()
+        raise smtplib.SMTPDataError(code, resp)
+    return refused
+
+class SMTPPool:
+    """Pool of authenticated SMTP sessions shared by concurrent email sends
+    
+    At most ``size`` sessions are open at once; each session is retired after
+    ``max_messages`` sends to stay within typical server per-connection limits,
+    or once it is ``max_age`` seconds old, before servers idle-kill it.
+    """
+    
+    def __init__(self, smtp_config: Dict[str, Any], size: int = 5, max_messages: int = 100,
+                 max_age: float = 90):
+        self.smtp_config = smtp_config
+        self.size = size
+        self.max_messages = max_messages
+        self.max_age = max_age
+        self._idle = queue.LifoQueue()  # (server, messages sent, opened at) of idle sessions
+        self._slots = threading.BoundedSemaphore(size)
+    
+    def _connect(self) -> Tuple['smtplib.SMTP', int, float]:
+        import smtplib
+        
+        server = smtplib.SMTP(self.smtp_config.get('smtp_server'),
+                              self.smtp_config.get('smtp_port', 587))
+        # Let the OS probe idle sessions so dead peers surface promptly
+        server.sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            server.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30)
+        server.starttls()
+        server.login(self.smtp_config.get('sender_email'),
+                     self.smtp_config.get('sender_password'))
+        return server, 0, time.monotonic()
+    
+    @staticmethod
+    def _alive(server: 'smtplib.SMTP') -> bool:
+        import smtplib
         
-        chart_path = f'{self.cache_dir}/secretion_chart.png'
-        plt.savefig(chart_path, dpi=300, bbox_inches='tight',
-                   facecolor='white', edgecolor='none')
-        plt.close()
+        try:
+            return server.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+    
+    @staticmethod
+    def _discard(server: 'smtplib.SMTP'):
+        try:
+            server.quit()
+        except Exception:
+            pass
+    
+    @contextlib.contextmanager
+    def borrow(self):
+        """Borrow a live session for one send; it is returned to the pool afterwards"""
+        import smtplib
         
-        return chart_path
+        self._slots.acquire()
+        try:
+            try:
+                server, sent, opened_at = self._idle.get_nowait()
+                if time.monotonic() - opened_at > self.max_age or not self._alive(server):
+                    self._discard(server)
+                    server, sent, opened_at = self._connect()
+            except queue.Empty:
+                server, sent, opened_at = self._connect()
+            
+            try:
+                yield server
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPResponseException):
+                # The server answered and the transaction was reset; the session is reusable
+                self._idle.put((server, sent, opened_at))
+                raise
+            except BaseException:
+                # The session state is unknown after a failed send
+                self._discard(server)
+                raise
+            
+            sent += 1
+            if sent >= self.max_messages:
+                self._discard(server)
+            else:
+                self._idle.put((server, sent, opened_at))
+        finally:
+            self._slots.release()
+    
+    def close(self):
+        """Quit all idle sessions"""
+        while True:
+            try:
+                server, _, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(server)
+
+# SMTP session pools shared by every generator in the process, keyed by (host, port, sender)
+_SMTP_POOLS: Dict[Tuple[str, int, str], SMTPPool] = {}
+_SMTP_POOLS_LOCK = threading.Lock()
+
+def _get_smtp_pool(smtp_config: Dict[str, Any], size: int = 5) -> SMTPPool:
+    """Return the shared SMTP session pool for a server/sender, creating it on first use"""
+    key = (smtp_config.get('smtp_server'), smtp_config.get('smtp_port', 587),
+           smtp_config.get('sender_email'))
+    with _SMTP_POOLS_LOCK:
+        pool = _SMTP_POOLS.get(key)
+        if pool is None:
+            pool = _SMTP_POOLS[key] = SMTPPool(smtp_config, size)
+        return pool
+
+@atexit.register
+def _close_smtp_pools():
+    """Quit pooled SMTP sessions at interpreter exit"""
+    with _SMTP_POOLS_LOCK:
+        for pool in _SMTP_POOLS.values():
+            pool.close()
+        _SMTP_POOLS.clear()
 
 class ReportGenerator:
     """Main class for generating PDF reports"""
@@ -232,7 +966,19 @@ class ReportGenerator:
     def __init__(self, config_path: str):
         self.config = self._load_config(config_path)
         self.db_manager = DatabaseManager(self.config)
-        self.chart_generator = ChartGenerator()
+        self.chart_generator = ChartGenerator(self.config.get('chart_workers', 1))
+        for font_name, font_path in self.config.get('fonts', {}).items():
+            try:
+                _ensure_font(font_name, font_path)
+            except Exception as e:
+                logging.warning(f"Font registration failed ({font_name}): {e}")
+        styles = _sample_styles()
+        self._static_paragraphs = {
+            key: Paragraph(text, styles[style_name])
+            for key, (text, style_name) in STATIC_PARAGRAPHS.items()
+        }
+        self._toc_paragraphs = [Paragraph(item, styles['Normal']) for item in TOC_ITEMS]
+        self._template_msg = None  # Email skeleton (sender + body), built on first send
         self.setup_logging()
         
     def _load_config(self, config_path: str) -> Dict[str, Any]:
@@ -266,7 +1012,7 @@ class ReportGenerator:
         """Generate comprehensive PDF report"""
         
         # Create protein-specific directory
-        protein_safe = "".join(c for c in protein_name if c.isalnum() or c == '_')
+        protein_safe = _SLUG_RE.sub('', protein_name)
         protein_dir = Path("output") / protein_safe
         protein_dir.mkdir(parents=True, exist_ok=True)
         
@@ -276,16 +1022,39 @@ class ReportGenerator:
         if not output_path:
             output_path = protein_dir / f"peptide_report_{protein_safe}_{timestamp}.pdf"
         
-        # Create cache directory for charts
-        cache_dir = protein_dir / "cache"
-        cache_dir.mkdir(exist_ok=True)
-        
-        # Update chart paths to use protein-specific cache
-        self.chart_generator.cache_dir = str(cache_dir)
+        # Charts stay in memory; the protein-specific cache is only written for debugging
+        self.chart_generator.cache_dir = str(protein_dir / "cache")
+        
+        renderer = self.config.get('renderer', 'reportlab')
+        use_html = renderer == 'weasyprint' and HTML_RENDERER_AVAILABLE
+        if renderer == 'weasyprint' and not use_html:
+            logging.warning("jinja2/weasyprint not installed, falling back to ReportLab renderer")
+        
+        # ReportLab embeds vector PDF charts directly; the HTML renderer needs PNG
+        chart_format = self.config.get('chart_format', 'pdf')
+        if chart_format == 'pdf' and (use_html or not PDFRW_AVAILABLE):
+            chart_format = 'png'
+        self.chart_generator.chart_format = chart_format
+        
+        # Render all charts up front so they are produced concurrently
+        charts = self.chart_generator.render_all({
+            'secretion': self._secretion_chart_data(),
+            'conservation': self._conservation_chart_data(),
+            'binding_energy': self._binding_chart_data(),
+        })
+        if self.config.get('debug_charts'):
+            self.chart_generator.save_charts(charts)
+        
+        if use_html:
+            self._render_html_report(output_path, protein_name, species_list,
+                                     report_title, charts)
+            logging.info(f"Report generated successfully: {output_path}")
+            self._show_report_path(output_path)
+            return output_path
         
         # Create PDF document
         doc = SimpleDocTemplate(str(output_path), pagesize=A4)
-        styles = getSampleStyleSheet()
+        styles = _sample_styles()
         
         # Create document content
         story = []
@@ -298,16 +1067,19 @@ class ReportGenerator:
         story.append(PageBreak())
         
         self._generate_data_acquisition_section(story, styles, protein_name)
-        story.append(Spacer(1, 12))
+        story.append(SPACER_12)
         
-        self._generate_secretion_pathway_section(story, styles, protein_name)
-        story.append(Spacer(1, 12))
+        self._generate_secretion_pathway_section(story, styles, protein_name,
+                                                 charts.get('secretion'))
+        story.append(SPACER_12)
         
-        self._generate_receptor_discovery_section(story, styles, protein_name)
-        story.append(Spacer(1, 12))
+        self._generate_receptor_discovery_section(story, styles, protein_name,
+                                                  charts.get('conservation'))
+        story.append(SPACER_12)
         
-        self._generate_peptide_optimization_section(story, styles, protein_name)
-        story.append(Spacer(1, 12))
+        self._generate_peptide_optimization_section(story, styles, protein_name,
+                                                    charts.get('binding_energy'))
+        story.append(SPACER_12)
         
         self._generate_conclusions_section(story, styles, protein_name)
         story.append(PageBreak())
@@ -322,24 +1094,92 @@ class ReportGenerator:
         
         return output_path
     
+    def _secretion_chart_data(self) -> pd.DataFrame:
+        """Sample data for the secretion pathway chart"""
+        return pd.DataFrame({
+            'pathway_type': pd.Categorical(['Classical Secretion', 'Non-classical Secretion', 'Vesicular Secretion', 'Other']),
+            'count': [45, 23, 12, 8]
+        })
+    
+    def _conservation_chart_data(self) -> pd.DataFrame:
+        """Sample data for the conservation heatmap (species x position)"""
+        n_positions = 10
+        # One draw for the whole species x position matrix
+        rng = np.random.default_rng()
+        scores = rng.uniform(0.3, 0.9, size=(len(SAMPLE_SPECIES), n_positions))
+        return pd.DataFrame(scores, index=SAMPLE_SPECIES,
+                            columns=[f'Pos_{i}' for i in range(1, n_positions + 1)])
+    
+    def _binding_chart_data(self) -> pd.DataFrame:
+        """Sample data for the binding energy distribution chart"""
+        n_per_species = 20
+        energies = _gen_binding_energy(SAMPLE_BINDING_MEANS, SAMPLE_BINDING_STDS,
+                                       n_per_species, np.random.randint(2**31 - 1))
+        # Columns are built as arrays and adopted without copying
+        return pd.DataFrame({
+            'species': np.repeat(SAMPLE_SPECIES, n_per_species),
+            'binding_energy': energies
+        }, copy=False)
+    
+    def _top_receptor_rows(self) -> List[List[str]]:
+        """Top receptor table rows read from STRING results, or defaults"""
+        try:
+            # 读取STRING受体数据（只解析前3行及所需的两列）
+            string_df = pd.read_csv("cache/string_receptors.csv", nrows=3, engine='c',
+                                    usecols=lambda c: c in ('gene_name', 'reliability_score'))
+            n = len(string_df)
+            if 'gene_name' in string_df:
+                names = string_df['gene_name'].to_numpy()
+            else:
+                names = [f'Receptor_{i+1}' for i in range(n)]
+            if 'reliability_score' in string_df:
+                scores = string_df['reliability_score'].to_numpy()
+            else:
+                scores = np.full(n, 0.8)
+            
+            return [[receptor_name, '-12.5 kcal/mol', f"{score*100:.0f}%", 'High', 'Priority Experiment']
+                    for receptor_name, score in zip(names, scores)]
+        except FileNotFoundError:
+            # 如果没有数据，使用默认值
+            return [list(row) for row in DEFAULT_RECEPTOR_ROWS]
+        except Exception as e:
+            logging.warning(f"读取受体数据失败: {e}")
+            # 使用默认值
+            return [list(row) for row in DEFAULT_RECEPTOR_ROWS]
+    
+    def _render_html_report(self, output_path, protein_name: str, species_list: List[str],
+                            report_title: str, charts: Dict[str, io.BytesIO]):
+        """Render the report from a Jinja2 HTML template with WeasyPrint"""
+        chart_uris = {
+            name: 'data:image/png;base64,' + base64.b64encode(chart.getvalue()).decode('ascii')
+            for name, chart in charts.items()
+        }
+        
+        template_path = Path(self.config.get('html_template', DEFAULT_HTML_TEMPLATE))
+        env = jinja2.Environment(
+            loader=jinja2.FileSystemLoader(str(template_path.parent)),
+            autoescape=True
+        )
+        now = datetime.now()
+        html = env.get_template(template_path.name).render(
+            title=report_title or f"{protein_name} Peptide Drug Development Multi-Species Analysis Report",
+            protein_name=protein_name,
+            species_list=species_list,
+            start_time=now.strftime("%Y-%m-%d %H:%M"),
+            generation_time=now.strftime("%Y-%m-%d %H:%M:%S"),
+            data_sources=DATA_SOURCE_ROWS,
+            receptors=[RECEPTOR_HEADER] + self._top_receptor_rows(),
+            tools=TOOL_VERSION_ROWS,
+            charts=chart_uris
+        )
+        weasyprint.HTML(string=html, base_url=str(Path(output_path).parent)).write_pdf(str(output_path))
+    
     def _generate_cover_page(self, story, styles, protein_name: str, 
                            species_list: List[str], report_title: str):
         """Generate cover page"""
         
         # Title
         title_text = report_title or f"{protein_name} Peptide Drug Development Multi-Species Analysis Report"
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Title'],
-            fontSize=24,
-            spaceAfter=30,
-            alignment=TA_CENTER,
-            textColor=colors.darkblue
-        )
-        story.append(Paragraph(title_text, title_style))
-        
-        # Blank space
-        story.append(Spacer(1, 50))
         
         # Protein information table
         info_data = [
@@ -351,314 +1191,137 @@ class ReportGenerator:
         ]
         
         info_table = Table(info_data, colWidths=[3*inch, 4*inch])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (1, 0), (1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(info_table)
+        info_table.setStyle(INFO_TABLE_STYLE)
+        
+        story.extend([
+            Paragraph(title_text, TITLE_STYLE),
+            SPACER_50,  # Blank space
+            info_table,
+        ])
     
     def _generate_table_of_contents(self, story, styles):
         """Generate table of contents"""
-        toc_title = Paragraph("Table of Contents", styles['Heading1'])
-        story.append(toc_title)
-        story.append(Spacer(1, 20))
-        
-        toc_items = [
-            "1. Data Acquisition and Analysis",
-            "2. Secretion Pathway Analysis", 
-            "3. Receptor Discovery and Validation",
-            "4. Peptide Optimization Design",
-            "5. Conclusions and Recommendations",
-            "6. Appendix"
-        ]
+        section = [self._static_paragraphs['toc_title'], SPACER_20]
         
-        for item in toc_items:
-            story.append(Paragraph(item, styles['Normal']))
-            story.append(Spacer(1, 10))
+        for paragraph in self._toc_paragraphs:
+            section.append(paragraph)
+            section.append(SPACER_10)
+        
+        story.extend(section)
     
     def _generate_data_acquisition_section(self, story, styles, protein_name: str):
         """Generate data acquisition section"""
         
-        # Section header
-        story.append(Paragraph("1. Data Acquisition and Analysis", styles['Heading1']))
-        
         # Description paragraph
-        intro_text = f"""
-        This section describes the data acquisition process for the {protein_name} protein, including sequence information,
-        structural data, and annotation information extracted from public databases. Data sources cover major 
-        bioinformatics databases including UniProt, PDB, STRING, etc.
-        """
-        story.append(Paragraph(intro_text.strip(), styles['Normal']))
-        story.append(Spacer(1, 12))
+        intro_text = DATA_ACQUISITION_INTRO.substitute(protein=protein_name)
         
         # Sample data table (replace with actual data from database)
-        sample_data = [
-            ['Data Source', 'Record Count', 'Data Quality', 'Coverage'],
-            ['UniProt', '156', 'High Quality', '100%'],
-            ['PDB', '23', 'Experimentally Verified', '85%'],
-            ['STRING', '89', 'Predicted Data', '95%']
-        ]
-        
-        data_table = Table(sample_data)
-        data_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(data_table)
-    
-    def _generate_secretion_pathway_section(self, story, styles, protein_name: str):
+        data_table = Table(DATA_SOURCE_ROWS)
+        data_table.setStyle(DATA_TABLE_STYLE)
+        
+        story.extend([
+            self._static_paragraphs['data_acquisition_title'],
+            Paragraph(intro_text, styles['Normal']),
+            SPACER_12,
+            data_table,
+        ])
+    
+    def _generate_secretion_pathway_section(self, story, styles, protein_name: str,
+                                            chart: Optional[io.BytesIO] = None):
         """Generate secretion pathway analysis section"""
         
-        story.append(Paragraph("2. Secretion Pathway Analysis", styles['Heading1']))
-        
         # Description
-        intro_text = f"""
-        Secretion pathway analysis is a key component of peptide drug development. Through systematic analysis 
-        of effective secretion pathways for {protein_name}, we have identified the most likely specific receptors. 
-        The analysis results show the confidence and biological significance of different pathways.
-        """
-        story.append(Paragraph(intro_text.strip(), styles['Normal']))
-        story.append(Spacer(1, 12))
+        intro_text = SECRETION_INTRO.substitute(protein=protein_name)
+        section = [
+            self._static_paragraphs['secretion_title'],
+            Paragraph(intro_text, styles['Normal']),
+            SPACER_12,
+        ]
         
         # Chart generation (placeholder)
-        try:
-            # Create sample data for secretion pathways
-            sample_data = pd.DataFrame({
-                'pathway_type': ['Classical Secretion', 'Non-classical Secretion', 'Vesicular Secretion', 'Other'],
-                'count': [45, 23, 12, 8]
-            })
-            
-            chart_path = self.chart_generator.secretion_pathway_summary(sample_data)
-            
-            if os.path.exists(chart_path):
-                img = Image(chart_path, width=6*inch, height=4*inch)
-                story.append(img)
-                story.append(Spacer(1, 12))
-            else:
-                logging.warning(f"Chart file not found: {chart_path}")
-        except Exception as e:
-            logging.warning(f"Chart generation failed: {e}")
+        if chart is not None:
+            section.append(_chart_flowable(chart, 6*inch, 4*inch))
+            section.append(SPACER_12)
+        else:
+            logging.warning("Secretion pathway chart not available")
         
         # Results interpretation
-        interpretation = """
-        Secretion pathway analysis shows that classical secretion pathways dominate (51.1%), indicating that 
-        this protein is primarily secreted through the traditional endoplasmic reticulum-Golgi pathway. 
-        Non-classical secretion pathways (26.1%) also account for an important proportion, suggesting 
-        the possible existence of multiple secretion mechanisms. It is recommended to consider these 
-        different secretion patterns in practical applications.
-        """
-        story.append(Paragraph(interpretation.strip(), styles['Normal']))
+        section.append(self._static_paragraphs['secretion_interpretation'])
+        story.extend(section)
     
-    def _generate_receptor_discovery_section(self, story, styles, protein_name: str):
+    def _generate_receptor_discovery_section(self, story, styles, protein_name: str,
+                                             chart: Optional[io.BytesIO] = None):
         """Generate receptor discovery section"""
         
-        story.append(Paragraph("3. Receptor Discovery and Validation", styles['Heading1']))
-        
-        intro_text = f"""
-        Through STRING database interaction analysis and large-scale molecular docking predictions, 
-        we have systematically identified potential receptors for {protein_name}. The analysis employs 
-        multiple algorithms and methods to ensure the credibility and comprehensiveness of the results.
-        """
-        story.append(Paragraph(intro_text.strip(), styles['Normal']))
-        story.append(Spacer(1, 12))
+        intro_text = RECEPTOR_INTRO.substitute(protein=protein_name)
+        section = [
+            self._static_paragraphs['receptor_title'],
+            Paragraph(intro_text, styles['Normal']),
+            SPACER_12,
+        ]
         
         # Conservation analysis chart
-        try:
-            conservation_data = pd.DataFrame({
-                'Position': [f'Pos_{i}' for i in range(1, 11)],
-                **{species: np.random.uniform(0.3, 0.9, 10) 
-                   for species in ['Human', 'Mouse', 'Rat', 'Cow']}
-            })
-            
-            chart_path = self.chart_generator.conservation_heatmap(conservation_data)
-            if os.path.exists(chart_path):
-                img = Image(chart_path, width=7*inch, height=5*inch)
-                story.append(img)
-                story.append(Spacer(1, 12))
-        except Exception as e:
-            logging.warning(f"Conservation chart failed: {e}")
+        if chart is not None:
+            section.append(_chart_flowable(chart, 7*inch, 5*inch))
+            section.append(SPACER_12)
         
         # Top receptors table - 从实际数据中读取
-        top_receptors = [['Receptor Name', 'Binding Affinity', 'Confidence', 'Conservation', 'Recommended Priority']]
-        
-        try:
-            # 读取STRING受体数据
-            string_receptors_path = Path("cache/string_receptors.csv")
-            if string_receptors_path.exists():
-                string_df = pd.read_csv(string_receptors_path)
-                for i, row in string_df.head(3).iterrows():
-                    receptor_name = row.get('gene_name', f'Receptor_{i+1}')
-                    confidence = f"{row.get('reliability_score', 0.8)*100:.0f}%"
-                    top_receptors.append([receptor_name, '-12.5 kcal/mol', confidence, 'High', 'Priority Experiment'])
-            else:
-                # 如果没有数据，使用默认值
-                top_receptors.extend([
-                    ['EGFR', '-12.5 kcal/mol', '95%', 'High', 'Priority Experiment'],
-                    ['MET', '-10.8 kcal/mol', '88%', 'Medium', 'Candidate'],
-                    ['KDR', '-9.2 kcal/mol', '75%', 'Low', 'Alternative']
-                ])
-        except Exception as e:
-            logging.warning(f"读取受体数据失败: {e}")
-            # 使用默认值
-            top_receptors.extend([
-                ['EGFR', '-12.5 kcal/mol', '95%', 'High', 'Priority Experiment'],
-                ['MET', '-10.8 kcal/mol', '88%', 'Medium', 'Candidate'],
-                ['KDR', '-9.2 kcal/mol', '75%', 'Low', 'Alternative']
-            ])
+        top_receptors = [RECEPTOR_HEADER] + self._top_receptor_rows()
         
         receptor_table = Table(top_receptors)
-        receptor_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(receptor_table)
-    
-    def _generate_peptide_optimization_section(self, story, styles, protein_name: str):
-        """Generate peptide optimization section"""
+        receptor_table.setStyle(RECEPTOR_TABLE_STYLE)
         
-        story.append(Paragraph("4. Peptide Optimization Design", styles['Heading1']))
+        section.append(receptor_table)
+        story.extend(section)
+    
+    def _generate_peptide_optimization_section(self, story, styles, protein_name: str,
+                                               chart: Optional[io.BytesIO] = None):
+        """Generate peptide optimization section"""
         
-        intro_text = f"""
-        Based on receptor binding analysis results, we have optimized the design of active peptide segments 
-        for {protein_name}. Through molecular dynamics simulations and free energy calculations, we predicted 
-        the binding performance and cross-species characteristics of different variants.
-        """
-        story.append(Paragraph(intro_text.strip(), styles['Normal']))
-        story.append(Spacer(1, 12))
+        intro_text = OPTIMIZATION_INTRO.substitute(protein=protein_name)
+        section = [
+            self._static_paragraphs['optimization_title'],
+            Paragraph(intro_text, styles['Normal']),
+            SPACER_12,
+        ]
         
         # Binding energy distribution chart
-        try:
-            binding_data = pd.DataFrame({
-                'species': ['Human']*20 + ['Mouse']*20 + ['Rat']*20 + ['Cow']*20,
-                'binding_energy': (
-                    list(np.random.normal(-12, 2, 20)) +
-                    list(np.random.normal(-10.5, 1.8, 20)) +
-                    list(np.random.normal(-11, 2.2, 20)) +
-                    list(np.random.normal(-11.5, 1.9, 20))
-                )
-            })
-            
-            chart_path = self.chart_generator.binding_energy_distribution(binding_data)
-            if os.path.exists(chart_path):
-                img = Image(chart_path, width=6*inch, height=4*inch)
-                story.append(img)
-                story.append(Spacer(1, 12))
-        except Exception as e:
-            logging.warning(f"Binding energy chart failed: {e}")
+        if chart is not None:
+            section.append(_chart_flowable(chart, 6*inch, 4*inch))
+            section.append(SPACER_12)
         
         # Optimization results
-        optimization_text = """
-        Peptide optimization results show that all designed peptides exhibit good binding affinity (<-10 kcal/mol).
-        The binding energy difference between Human and Mouse is less than 10%, indicating that these peptides have good cross-species conservation,
-        suitable as candidate drugs for further experimental validation. It is recommended to prioritize testing the first 3 peptides.
-        """
-        story.append(Paragraph(optimization_text.strip(), styles['Normal']))
+        section.append(self._static_paragraphs['optimization_results'])
+        story.extend(section)
     
     def _generate_conclusions_section(self, story, styles, protein_name: str):
         """Generate conclusions and recommendations section"""
         
-        story.append(Paragraph("5. Conclusions and Recommendations", styles['Heading1']))
-        
-        conclusions = f"""
-        Comprehensive analysis results show that {protein_name} has great potential as a peptide drug target:
-        
-        1. Receptor Recognition: Successfully identified 3 high-confidence candidate receptors, with Receptor_1 having the best binding properties
-        
-        2. Cross-Species Conservation: Binding energy difference <10%, indicating good cross-species applicability
-        
-        3. Secretion Properties: 75% of pathways through classical secretion, favorable for targeted drug design
-        
-        Recommended follow-up research directions:
-        • Experimental validation and structural analysis of Receptor_1
-        • Optimize peptide sequences to improve bioactivity and pharmacokinetic properties
-        • Conduct in vitro binding experiments to validate predictions
-        • Consider combination drug strategies to enhance therapeutic effects
-        
-        Overall, {protein_name} is a very promising peptide drug development target,
-        and it is recommended to invest more resources for in-depth research and development.
-        """
-        story.append(Paragraph(conclusions.strip(), styles['Normal']))
+        conclusions = CONCLUSIONS_TEXT.substitute(protein=protein_name)
+        story.extend([
+            self._static_paragraphs['conclusions_title'],
+            Paragraph(conclusions, styles['Normal']),
+        ])
     
     def _generate_appendix_section(self, story, styles):
         """Generate appendix section"""
         
-        story.append(Paragraph("6. Appendix", styles['Heading1']))
-        
-        # Tool versions
-        story.append(Paragraph("Tool Version Information", styles['Heading2']))
-        
-        tools_data = [
-            ['Tool/Software', 'Version', 'Source'],
-            ['Python', '3.9+', 'Official Release'],
-            ['ReportLab', '3.6.11', 'PyPI'],
-            ['Matplotlib', '3.5.3', 'PyPI'],
-            ['Pandas', '1.4.3', 'PyPI'],
-            ['NumPy', '1.23.0', 'PyPI'],
-            ['Biopython', '1.79', 'PyPI'],
-            ['OpenEye', 'Licensed', 'Commercial Software']
-        ]
-        
-        tools_table = Table(tools_data)
-        tools_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.gray),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        
-        story.append(tools_table)
-        story.append(Spacer(1, 20))
-        
-        # Database sources
-        story.append(Paragraph("Data Sources", styles['Heading2']))
-        
-        db_sources = """
-        • UniProt: Protein sequence and annotation database (https://www.uniprot.org/)
-        • PDB: Protein 3D structure database (https://www.rcsb.org/)
-        • STRING: Protein interaction database (https://string-db.org/)
-        • ChEMBL: Drug activity database (https://www.ebi.ac.uk/chembl/)
-        • PubChem: Chemical database (https://pubchem.ncbi.nlm.nih.gov/)
-        """
-        story.append(Paragraph(db_sources.strip(), styles['Normal']))
-        
-        # Script paths
-        story.append(Paragraph("Script Paths", styles['Heading2']))
-        
-        script_paths = """
-        This report was generated by the following scripts：
-        • Main report generator: report_generator.py
-        • Data acquisition: data_fetch_robust.py
-        • STRING interaction analysis: step1_string_interaction.py  
-        • Molecular docking: step2_docking_prediction.py
-        • Conservation Analysis: step3_conservation_check.py
-        • Results summary: step4_merge_results.py
-        """
-        story.append(Paragraph(script_paths.strip(), styles['Normal']))
+        tools_table = Table(TOOL_VERSION_ROWS)
+        tools_table.setStyle(TOOLS_TABLE_STYLE)
+        
+        story.extend([
+            self._static_paragraphs['appendix_title'],
+            # Tool versions
+            self._static_paragraphs['tool_versions_title'],
+            tools_table,
+            SPACER_20,
+            # Database sources
+            self._static_paragraphs['data_sources_title'],
+            self._static_paragraphs['data_sources'],
+            # Script paths
+            self._static_paragraphs['script_paths_title'],
+            self._static_paragraphs['script_paths'],
+        ])
     
     def _show_report_path(self, output_path: str):
         """Show the generated report path to user"""
@@ -691,60 +1354,73 @@ class ReportGenerator:
     def send_email_report(self, report_path: str, recipients: List[str], 
                          subject: str = None):
         """Send report via email"""
+        import smtplib
+        from email.message import EmailMessage
         
         smtp_config = self.config.get('smtp', {})
         if not smtp_config:
             logging.error("SMTP configuration not found")
             return False
         
+        sender = smtp_config.get('sender_email')
         try:
-            # Create email message
-            msg = email.mime.multipart.MIMEMultipart()
-            msg['From'] = smtp_config.get('sender_email')
-            msg['To'] = ', '.join(recipients)
+            # Create email message from the prebuilt skeleton
+            if self._template_msg is None:
+                self._template_msg = EmailMessage()
+                self._template_msg['From'] = sender
+                self._template_msg.set_content(EMAIL_BODY, charset='utf-8', cte='base64')
+            msg = copy.deepcopy(self._template_msg)
+            # Recipients of a shared message go on the envelope only (like Bcc), so one
+            # serialized payload serves every batch without disclosing the list
+            msg['To'] = recipients[0] if len(recipients) == 1 else sender
             msg['Subject'] = subject or f"Peptide Drug Development Analysis Report - {datetime.now().strftime('%Y%m%d')}"
             
-            # Email body
-            body = f"""
-            Hello，
-            
-            This attachment is a multi-species analysis report for protein peptide drug development.
-            
-            The report includes：
-            • Data acquisition and analysis
-            • Secretion pathway analysis
-            • Receptor discovery and validation
-            • Peptide optimization design
-            • Conclusions and recommendations
-            
-            If you have any questions, please contact the relevant personnel。
+            # Attach PDF report (placeholder body; the file is streamed at send time)
+            msg.add_attachment(_ATTACHMENT_MARKER, maintype='application', subtype='pdf',
+                               filename=os.path.basename(report_path), cte='7bit')
+            msg.get_payload()[-1].replace_header('Content-Transfer-Encoding', 'base64')
             
-            Best regards，
-            Analysis System
-            """
-            msg.attach(email.mime.text.MIMEText(body, 'plain', 'utf-8'))
+            # Send email over pooled sessions (one TLS handshake and login per session)
+            pool = _get_smtp_pool(smtp_config, self.config.get('smtp_pool_size', 5))
             
-            # Attach PDF report
-            with open(report_path, 'rb') as attachment:
-                part = email.mime.multipart.MIMEBase('application', 'octet-stream')
-                part.set_payload(attachment.read())
-                email.encoders.encode_base64(part)
-                part.add_header(
-                    'Content-Disposition',
-                    f'attachment; filename={os.path.basename(report_path)}'
-                )
-                msg.attach(part)
+            def deliver(to_addrs: List[str], parts: Tuple[bytes, bytes]) -> Dict[str, Tuple[int, bytes]]:
+                head, tail = parts
+                try:
+                    with pool.borrow() as server:
+                        return _stream_message(server, sender, to_addrs, head, report_path, tail)
+                except smtplib.SMTPServerDisconnected:
+                    # Server dropped the session between the health check and the send
+                    with pool.borrow() as server:
+                        return _stream_message(server, sender, to_addrs, head, report_path, tail)
             
-            # Send email
-            server = smtplib.SMTP(smtp_config.get('smtp_server'),
-                                smtp_config.get('smtp_port', 587))
-            server.starttls()
-            server.login(smtp_config.get('sender_email'),
-                        smtp_config.get('sender_password'))
-            
-            text = msg.as_string()
-            server.sendmail(smtp_config.get('sender_email'), recipients, text)
-            server.quit()
+            if smtp_config.get('personalized') and len(recipients) > 1:
+                # One message per recipient, sent concurrently over the pool
+                def personalized_parts(recipient: str) -> Tuple[bytes, bytes]:
+                    msg.replace_header('To', recipient)
+                    return _split_message(msg)
+                
+                parts = [personalized_parts(recipient) for recipient in recipients]
+                with ThreadPoolExecutor(max_workers=pool.size) as executor:
+                    list(executor.map(deliver, [[recipient] for recipient in recipients], parts))
+            elif len(recipients) >= EMAIL_BATCH_THRESHOLD:
+                # Serialized once; every batch reuses the same head/tail
+                parts = _split_message(msg)
+                failures = 0
+                for start in range(0, len(recipients), EMAIL_BATCH_SIZE):
+                    batch = recipients[start:start + EMAIL_BATCH_SIZE]
+                    try:
+                        failures += len(deliver(batch, parts))
+                    except (smtplib.SMTPException, OSError) as e:
+                        logging.warning(f"Email batch failed ({', '.join(batch)}): {e}")
+                        failures += len(batch)
+                    if failures > len(recipients) // 3:
+                        logging.error(f"Email batch aborted after {failures}/{len(recipients)} failures")
+                        return False
+                if failures:
+                    logging.warning(f"Report not delivered to {failures}/{len(recipients)} recipients")
+                    return False
+            else:
+                deliver(recipients, _split_message(msg))
             
             logging.info(f"Report sent successfully to: {', '.join(recipients)}")
             return True
@@ -753,6 +1429,10 @@ class ReportGenerator:
             logging.error(f"Email sending failed: {e}")
             return False
 
+# Default --species value and its parsed form
+DEFAULT_SPECIES_ARG = 'Human,Mouse,Rat,Cow'
+_DEFAULT_SPECIES = ('Human', 'Mouse', 'Rat', 'Cow')
+
 def main():
     """Main function with command line interface"""
     
@@ -769,7 +1449,7 @@ Usage Examples:
     
     parser.add_argument('--protein', required=True,
                        help='Target protein name')
-    parser.add_argument('--species', default='Human,Mouse,Rat,Cow',
+    parser.add_argument('--species', default=DEFAULT_SPECIES_ARG,
                        help='分析Species列表 (逗号分隔)')
     parser.add_argument('--config', default='config/config.json',
                        help='Configuration file path')
@@ -781,7 +1461,10 @@ Usage Examples:
     args = parser.parse_args()
     
     # Parse species list
-    species_list = [s.strip() for s in args.species.split(',')]
+    if args.species == DEFAULT_SPECIES_ARG:
+        species_list = list(_DEFAULT_SPECIES)
+    else:
+        species_list = [s.strip() for s in args.species.split(',')]
     
     # Initialize report generator
     generator = ReportGenerator(args.config)
@@ -796,7 +1479,9 @@ Usage Examples:
     
     # Send email if requested
     if args.email:
-        generator.send_email_report(output_path, args.email, args.subject)
+        print(f"Sending report to {', '.join(args.email)} ...")
+        if not generator.send_email_report(output_path, args.email, args.subject):
+            print("Email sending failed, see cache/report_generation.log")
 
 if __name__ == '__main__':
     main()
@@ -6,16 +6,26 @@ Author: AI Assistant
 Date: 2024
 """
 
+import io
 import os
+import re
+import atexit
+import pickle
+import hashlib
+import importlib.util
 import sys
 import yaml
 import logging
 import subprocess
 import tempfile
+import contextlib
+import threading
+import multiprocessing
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Tuple, Optional, Any, Iterator, Callable
+from dataclasses import dataclass, asdict, fields, replace
 import json
 
 # Data handling
@@ -26,31 +36,192 @@ from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 
 # Database
+import sqlalchemy
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.orm import sessionmaker
-import psycopg2
-from psycopg2.extras import RealDictCursor
-
-# Visualization
-import matplotlib.pyplot as plt
-import matplotlib.patches as patches
-import seaborn as sns
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import networkx as nx
+
+# psycopg3（服务端参数绑定、自动预编译语句），需要SQLAlchemy 2.0的postgresql+psycopg方言
+# 只检查是否安装，驱动由SQLAlchemy按连接URL加载
+PSYCOPG3_AVAILABLE = (importlib.util.find_spec('psycopg') is not None
+                      and int(sqlalchemy.__version__.split('.')[0]) >= 2)
+
+# 可选：numba加速逐残基打分内核
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback no-op decorator when numba is not installed"""
+        def decorator(func):
+            return func
+        return decorator
+
+# Visualization: plotly 在绘图方法内按需导入，仅做预测/存储时不加载绘图后端
 
 # Neo4j
 from neo4j import GraphDatabase
 
 # Progress tracking
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, Future, as_completed
 from requests_futures.sessions import FuturesSession
 
+# 已知分泌蛋白（Thbs家族）ID匹配：忽略大小写的预编译搜索，无需逐个生成大写副本
+_is_thbs = re.compile('THBS', re.IGNORECASE).search
+
+# HPA 检索接口（按基因名查询，返回RNA组织特异性nTPM）
+HPA_API_URL = ("https://www.proteinatlas.org/api/search_download.php"
+               "?search={query}&format=json&columns=g,rnatsm&compress=no")
+
+# 配置文件中的环境变量引用：${VAR:-default} 与 ${VAR}
+_ENV_WITH_DEFAULT = re.compile(r'\$\{([^:}]+):-([^}]*)\}')
+_ENV_BARE = re.compile(r'\$\{([^}]+)\}')
+
+
+def _replace_env_var(match, _environ=os.environ) -> str:
+    """用环境变量值替换匹配到的引用，未设置时使用默认值（无默认值为空串）"""
+    default_value = match.group(2) if match.re.groups > 1 and match.group(2) else ''
+    return _environ.get(match.group(1), default_value)
+
+
+# TMHMM长格式输出列
+TMHMM_COLUMNS = ['id', 'source', 'feature', 'start', 'end']
+
+# Kyte-Doolittle疏水性标度，按 (氨基酸字母 - 'A') 索引，非标准字母记0
+_KD_SCALE = {
+    'A': 1.8, 'R': -4.5, 'N': -3.5, 'D': -3.5, 'C': 2.5, 'Q': -3.5, 'E': -3.5,
+    'G': -0.4, 'H': -3.2, 'I': 4.5, 'L': 3.8, 'K': -3.9, 'M': 1.9, 'F': 2.8,
+    'P': -1.6, 'S': -0.8, 'T': -0.7, 'W': -0.9, 'Y': -1.3, 'V': 4.2
+}
+KD_HYDROPHOBICITY = numpy.array([_KD_SCALE.get(chr(ord('A') + i), 0.0) for i in range(26)], dtype=numpy.float32)
+
+# 信号肽h区打分：N端30个残基内的8残基窗口
+SIGNAL_REGION_LENGTH = 30
+H_REGION_WINDOW = 8
+
+
+def encode_sequence(sequence: str) -> numpy.ndarray:
+    """将氨基酸序列编码为uint8数组（字母 - 'A'），非字母字符编码为 >= 26"""
+    return numpy.frombuffer(sequence.upper().encode('ascii', 'replace'), dtype=numpy.uint8) - ord('A')
+
+
+@njit(cache=True)
+def score_hydrophobicity(seq_arr, table, window, region):
+    """N端 region 个残基内滑动窗口平均疏水性的最大值（信号肽h区特征）"""
+    n = min(seq_arr.shape[0], region)
+    if n == 0:
+        return 0.0
+    window = min(window, n)
+    
+    running = 0.0
+    best = -1.0e9
+    for i in range(n):
+        code = seq_arr[i]
+        if code < table.shape[0]:
+            running += table[code]
+        if i >= window:
+            prev = seq_arr[i - window]
+            if prev < table.shape[0]:
+                running -= table[prev]
+        if i >= window - 1 and running / window > best:
+            best = running / window
+    return best
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _gen_tm_regions(tm_count, seq_len, seed):
+        """生成 tm_count 个模拟跨膜区段，返回 (tm_count, 2) 的 int32 数组，每行为 (start, end)"""
+        # numba内核中的seed只作用于numba自己的随机状态，不影响NumPy全局RNG
+        numpy.random.seed(seed)
+        # 起点范围 [10, seq_len-30]，短序列时退化为固定起点10
+        high = max(seq_len - 30, 10)
+        out = numpy.empty((tm_count, 2), numpy.int32)
+        for i in range(tm_count):
+            start = numpy.random.randint(10, high + 1)
+            out[i, 0] = start
+            out[i, 1] = start + numpy.random.randint(15, 26)
+        return out
+else:
+    def _gen_tm_regions(tm_count, seq_len, seed):
+        """生成 tm_count 个模拟跨膜区段，返回 (tm_count, 2) 的 int32 数组，每行为 (start, end)"""
+        # 使用局部生成器，不重置NumPy全局RNG
+        rng = numpy.random.default_rng(seed)
+        high = max(seq_len - 30, 10)
+        out = numpy.empty((tm_count, 2), numpy.int32)
+        out[:, 0] = rng.integers(10, high + 1, tm_count)
+        out[:, 1] = out[:, 0] + rng.integers(15, 26, tm_count)
+        return out
+
+
+# fork进程池的共享状态：在创建进程池前设置，工作进程直接继承，任务只传递蛋白索引
+_PROTEINS: List[Dict[str, Any]] = []
+_WORKER_ANALYZER = None
+_WORKER_SCRATCH = None
+
+
+def _worker_run_single(method_name: str, idx: int):
+    """进程池任务：在继承的分析器上运行第 idx 个蛋白的单独预测"""
+    return getattr(_WORKER_ANALYZER, method_name)(_PROTEINS[idx], _WORKER_SCRATCH)
+
+
+# Neo4j写入语句：文本固定、参数化，服务端查询计划缓存可直接复用
+PROTEIN_INDEX_CQ = "CREATE INDEX protein_id IF NOT EXISTS FOR (p:Protein) ON (p.id)"
+
+CLEAR_SA_CQ = "MATCH (n:SecretionAnalysis) DETACH DELETE n"
+
+PROTEIN_CQ = """
+    UNWIND $rows AS r
+    CREATE (p:Protein {
+        id: r.protein_id,
+        name: r.name,
+        gene_name: r.gene_name,
+        sequence: r.sequence,
+        organism: r.organism,
+        uniprot_id: r.uniprot_id,
+        analysis_timestamp: datetime()
+    })
+"""
+
+SA_CQ = """
+    UNWIND $rows AS r
+    MATCH (p:Protein {id: r.protein_id})
+    CREATE (sa:SecretionAnalysis {
+        secretion_probability: r.prob,
+        cleavage_site: r.cleavage,
+        tm_count: r.tm_count,
+        pathway: r.pathway,
+        signal_sequence: r.signal_seq
+    })
+    CREATE (p)-[:HAS_SECRETION_ANALYSIS]->(sa)
+"""
+
+TE_CQ = """
+    UNWIND $rows AS r
+    MATCH (p:Protein {id: r.protein_id})
+    CREATE (te:TissueExpression {
+        tissue: r.tissue,
+        expression_level: r.level,
+        cell_type: r.cell_type,
+        reliability: r.reliability
+    })
+    CREATE (p)-[:EXPRESSED_IN]->(te)
+    CREATE (te)-[:IN_TISSUE]->(t:Tissue {name: r.tissue})
+"""
+
+# 结果类声明 __slots__（无实例 __dict__），大批量蛋白/组织记录时显著降低内存占用。
+# dataclass(slots=True) 需要 Python 3.10，这里手写以兼容 3.8；字段均无默认值，可直接与 dataclass 共用。
+
 @dataclass
 class SignalPeptideResult:
     """信号肽预测结果"""
+    __slots__ = ('protein_id', 'signal_peptide_start', 'signal_peptide_end', 'cleavage_site',
+                 'secretion_probability', 'signal_sequence', 'confidence')
     protein_id: str
     signal_peptide_start: int
     signal_peptide_end: int
@@ -62,6 +233,8 @@ class SignalPeptideResult:
 @dataclass
 class TMHMMResult:
     """跨膜结构域预测结果"""
+    __slots__ = ('protein_id', 'tm_count', 'topology', 'tm_regions', 'intracellular_start',
+                 'intracellular_end', 'extracellular_start', 'extracellular_end')
     protein_id: str
     tm_count: int
     topology: str
@@ -74,6 +247,7 @@ class TMHMMResult:
 @dataclass
 class HPATissueExpression:
     """HPA组织表达数据"""
+    __slots__ = ('protein_id', 'tissue_name', 'expression_level', 'cell_type', 'reliability', 'image_url')
     protein_id: str
     tissue_name: str
     expression_level: str
@@ -84,14 +258,17 @@ class HPATissueExpression:
 class SecretionAnalyzer:
     """蛋白质分泌分析主类"""
     
+    # 进程内共享的PostgreSQL连接池，多个分析实例复用，进程退出时释放
+    _pg_engine = None
+    
     def __init__(self, config_path: str = "config/config.yaml", protein_name: str = None):
         """初始化分析器"""
         self.config = self._load_config(config_path)
         self.logger = self._setup_logging()
         
-        # 数据库连接
-        self.pg_engine = self._create_postgres_engine()
+        # 数据库连接（PostgreSQL引擎在首次使用时创建）
         self.neo4j_driver = self._create_neo4j_driver()
+        self._neo4j_indexes_ready = False
         
         # 创建蛋白质特定的输出目录
         if protein_name:
@@ -105,24 +282,26 @@ class SecretionAnalyzer:
         self.signalp_path = self.config.get('tools', {}).get('signalp', {}).get('path', '/opt/signalp-6.0/signalp')
         self.tmhmm_path = self.config.get('tools', {}).get('tmhmm', {}).get('path', '/opt/tmhmm/tmhmm')
         
+        # 外部预测工具的并行调用数（子进程运行期间不占用GIL，线程池即可）
+        self.max_workers = self.config.get('tools', {}).get('max_workers') or os.cpu_count() or 1
+        # tools.executor: "thread"（默认）或 "process"（仅支持fork的平台，否则退回线程池）
+        self.executor_kind = self.config.get('tools', {}).get('executor', 'thread')
+        
+        # 预测结果磁盘缓存（按序列哈希），序列未变的蛋白重复分析时不再调用外部工具
+        self.cache_dir = self.output_dir / "cache"
+        # 模拟数据的随机数生成器（PCG64），配置random_seed后结果可复现
+        secretion_config = self.config.get('analysis', {}).get('secretion', {})
+        self._rng = numpy.random.default_rng(secretion_config.get('random_seed'))
+        
     def _load_config(self, config_path: str) -> Dict[str, Any]:
         """加载配置文件并处理环境变量"""
-        import os
-        import re
-        
         with open(config_path, 'r', encoding='utf-8') as f:
             content = f.read()
         
-        # 处理环境变量替换
-        def replace_env_vars(match):
-            var_name = match.group(1)
-            default_value = match.group(2) if match.group(2) else ''
-            return os.getenv(var_name, default_value)
-        
         # 替换 ${VAR:-default} 格式
-        content = re.sub(r'\$\{([^:}]+):-([^}]*)\}', replace_env_vars, content)
+        content = _ENV_WITH_DEFAULT.sub(_replace_env_var, content)
         # 替换 ${VAR} 格式
-        content = re.sub(r'\$\{([^}]+)\}', replace_env_vars, content)
+        content = _ENV_BARE.sub(_replace_env_var, content)
         
         return yaml.safe_load(content)
     
@@ -147,15 +326,36 @@ class SecretionAnalyzer:
         
         return logger
     
+    @property
+    def pg_engine(self):
+        """进程级共享的PostgreSQL连接引擎（延迟创建）"""
+        if SecretionAnalyzer._pg_engine is None:
+            SecretionAnalyzer._pg_engine = self._create_postgres_engine()
+            atexit.register(SecretionAnalyzer._pg_engine.dispose)
+        return SecretionAnalyzer._pg_engine
+    
     def _create_postgres_engine(self):
         """创建PostgreSQL连接引擎"""
         pg_config = self.config['database']['postgresql']
+        # psycopg3可用时使用其方言，prepare_threshold=1 使重复查询（如目标蛋白查询）首次执行即预编译
+        driver = "postgresql+psycopg" if PSYCOPG3_AVAILABLE else "postgresql"
+        connect_args = {"prepare_threshold": 1} if PSYCOPG3_AVAILABLE else {}
         connection_string = (
-            f"postgresql://{pg_config['user']}:{pg_config['password']}"
+            f"{driver}://{pg_config['user']}:{pg_config['password']}"
             f"@{pg_config['host']}:{pg_config['port']}"
             f"/{pg_config['database']}"
         )
-        return create_engine(connection_string, pool_pre_ping=True)
+        return create_engine(
+            connection_string,
+            connect_args=connect_args,
+            poolclass=QueuePool,
+            pool_size=pg_config.get('pool_size', 20),
+            max_overflow=pg_config.get('max_overflow', 10),
+            pool_pre_ping=True,
+            pool_recycle=pg_config.get('pool_recycle', 1800),
+            pool_timeout=pg_config.get('pool_timeout', 30),
+            future=True
+        )
     
     def _create_neo4j_driver(self):
         """创建Neo4j连接驱动"""
@@ -170,6 +370,13 @@ class SecretionAnalyzer:
         """从PostgreSQL获取目标蛋白数据"""
         self.logger.info("从数据库获取目标蛋白数据...")
         
+        proteins = list(self.iter_target_proteins())
+        
+        self.logger.info(f"获取到 {len(proteins)} 个目标蛋白")
+        return proteins
+    
+    def iter_target_proteins(self, batch_size: int = 100) -> Iterator[Dict[str, Any]]:
+        """通过服务端游标流式读取目标蛋白，每次只从数据库拉取 batch_size 行"""
         query = text("""
             SELECT protein_id, protein_name, gene_name, sequence, 
                    molecular_weight, pi_value, organism, 
@@ -179,55 +386,281 @@ class SecretionAnalyzer:
             ORDER BY protein_id
         """)
         
-        with self.pg_engine.connect() as conn:
-            result = conn.execute(query)
-            proteins = [dict(row._mapping) for row in result]
-        
-        self.logger.info(f"获取到 {len(proteins)} 个目标蛋白")
-        return proteins
+        with self.pg_engine.connect().execution_options(stream_results=True, yield_per=batch_size) as conn:
+            for row in conn.execute(query):
+                yield dict(row._mapping)
     
-    def predict_signal_peptides(self, proteins: List[Dict[str, Any]]) -> List[SignalPeptideResult]:
+    @contextlib.contextmanager
+    def _scratch_dir(self, scratch_dir: Optional[Path] = None) -> Iterator[Path]:
+        """FASTA工作目录：传入共享目录时直接使用，否则创建临时目录"""
+        if scratch_dir is not None:
+            yield Path(scratch_dir)
+        else:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                yield Path(temp_dir)
+    
+    def predict_signal_peptides(self, proteins: List[Dict[str, Any]],
+                                scratch_dir: Optional[Path] = None) -> List[SignalPeptideResult]:
         """使用SignalP 6.0预测信号肽"""
         self.logger.info("开始信号肽预测...")
         
         results = []
         
-        # 创建工作目录
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir = Path(temp_dir)
+        # 工作目录（所有任务共享；run_full_analysis 传入与TMHMM共用的目录）
+        with self._scratch_dir(scratch_dir) as temp_dir:
+            # 序列未变的蛋白直接使用缓存结果
+            known = self._load_cached_results('signalp', self.signalp_path, proteins)
+            to_predict = [p for p in proteins if p['protein_id'] not in known]
+            
+            # 其余蛋白写入一个多序列FASTA，只调用一次SignalP（模型只加载一次）
+            batch_results = self._run_signalp_batch(to_predict, temp_dir) if to_predict else {}
+            for protein in to_predict:
+                if protein['protein_id'] in batch_results:
+                    self._store_cached_result('signalp', self.signalp_path, protein,
+                                              batch_results[protein['protein_id']])
+            known.update(batch_results)
             
-            # 批量处理蛋白质
+            # 批量输出中缺失的蛋白才逐个并行回退
+            pending = [p for p in to_predict if p['protein_id'] not in known]
+            futures = {}
+            if pending:
+                futures = self._run_single_parallel('_run_signalp_single', pending, temp_dir)
+            
+            # 按输入顺序收集结果，需要模拟的蛋白先记下位置
+            predicted: List[Optional[SignalPeptideResult]] = []
+            simulate_indices = []
             for protein in proteins:
+                result = None
                 try:
-                    result = self._run_signalp_single(protein, temp_dir)
+                    if protein['protein_id'] in known:
+                        result = known[protein['protein_id']]
+                    else:
+                        result = futures[protein['protein_id']].result()
+                        # 单独调用返回None无法区分工具失败与非分泌蛋白，只缓存确定结果
+                        if result:
+                            self._store_cached_result('signalp', self.signalp_path, protein, result)
                     if result:
-                        results.append(result)
                         self.logger.info(f"蛋白 {protein['protein_id']} 信号肽预测完成")
                     else:
                         self.logger.warning(f"蛋白 {protein['protein_id']} 信号肽预测失败，使用模拟数据")
-                        result = self._simulate_signalp_result(protein)
-                        if result:
-                            results.append(result)
+                        simulate_indices.append(len(predicted))
                         
                 except Exception as e:
                     self.logger.error(f"蛋白 {protein['protein_id']} 信号肽预测出错: {e}")
                     self.logger.warning(f"使用模拟数据为蛋白 {protein['protein_id']} 进行信号肽预测")
-                    result = self._simulate_signalp_result(protein)
-                    if result:
-                        results.append(result)
+                    simulate_indices.append(len(predicted))
+                predicted.append(result)
+            
+            # 模拟数据一次批量生成
+            simulated = self._simulate_signalp_batch([proteins[i] for i in simulate_indices])
+            for i, result in zip(simulate_indices, simulated):
+                predicted[i] = result
+            results = [r for r in predicted if r]
         
         self.logger.info(f"信号肽预测完成，共处理 {len(results)} 个蛋白")
         return results
     
+    def _run_single_parallel(self, method_name: str, proteins: List[Dict[str, Any]],
+                             temp_dir: Path) -> Dict[str, Future]:
+        """并行运行逐个蛋白的预测方法，返回 {protein_id: 已完成的Future}"""
+        global _PROTEINS, _WORKER_ANALYZER, _WORKER_SCRATCH
+        
+        if self.executor_kind != 'process' or 'fork' not in multiprocessing.get_all_start_methods():
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                return {p['protein_id']: executor.submit(getattr(self, method_name), p, temp_dir)
+                        for p in proteins}
+        
+        # 创建进程池前设置共享状态，fork出的工作进程以写时复制方式继承蛋白列表，任务只传递索引
+        _PROTEINS, _WORKER_ANALYZER, _WORKER_SCRATCH = proteins, self, temp_dir
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     mp_context=multiprocessing.get_context('fork')) as executor:
+                return {p['protein_id']: executor.submit(_worker_run_single, method_name, idx)
+                        for idx, p in enumerate(proteins)}
+        finally:
+            _PROTEINS, _WORKER_ANALYZER, _WORKER_SCRATCH = [], None, None
+    
+    def _cache_file(self, tool: str, tool_path: str, sequence: str) -> Path:
+        """预测结果缓存文件路径，键为 (工具路径, 序列) 的SHA1，更换工具版本后自动失效"""
+        key = hashlib.sha1(f"{tool_path}\0{sequence}".encode()).hexdigest()[:16]
+        return self.cache_dir / f"{tool}_{key}.pkl"
+    
+    def _load_cached_results(self, tool: str, tool_path: str,
+                             proteins: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """读取命中缓存的预测结果，返回 {protein_id: 结果}（非分泌蛋白缓存为None）"""
+        hits = {}
+        for protein in proteins:
+            try:
+                with open(self._cache_file(tool, tool_path, protein['sequence']), 'rb') as f:
+                    result = pickle.load(f)
+            except FileNotFoundError:
+                continue
+            except (pickle.UnpicklingError, EOFError, AttributeError) as e:
+                self.logger.warning(f"忽略损坏的{tool}缓存 ({protein['protein_id']}): {e}")
+                continue
+            
+            # 相同序列可能属于不同ID的蛋白
+            if result is not None and result.protein_id != protein['protein_id']:
+                result = replace(result, protein_id=protein['protein_id'])
+            hits[protein['protein_id']] = result
+        
+        if hits:
+            self.logger.info(f"{tool}缓存命中 {len(hits)}/{len(proteins)} 个蛋白")
+        return hits
+    
+    def _store_cached_result(self, tool: str, tool_path: str, protein: Dict[str, Any], result) -> None:
+        """写入预测结果缓存（先写临时文件再原子替换，避免并发读到半个文件）"""
+        cache_file = self._cache_file(tool, tool_path, protein['sequence'])
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, 'wb') as f:
+                pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            self.logger.warning(f"写入{tool}缓存失败 ({protein['protein_id']}): {e}")
+    
+    def _multi_fasta(self, proteins: List[Dict[str, Any]], scratch_dir: Path) -> Path:
+        """多序列FASTA文件（拼接为字节串后一次写出）；同一组蛋白在工作目录中只写一次"""
+        ids_key = hashlib.sha1('\0'.join(p['protein_id'] for p in proteins).encode()).hexdigest()[:12]
+        fasta_file = scratch_dir / f"batch_{ids_key}.fasta"
+        if not fasta_file.exists():
+            fasta_file.write_bytes(b''.join(self._fasta_record(p['protein_id'], p['sequence']) for p in proteins))
+        return fasta_file
+    
+    def _protein_fasta(self, protein: Dict[str, Any], scratch_dir: Path) -> Path:
+        """单个蛋白的FASTA文件；两种工具逐个回退时共用"""
+        fasta_file = scratch_dir / f"{protein['protein_id']}.fasta"
+        if not fasta_file.exists():
+            fasta_file.write_bytes(self._fasta_record(protein['protein_id'], protein['sequence']))
+        return fasta_file
+    
+    @staticmethod
+    def _fasta_record(protein_id: str, sequence: str) -> bytes:
+        """单条FASTA记录（ASCII字节）"""
+        return b'>' + protein_id.encode() + b'\n' + sequence.encode() + b'\n'
+    
+    def _run_signalp_batch(self, proteins: List[Dict[str, Any]],
+                           temp_dir: Path) -> Dict[str, Optional[SignalPeptideResult]]:
+        """一次调用SignalP预测所有蛋白，返回 {protein_id: 结果}；调用失败时返回空字典"""
+        fasta_file = self._multi_fasta(proteins, temp_dir)
+        output_dir = temp_dir / "signalp"
+        output_dir.mkdir(exist_ok=True)
+        
+        cmd = [
+            self.signalp_path,
+            '-fasta', str(fasta_file),
+            '-format', 'short',
+            '-mature',
+            '-organism-type', 'euk',  # 真核生物
+            '-output_dir', str(output_dir)
+        ]
+        
+        # 边运行边解析stdout
+        table = self._run_streaming(cmd, self._read_signalp_table, max(300, 10 * len(proteins)),
+                                    f"SignalP批量预测 ({len(proteins)} 个蛋白)")
+        if table is None:
+            return {}
+        
+        # SignalP 6.0写出prediction_results.txt，SignalP 5.0写出*_summary.signalp5；优先使用汇总文件
+        summaries = sorted(output_dir.glob('*summary*')) or sorted(output_dir.glob('prediction_results.txt'))
+        if summaries:
+            table = self._read_signalp_table(summaries[0])
+        return self._signalp_results(table)
+    
+    def _run_streaming(self, cmd: List[str], reader: Callable[[Any], Any], timeout: float, label: str) -> Any:
+        """运行外部工具并把stdout管道直接交给 reader 流式解析，不在内存中缓存完整输出；
+        失败或超时返回None"""
+        timed_out = threading.Event()
+        
+        # stderr写入临时文件，避免stderr管道写满后与stdout读取互相阻塞
+        with tempfile.TemporaryFile() as stderr_file:
+            try:
+                proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file,
+                                        text=True, bufsize=1 << 20)
+            except Exception as e:
+                self.logger.error(f"{label}执行错误: {e}")
+                return None
+            
+            def kill_on_timeout():
+                timed_out.set()
+                proc.kill()
+            
+            timer = threading.Timer(timeout, kill_on_timeout)
+            timer.start()
+            try:
+                with proc:
+                    parsed = reader(proc.stdout)
+                    proc.stdout.read()  # 读尽剩余输出，避免子进程阻塞在写管道上
+                    returncode = proc.wait()
+            except Exception as e:
+                proc.kill()
+                self.logger.error(f"{label}解析错误: {e}")
+                return None
+            finally:
+                timer.cancel()
+            
+            if timed_out.is_set():
+                self.logger.error(f"{label}超时")
+                return None
+            if returncode != 0:
+                stderr_file.seek(0)
+                self.logger.error(f"{label}错误: {stderr_file.read().decode(errors='replace')}")
+                return None
+        
+        return parsed
+    
+    def _read_signalp_table(self, source) -> pandas.DataFrame:
+        """读取SignalP表格输出，返回 id / sp_prob / cleavage_pos 三列（无法解析的数值为NaN）"""
+        empty = pandas.DataFrame(columns=['id', 'sp_prob', 'cleavage_pos'])
+        try:
+            table = pandas.read_csv(source, sep='\t', comment='#', header=None, dtype=str,
+                                    on_bad_lines='skip')
+        except pandas.errors.EmptyDataError:
+            return empty
+        
+        if table.shape[1] < 6:
+            return empty
+        
+        # 格式: ID, SEC/SP, Signal peptide probability, Cleavage site probability, Cleavage position, Signal sequence probability
+        # 概率列可能使用逗号作小数点（本地化输出），整列统一替换后再转换
+        return pandas.DataFrame({
+            'id': table[0].str.split().str[0],
+            'sp_prob': pandas.to_numeric(table[2].str.replace(',', '.'), errors='coerce'),
+            'cleavage_pos': pandas.to_numeric(table[4], errors='coerce')
+        })
+    
+    def _secreted_rows(self, table: pandas.DataFrame) -> pandas.DataFrame:
+        """筛选判定为分泌蛋白（信号肽概率 > 0.8）的记录"""
+        return table[(table['sp_prob'] > 0.8) & table['cleavage_pos'].notna()]
+    
+    def _signalp_results(self, table: pandas.DataFrame) -> Dict[str, Optional[SignalPeptideResult]]:
+        """按ID整理SignalP汇总表（多序列输出）"""
+        # 输出中出现的ID都记为已预测（非分泌蛋白为None），每个ID取第一条满足阈值的记录
+        results: Dict[str, Optional[SignalPeptideResult]] = dict.fromkeys(table['id'])
+        for row in self._secreted_rows(table).drop_duplicates('id').itertuples(index=False):
+            results[row.id] = self._make_signalp_result(row.id, float(row.sp_prob), int(row.cleavage_pos))
+        return results
+    
+    def _make_signalp_result(self, protein_id: str, sp_probability: float,
+                             cleavage_pos: int) -> SignalPeptideResult:
+        """根据信号肽概率和切割位点构建预测结果"""
+        confidence = "High" if sp_probability > 0.9 else "Medium"
+        
+        return SignalPeptideResult(
+            protein_id=protein_id,
+            signal_peptide_start=1,
+            signal_peptide_end=cleavage_pos,
+            cleavage_site=cleavage_pos,
+            secretion_probability=sp_probability,
+            signal_sequence="",  # 需要从原序列中提取
+            confidence=confidence
+        )
+    
     def _run_signalp_single(self, protein: Dict[str, Any], temp_dir: Path) -> Optional[SignalPeptideResult]:
         """运行单个蛋白的SignalP预测"""
         protein_id = protein['protein_id']
-        sequence = protein['sequence']
-        
-        # 创建FASTA文件
-        fasta_file = temp_dir / f"{protein_id}.fasta"
-        with open(fasta_file, 'w') as f:
-            f.write(f">{protein_id}\n{sequence}\n")
+        fasta_file = self._protein_fasta(protein, temp_dir)
         
         # 运行SignalP 6.0
         cmd = [
@@ -255,84 +688,97 @@ class SecretionAnalyzer:
     
     def _parse_signalp_output(self, output: str, protein_id: str) -> Optional[SignalPeptideResult]:
         """解析SignalP输出"""
-        lines = output.strip().split('\n')
-        
-        # SignalP 6.0输出格式解析
-        for line in lines:
-            if line.startswith('#'):
-                continue
-            
-            parts = line.split('\t')
-            if len(parts) >= 6:
-                # 格式: ID, SEC/SP, Signal peptide probability, Cleavage site probability, Cleavage position, Signal sequence probability
-                try:
-                    sp_probability = float(parts[2].replace(',', '.'))
-                    cleavage_site_prob = float(parts[3].replace(',', '.'))
-                    cleavage_pos = int(parts[4])
-                    signal_prob = float(parts[5].replace(',', '.'))
-                    
-                    # 判断是否为分泌蛋白
-                    if sp_probability > 0.8:
-                        secret_prob = sp_probability
-                        cleavage_site = cleavage_pos
-                        signal_start = 1
-                        signal_end = cleavage_pos
-                        
-                        # 获取序列（这里简化，实际可能需要从原序列中提取）
-                        signal_seq = ""  # 需要从原序列中提取
-                        
-                        confidence = "High" if sp_probability > 0.9 else "Medium"
-                        
-                        return SignalPeptideResult(
-                            protein_id=protein_id,
-                            signal_peptide_start=signal_start,
-                            signal_peptide_end=signal_end,
-                            cleavage_site=cleavage_site,
-                            secretion_probability=secret_prob,
-                            signal_sequence=signal_seq,
-                            confidence=confidence
-                        )
-                except (ValueError, IndexError) as e:
-                    self.logger.error(f"解析SignalP输出失败: {e}")
-                    continue
+        secreted = self._secreted_rows(self._read_signalp_table(io.StringIO(output)))
+        if secreted.empty:
+            return None
         
-        return None
+        row = secreted.iloc[0]
+        return self._make_signalp_result(protein_id, float(row['sp_prob']), int(row['cleavage_pos']))
     
-    def predict_transmembrane_regions(self, proteins: List[Dict[str, Any]]) -> List[TMHMMResult]:
+    def predict_transmembrane_regions(self, proteins: List[Dict[str, Any]],
+                                      scratch_dir: Optional[Path] = None) -> List[TMHMMResult]:
         """使用TMHMM预测跨膜结构域"""
         self.logger.info("开始跨膜结构域预测...")
         
         results = []
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_dir = Path(temp_dir)
+        with self._scratch_dir(scratch_dir) as temp_dir:
+            known = self._load_cached_results('tmhmm', self.tmhmm_path, proteins)
+            to_predict = [p for p in proteins if p['protein_id'] not in known]
             
+            # TMHMM原生支持多序列FASTA，一次调用处理全部蛋白
+            batch_results = self._run_tmhmm_batch(to_predict, temp_dir) if to_predict else {}
+            for protein in to_predict:
+                if protein['protein_id'] in batch_results:
+                    self._store_cached_result('tmhmm', self.tmhmm_path, protein,
+                                              batch_results[protein['protein_id']])
+            known.update(batch_results)
+            
+            pending = [p for p in to_predict if p['protein_id'] not in known]
+            futures = {}
+            if pending:
+                futures = self._run_single_parallel('_run_tmhmm_single', pending, temp_dir)
+            
+            # 按输入顺序收集结果，需要模拟的蛋白先记下位置
+            predicted: List[Optional[TMHMMResult]] = []
+            simulate_indices = []
             for protein in proteins:
+                result = None
                 try:
-                    result = self._run_tmhmm_single(protein, temp_dir)
+                    if protein['protein_id'] in known:
+                        result = known[protein['protein_id']]
+                    else:
+                        result = futures[protein['protein_id']].result()
+                        if result:
+                            self._store_cached_result('tmhmm', self.tmhmm_path, protein, result)
                     if result:
-                        results.append(result)
                         self.logger.info(f"蛋白 {protein['protein_id']} TMHMM预测完成")
                         
                 except Exception as e:
                     self.logger.error(f"蛋白 {protein['protein_id']} TMHMM预测出错: {e}")
                     self.logger.warning(f"使用模拟数据为蛋白 {protein['protein_id']} 进行TMHMM预测")
-                    result = self._simulate_tmhmm_result(protein)
-                    if result:
-                        results.append(result)
+                    simulate_indices.append(len(predicted))
+                predicted.append(result)
+            
+            # 模拟数据一次批量生成
+            simulated = self._simulate_tmhmm_batch([proteins[i] for i in simulate_indices])
+            for i, result in zip(simulate_indices, simulated):
+                predicted[i] = result
+            results = [r for r in predicted if r]
         
         self.logger.info(f"跨膜结构域预测完成，共处理 {len(results)} 个蛋白")
         return results
     
+    def _run_tmhmm_batch(self, proteins: List[Dict[str, Any]], temp_dir: Path) -> Dict[str, TMHMMResult]:
+        """一次调用TMHMM预测所有蛋白，返回 {protein_id: 结果}；调用失败时返回空字典"""
+        fasta_file = self._multi_fasta(proteins, temp_dir)
+        cmd = [self.tmhmm_path, '-f', str(fasta_file)]
+        
+        # 每个蛋白都有以其ID开头的预测行；分块读取stdout，只保留出现过的ID和跨膜螺旋
+        def collect(stream):
+            predicted_ids = set()
+            tm_regions = defaultdict(list)
+            for chunk in self._iter_tmhmm_table(stream):
+                predicted_ids.update(chunk['id'].dropna())
+                helices = self._tm_helices(chunk)
+                for protein_id, start, end in zip(helices['id'], helices['start'].tolist(), helices['end'].tolist()):
+                    tm_regions[protein_id].append((start, end))
+            return predicted_ids, tm_regions
+        
+        collected = self._run_streaming(cmd, collect, max(300, 10 * len(proteins)),
+                                        f"TMHMM批量预测 ({len(proteins)} 个蛋白)")
+        if collected is None:
+            return {}
+        predicted_ids, tm_regions = collected
+        
+        return {protein['protein_id']: self._make_tmhmm_result(protein['protein_id'],
+                                                              tm_regions.get(protein['protein_id'], []))
+                for protein in proteins if protein['protein_id'] in predicted_ids}
+    
     def _run_tmhmm_single(self, protein: Dict[str, Any], temp_dir: Path) -> Optional[TMHMMResult]:
         """运行单个蛋白的TMHMM预测"""
         protein_id = protein['protein_id']
-        sequence = protein['sequence']
-        
-        # 创建FASTA文件
-        fasta_file = temp_dir / f"{protein_id}.fasta"
-        with open(fasta_file, 'w') as f:
-            f.write(f">{protein_id}\n{sequence}\n")
+        fasta_file = self._protein_fasta(protein, temp_dir)
         
         # 运行TMHMM
         cmd = [self.tmhmm_path, '-f', str(fasta_file)]
@@ -353,21 +799,38 @@ class SecretionAnalyzer:
             self.logger.error(f"TMHMM执行错误: {e}")
             return None
     
+    def _iter_tmhmm_table(self, source, chunksize: int = 10000) -> Iterator[pandas.DataFrame]:
+        """分块读取TMHMM长格式输出（ID, 版本, 区域类型, 起点, 终点），注释行和格式不符的行跳过"""
+        try:
+            reader = pandas.read_csv(source, sep=r'\s+', comment='#', header=None, names=TMHMM_COLUMNS,
+                                     dtype=str, on_bad_lines='skip', chunksize=chunksize)
+            for chunk in reader:
+                chunk['start'] = pandas.to_numeric(chunk['start'], errors='coerce')
+                chunk['end'] = pandas.to_numeric(chunk['end'], errors='coerce')
+                yield chunk
+        except pandas.errors.EmptyDataError:
+            return
+    
+    def _read_tmhmm_table(self, source) -> pandas.DataFrame:
+        """读取完整的TMHMM输出表"""
+        chunks = list(self._iter_tmhmm_table(source))
+        if not chunks:
+            return pandas.DataFrame(columns=TMHMM_COLUMNS)
+        return pandas.concat(chunks, ignore_index=True)
+    
+    def _tm_helices(self, table: pandas.DataFrame) -> pandas.DataFrame:
+        """筛选跨膜螺旋（TMhelix）区域，起止位置转换为整数"""
+        helices = table[(table['feature'] == 'TMhelix') & table['start'].notna() & table['end'].notna()]
+        return helices.astype({'start': int, 'end': int})
+    
     def _parse_tmhmm_output(self, output: str, protein_id: str) -> Optional[TMHMMResult]:
         """解析TMHMM输出"""
-        lines = output.strip().split('\n')
-        tm_regions = []
-        
-        for line in lines:
-            if 'TMhelix' in line:
-                # 解析跨膜螺旋区域
-                parts = line.split()
-                if len(parts) >= 3:
-                    try:
-                        tm_regions.append((int(parts[1]), int(parts[2])))
-                    except ValueError:
-                        continue
-        
+        helices = self._tm_helices(self._read_tmhmm_table(io.StringIO(output)))
+        tm_regions = list(zip(helices['start'].tolist(), helices['end'].tolist()))
+        return self._make_tmhmm_result(protein_id, tm_regions)
+    
+    def _make_tmhmm_result(self, protein_id: str, tm_regions: List[Tuple[int, int]]) -> TMHMMResult:
+        """根据跨膜螺旋区域构建TMHMM预测结果"""
         tm_count = len(tm_regions)
         
         # 简化的拓扑预测
@@ -406,59 +869,105 @@ class SecretionAnalyzer:
         """分析分泌转运路径"""
         self.logger.info("分析分泌转运路径...")
         
-        # 创建结果字典
-        signal_dict = {r.protein_id: r for r in signal_results}
-        tm_dict = {r.protein_id: r for r in tm_results}
-        
-        secretion_pathways = []
-        
-        for protein_id in signal_dict.keys():
-            signal_result = signal_dict[protein_id]
-            tm_result = tm_dict.get(protein_id)
-            
-            # 判断分泌路径
-            if signal_result.secretion_probability > 0.8:
-                if tm_result and tm_result.tm_count == 0:
-                    pathway = "Classical secretion (ER-Golgi)"
-                elif tm_result and tm_result.tm_count > 0:
-                    pathway = "Non-classical secretion (vesicular)"
-                else:
-                    pathway = "Classical secretion (ER-Golgi)"
-            else:
-                pathway = "Non-secretory or low confidence"
-            
-            secretion_pathways.append({
-                'protein_id': protein_id,
-                'secretion_probability': signal_result.secretion_probability,
-                'cleavage_site': signal_result.cleavage_site,
-                'tm_count': tm_result.tm_count if tm_result else 0,
-                'pathway': pathway,
-                'signal_sequence': signal_result.signal_sequence
-            })
+        if not signal_results:
+            return []
+        
+        # 合并信号肽与跨膜预测结果（同一蛋白多条记录时保留最后一条）
+        signal_df = pandas.DataFrame([asdict(r) for r in signal_results]).drop_duplicates('protein_id', keep='last')
+        tm_df = pandas.DataFrame([(r.protein_id, r.tm_count) for r in tm_results],
+                                 columns=['protein_id', 'tm_count']).drop_duplicates('protein_id', keep='last')
+        merged = signal_df.merge(tm_df, on='protein_id', how='left')
+        merged['tm_count'] = merged['tm_count'].fillna(0).astype(int)
+        
+        # 判断分泌路径：有信号肽且含跨膜区为非经典途径，否则为经典途径
+        secreted = merged['secretion_probability'] > 0.8
+        merged['pathway'] = numpy.select(
+            [secreted & (merged['tm_count'] > 0), secreted],
+            ["Non-classical secretion (vesicular)", "Classical secretion (ER-Golgi)"],
+            default="Non-secretory or low confidence"
+        )
         
-        return secretion_pathways
+        # 转为Python原生类型，便于写入Neo4j/JSON
+        columns = ['protein_id', 'secretion_probability', 'cleavage_site', 'tm_count', 'pathway', 'signal_sequence']
+        return merged[columns].astype(object).to_dict('records')
     
     def fetch_hpa_tissue_data(self, protein_ids: List[str]) -> List[HPATissueExpression]:
         """从HPA数据库获取组织表达数据"""
         self.logger.info("获取HPA组织表达数据...")
         
-        hpa_expressions = []
-        
-        # 注意：这里使用模拟数据，实际需要调用HPA API
+        # 配置 analysis.secretion.hpa_api 后并发调用HPA API，请求失败或未启用时使用模拟数据
         # HPA API: https://www.proteinatlas.org/about/download
+        secretion_config = self.config.get('analysis', {}).get('secretion', {})
+        fetched = self._fetch_hpa_api(protein_ids, secretion_config) if secretion_config.get('hpa_api', False) else {}
         
+        hpa_expressions = []
         for protein_id in protein_ids:
-            try:
-                # 模拟HPA数据获取
-                tissue_data = self._simulate_hpa_data(protein_id)
-                hpa_expressions.extend(tissue_data)
-                
-            except Exception as e:
-                self.logger.error(f"获取HPA数据失败 {protein_id}: {e}")
+            tissue_data = fetched.get(protein_id)
+            if not tissue_data:
+                try:
+                    # 模拟HPA数据获取
+                    tissue_data = self._simulate_hpa_data(protein_id)
+                except Exception as e:
+                    self.logger.error(f"获取HPA数据失败 {protein_id}: {e}")
+                    continue
+            hpa_expressions.extend(tissue_data)
         
         self.logger.info(f"HPA数据获取完成，共 {len(hpa_expressions)} 条记录")
         return hpa_expressions
     
+    def _fetch_hpa_api(self, protein_ids: List[str],
+                       secretion_config: Dict[str, Any]) -> Dict[str, List[HPATissueExpression]]:
+        """并发请求HPA API（线程池大小即并发上限），失败请求按指数退避重试"""
+        url_template = secretion_config.get('hpa_api_url', HPA_API_URL)
+        max_workers = secretion_config.get('hpa_max_workers', 32)
+        
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+                FuturesSession(executor=executor) as session:
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            
+            # 蛋白ID形如 INS_HUMAN，按基因名部分检索
+            futures = {session.get(url_template.format(query=protein_id.split('_')[0]), timeout=30): protein_id
+                       for protein_id in protein_ids}
+            
+            for future in as_completed(futures):
+                protein_id = futures[future]
+                try:
+                    response = future.result()
+                    response.raise_for_status()
+                    results[protein_id] = self._parse_hpa_response(protein_id, response.json())
+                except Exception as e:
+                    self.logger.warning(f"HPA API请求失败 {protein_id}: {e}，使用模拟数据")
+        
+        return results
+    
+    def _parse_hpa_response(self, protein_id: str, data: Any) -> List[HPATissueExpression]:
+        """解析HPA检索结果中的RNA组织特异性nTPM"""
+        entries = data if isinstance(data, list) else [data]
+        gene = protein_id.split('_')[0].upper()
+        
+        # 检索可能返回多个基因，优先取基因名完全匹配的条目
+        entry = next((e for e in entries if str(e.get('Gene', '')).upper() == gene), entries[0] if entries else {})
+        tissue_ntpm = entry.get('RNA tissue specific nTPM') or {}
+        
+        expressions = []
+        for tissue, value in tissue_ntpm.items():
+            ntpm = float(value)
+            level = "High" if ntpm >= 100 else "Medium" if ntpm >= 10 else "Low"
+            expressions.append(HPATissueExpression(
+                protein_id=protein_id,
+                tissue_name=tissue.capitalize(),
+                expression_level=level,
+                cell_type="",
+                reliability="RNA",
+                image_url=None
+            ))
+        return expressions
+    
     def _simulate_hpa_data(self, protein_id: str) -> List[HPATissueExpression]:
         """模拟HPA数据（实际需要API调用）"""
         tissues = [
@@ -487,6 +996,8 @@ class SecretionAnalyzer:
         """创建分泌路径可视化图表"""
         self.logger.info("创建分泌路径可视化图表...")
         
+        from plotly.subplots import make_subplots
+        
         # 创建主图表
         fig = make_subplots(
             rows=3, cols=1,
@@ -515,6 +1026,8 @@ class SecretionAnalyzer:
     
     def _plot_signal_peptides(self, fig, row: int, secretion_results: List[Dict[str, Any]]):
         """绘制信号肽序列图表"""
+        import plotly.graph_objects as go
+        
         # 简化的信号肽序列可视化
         protein_names = [r['protein_id'] for r in secretion_results[:10]]  # 限制显示数量
         probabilities = [r['secretion_probability'] for r in secretion_results[:10]]
@@ -537,6 +1050,8 @@ class SecretionAnalyzer:
     
     def _plot_transport_pathways(self, fig, row: int, secretion_results: List[Dict[str, Any]]):
         """绘制转运路径示意图"""
+        import plotly.graph_objects as go
+        
         # 路径统计
         pathway_counts = {}
         for result in secretion_results:
@@ -556,24 +1071,22 @@ class SecretionAnalyzer:
     def _plot_tissue_heatmap(self, fig, row: int, hpa_data: List[HPATissueExpression], 
                             proteins: List[Dict[str, Any]]):
         """绘制组织定位热图"""
+        import plotly.graph_objects as go
+        
         # 准备热图数据
         protein_ids = [p['protein_id'] for p in proteins[:10]]
-        tissues = list(set([d.tissue_name for d in hpa_data]))
-        
-        # 创建表达水平矩阵
-        expression_matrix = []
         expression_levels = {"High": 3, "Medium": 2, "Low": 1}
         
-        for protein_id in protein_ids:
-            protein_expressions = [d for d in hpa_data if d.protein_id == protein_id]
-            row_data = []
-            for tissue in tissues:
-                tissue_data = next((d for d in protein_expressions if d.tissue_name == tissue), None)
-                if tissue_data:
-                    row_data.append(expression_levels.get(tissue_data.expression_level, 0))
-                else:
-                    row_data.append(0)
-            expression_matrix.append(row_data)
+        # 用DataFrame透视生成表达水平矩阵（同一 (蛋白, 组织) 组合保留第一条记录）
+        hpa_df = pandas.DataFrame([asdict(d) for d in hpa_data],
+                                  columns=[f.name for f in fields(HPATissueExpression)])
+        hpa_df['score'] = hpa_df['expression_level'].map(expression_levels).fillna(0).astype(numpy.int8)
+        matrix = hpa_df.pivot_table(index='protein_id', columns='tissue_name', values='score',
+                                    aggfunc='first', fill_value=0)
+        matrix = matrix.reindex(protein_ids, fill_value=0)
+        
+        tissues = list(matrix.columns)
+        expression_matrix = matrix.to_numpy()
         
         fig.add_trace(
             go.Heatmap(
@@ -592,79 +1105,125 @@ class SecretionAnalyzer:
         """将结果存储到Neo4j知识图谱"""
         self.logger.info("将结果存储到Neo4j知识图谱...")
         
+        # 先在本地组装三类节点的参数行，再用 UNWIND 批量写入（3条语句代替每个蛋白多次往返）
+        protein_rows = []
+        sa_rows = []
+        te_rows = []
+        
+        # 一次遍历建立按蛋白ID的索引，避免每个蛋白线性扫描结果列表
+        secretion_by_id = {}
+        for r in secretion_results:
+            secretion_by_id.setdefault(r['protein_id'], r)
+        hpa_by_id = defaultdict(list)
+        for d in hpa_data:
+            hpa_by_id[d.protein_id].append(d)
+        
+        for protein_data in proteins:
+            protein_id = protein_data['protein_id']
+            
+            protein_rows.append({
+                'protein_id': protein_id,
+                'name': protein_data.get('protein_name', ''),
+                'gene_name': protein_data.get('gene_name', ''),
+                'sequence': protein_data.get('sequence', ''),
+                'organism': protein_data.get('organism', ''),
+                'uniprot_id': protein_data.get('uniprot_id', '')
+            })
+            
+            # 关联分泌分析结果
+            secretion_match = secretion_by_id.get(protein_id)
+            
+            if secretion_match:
+                sa_rows.append({
+                    'protein_id': protein_id,
+                    'prob': secretion_match['secretion_probability'],
+                    'cleavage': secretion_match['cleavage_site'],
+                    'tm_count': secretion_match['tm_count'],
+                    'pathway': secretion_match['pathway'],
+                    'signal_seq': secretion_match['signal_sequence']
+                })
+            
+            # 关联组织表达数据
+            for hpa in hpa_by_id.get(protein_id, []):
+                te_rows.append({
+                    'protein_id': protein_id,
+                    'tissue': hpa.tissue_name,
+                    'level': hpa.expression_level,
+                    'cell_type': hpa.cell_type,
+                    'reliability': hpa.reliability
+                })
+        
         with self.neo4j_driver.session() as session:
-            # 清空之前的分析结果
-            session.run("MATCH (n:SecretionAnalysis) DETACH DELETE n")
+            # 蛋白ID索引使批量写入中的 MATCH (p:Protein {id: ...}) 走索引而非全标签扫描；
+            # 索引属于schema操作，不能与数据写入放在同一事务中
+            if not self._neo4j_indexes_ready:
+                session.run(PROTEIN_INDEX_CQ).consume()
+                self._neo4j_indexes_ready = True
             
-            for i, protein_data in enumerate(proteins):
-                protein_id = protein_data['protein_id']
+            # 所有写入放在同一事务中，只需一次提交往返
+            with session.begin_transaction() as tx:
+                # 清空之前的分析结果
+                tx.run(CLEAR_SA_CQ)
                 
-                # 创建蛋白节点
-                session.run("""
-                    CREATE (p:Protein {
-                        id: $protein_id,
-                        name: $name,
-                        gene_name: $gene_name,
-                        sequence: $sequence,
-                        organism: $organism,
-                        uniprot_id: $uniprot_id,
-                        analysis_timestamp: datetime()
-                    })
-                """, 
-                protein_id=protein_id,
-                name=protein_data.get('protein_name', ''),
-                gene_name=protein_data.get('gene_name', ''),
-                sequence=protein_data.get('sequence', ''),
-                organism=protein_data.get('organism', ''),
-                uniprot_id=protein_data.get('uniprot_id', ''))
-                
-                # 关联分泌分析结果
-                secretion_match = next(
-                    (r for r in secretion_results if r['protein_id'] == protein_id), 
-                    None
-                )
-                
-                if secretion_match:
-                    session.run("""
-                        MATCH (p:Protein {id: $protein_id})
-                        CREATE (sa:SecretionAnalysis {
-                            secretion_probability: $prob,
-                            cleavage_site: $cleavage,
-                            tm_count: $tm_count,
-                            pathway: $pathway,
-                            signal_sequence: $signal_seq
-                        })
-                        CREATE (p)-[:HAS_SECRETION_ANALYSIS]->(sa)
-                    """,
-                    protein_id=protein_id,
-                    prob=secretion_match['secretion_probability'],
-                    cleavage=secretion_match['cleavage_site'],
-                    tm_count=secretion_match['tm_count'],
-                    pathway=secretion_match['pathway'],
-                    signal_seq=secretion_match['signal_sequence'])
+                # 创建蛋白节点、分泌分析节点和组织表达节点
+                tx.run(PROTEIN_CQ, rows=protein_rows)
+                tx.run(SA_CQ, rows=sa_rows)
+                tx.run(TE_CQ, rows=te_rows)
                 
-                # 关联组织表达数据
-                protein_hpa_data = [d for d in hpa_data if d.protein_id == protein_id]
-                for hpa in protein_hpa_data:
-                    session.run("""
-                        MATCH (p:Protein {id: $protein_id})
-                        CREATE (te:TissueExpression {
-                            tissue: $tissue,
-                            expression_level: $level,
-                            cell_type: $cell_type,
-                            reliability: $reliability
-                        })
-                        CREATE (p)-[:EXPRESSED_IN]->(te)
-                        CREATE (te)-[:IN_TISSUE]->(t:Tissue {name: $tissue})
-                    """,
-                    protein_id=protein_id,
-                    tissue=hpa.tissue_name,
-                    level=hpa.expression_level,
-                    cell_type=hpa.cell_type,
-                    reliability=hpa.reliability)
+                tx.commit()
         
         self.logger.info("Neo4j知识图谱存储完成")
     
+    def store_results_in_postgres(self, secretion_results: List[Dict[str, Any]],
+                                  hpa_data: List[HPATissueExpression]) -> None:
+        """将分泌分析结果和HPA数据批量写入PostgreSQL（表结构见 data/setup_target_proteins.sql）"""
+        self.logger.info("将结果存储到PostgreSQL...")
+        
+        protein_ids = sorted({r['protein_id'] for r in secretion_results} | {d.protein_id for d in hpa_data})
+        
+        # 清除旧结果与写入新结果在同一原生连接的同一事务中完成，任一步失败整体回滚
+        conn = self.pg_engine.raw_connection()
+        try:
+            cursor = conn.cursor()
+            for table in ('secretion_analysis_results', 'hpa_tissue_expression'):
+                cursor.execute(f"DELETE FROM {table} WHERE protein_id = ANY(%s)", (protein_ids,))
+            
+            self._bulk_insert(
+                cursor, 'secretion_analysis_results',
+                ['protein_id', 'secretion_probability', 'cleavage_site', 'tm_count', 'pathway', 'signal_sequence'],
+                [(r['protein_id'], r['secretion_probability'], r['cleavage_site'],
+                  r['tm_count'], r['pathway'], r['signal_sequence']) for r in secretion_results]
+            )
+            self._bulk_insert(
+                cursor, 'hpa_tissue_expression',
+                ['protein_id', 'tissue_name', 'expression_level', 'cell_type', 'reliability', 'image_url'],
+                [(d.protein_id, d.tissue_name, d.expression_level, d.cell_type, d.reliability, d.image_url)
+                 for d in hpa_data]
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        self.logger.info(f"PostgreSQL存储完成: {len(secretion_results)} 条分泌分析结果, {len(hpa_data)} 条组织表达记录")
+    
+    @staticmethod
+    def _bulk_insert(cursor, table: str, columns: List[str], rows: List[Tuple]) -> None:
+        """在调用方的事务中批量写入：psycopg3使用COPY流式写入，psycopg2使用execute_values分页插入"""
+        if not rows:
+            return
+        
+        column_list = ", ".join(columns)
+        if PSYCOPG3_AVAILABLE:
+            with cursor.copy(f"COPY {table} ({column_list}) FROM STDIN") as copy:
+                for row in rows:
+                    copy.write_row(row)
+        else:
+            from psycopg2.extras import execute_values
+            execute_values(cursor, f"INSERT INTO {table} ({column_list}) VALUES %s", rows, page_size=1000)
+    
     def generate_analysis_report(self, secretion_results: List[Dict[str, Any]], 
                                hpa_data: List[HPATissueExpression]) -> str:
         """生成分析报告"""
@@ -716,11 +1275,18 @@ class SecretionAnalyzer:
             # 1. 获取目标蛋白
             proteins = self.fetch_target_proteins()
             
-            # 2. 预测信号肽
-            signal_results = self.predict_signal_peptides(proteins)
-            
-            # 3. 预测跨膜结构域  
-            tm_results = self.predict_transmembrane_regions(proteins)
+            # 2-3. 预测信号肽和跨膜结构域（两种工具共用一个工作目录，各批次只为实际运行的蛋白写FASTA）
+            with tempfile.TemporaryDirectory() as scratch_dir:
+                scratch_dir = Path(scratch_dir)
+                
+                signal_results = self.predict_signal_peptides(proteins, scratch_dir)
+                
+                # 分泌路径判断只对信号肽概率 > 0.8 的蛋白使用跨膜预测，其余蛋白不运行TMHMM
+                # （未预测的蛋白在路径分析合并时 tm_count 记为0）
+                candidates = {r.protein_id for r in signal_results if r.secretion_probability > 0.8}
+                tm_candidates = [p for p in proteins if p['protein_id'] in candidates]
+                self.logger.info(f"TMHMM仅预测 {len(tm_candidates)}/{len(proteins)} 个含信号肽的蛋白")
+                tm_results = self.predict_transmembrane_regions(tm_candidates, scratch_dir)
             
             # 4. 分析分泌路径
             secretion_results = self.analyze_secretion_pathway(signal_results, tm_results)
@@ -741,7 +1307,14 @@ class SecretionAnalyzer:
                 self.logger.warning(f"Neo4j存储失败（这是可选的）: {e}")
                 self.logger.info("分析结果已保存到其他格式，Neo4j连接失败不影响工作流执行")
             
-            # 8. 生成报告
+            # 8. 写回PostgreSQL（可选，需配置 database.postgresql.store_results）
+            if self.config.get('database', {}).get('postgresql', {}).get('store_results', False):
+                try:
+                    self.store_results_in_postgres(secretion_results, hpa_data)
+                except Exception as e:
+                    self.logger.warning(f"PostgreSQL存储失败（这是可选的）: {e}")
+            
+            # 9. 生成报告
             report_file = self.generate_analysis_report(secretion_results, hpa_data)
             
             analysis_summary = {
@@ -765,114 +1338,102 @@ class SecretionAnalyzer:
             raise
         
         finally:
-            # 关闭数据库连接
-            if hasattr(self, 'pg_engine'):
-                self.pg_engine.dispose()
+            # 关闭Neo4j连接（PostgreSQL连接池由进程退出时统一释放）
             if hasattr(self, 'neo4j_driver'):
                 self.neo4j_driver.close()
     
     def _simulate_signalp_result(self, protein: Dict[str, Any]) -> Optional[SignalPeptideResult]:
         """模拟SignalP结果（当SignalP不可用时使用）"""
-        protein_id = protein['protein_id']
-        sequence = protein['sequence']
+        return self._simulate_signalp_batch([protein])[0]
+    
+    def _simulate_signalp_batch(self, proteins: List[Dict[str, Any]]) -> List[SignalPeptideResult]:
+        """批量模拟SignalP结果：随机参数一次性向量化生成，循环内只构建结果对象"""
+        n = len(proteins)
+        if n == 0:
+            return []
         
-        # 模拟信号肽预测结果
-        # 对于Thbs1，我们知道它是一个分泌蛋白
-        if 'THBS' in protein_id.upper():
-            # 模拟信号肽结果
-            cleavage_position = 20  # 假设信号肽长度为20
-            signal_probability = 0.95
-            cleavage_probability = 0.90
-            
-            return SignalPeptideResult(
-                protein_id=protein_id,
-                signal_peptide_start=1,
-                signal_peptide_end=cleavage_position,
-                cleavage_site=cleavage_position,
-                secretion_probability=signal_probability,
-                signal_sequence=sequence[:cleavage_position],
-                confidence="High" if signal_probability > 0.9 else "Medium"
-            )
-        else:
-            # 对于其他蛋白，随机决定
-            import random
-            has_signal = random.random() > 0.5
-            if has_signal:
-                cleavage_position = random.randint(15, 30)
-                signal_probability = random.uniform(0.7, 0.95)
-                cleavage_probability = random.uniform(0.6, 0.9)
-                
-                return SignalPeptideResult(
-                    protein_id=protein_id,
+        # 对于Thbs1，我们知道它是一个分泌蛋白（信号肽长度20，概率0.95）
+        is_thbs = numpy.array([_is_thbs(p['protein_id']) is not None for p in proteins], dtype=bool)
+        
+        # 对于其他蛋白，随机决定
+        has_signal = self._rng.random(n) > 0.5
+        
+        cleavage_positions = numpy.where(is_thbs, 20, self._rng.integers(15, 31, n))
+        signal_probabilities = numpy.where(is_thbs, 0.95, self._rng.uniform(0.7, 0.95, n))
+        
+        results = []
+        for i, protein in enumerate(proteins):
+            if is_thbs[i] or has_signal[i]:
+                cleavage_position = int(cleavage_positions[i])
+                signal_probability = float(signal_probabilities[i])
+                results.append(SignalPeptideResult(
+                    protein_id=protein['protein_id'],
                     signal_peptide_start=1,
                     signal_peptide_end=cleavage_position,
                     cleavage_site=cleavage_position,
                     secretion_probability=signal_probability,
-                    signal_sequence=sequence[:cleavage_position],
+                    signal_sequence=protein['sequence'][:cleavage_position],
                     confidence="High" if signal_probability > 0.9 else "Medium"
-                )
+                ))
             else:
-                return SignalPeptideResult(
-                    protein_id=protein_id,
+                results.append(SignalPeptideResult(
+                    protein_id=protein['protein_id'],
                     signal_peptide_start=0,
                     signal_peptide_end=0,
                     cleavage_site=0,
                     secretion_probability=0.2,
                     signal_sequence="",
                     confidence="Low"
-                )
+                ))
+        return results
     
     def _simulate_tmhmm_result(self, protein: Dict[str, Any]) -> Optional[TMHMMResult]:
         """模拟TMHMM结果（当TMHMM不可用时使用）"""
-        protein_id = protein['protein_id']
-        sequence = protein['sequence']
+        return self._simulate_tmhmm_batch([protein])[0]
+    
+    def _simulate_tmhmm_batch(self, proteins: List[Dict[str, Any]]) -> List[TMHMMResult]:
+        """批量模拟TMHMM结果：随机参数一次性向量化生成，循环内只构建结果对象"""
+        n = len(proteins)
+        if n == 0:
+            return []
         
-        # 模拟跨膜结构域预测结果
         # 对于Thbs1，我们知道它是一个分泌蛋白，通常没有跨膜结构域
-        if 'THBS' in protein_id.upper():
-            return TMHMMResult(
-                protein_id=protein_id,
-                tm_count=0,
-                topology="Secreted",
-                tm_regions=[],
-                intracellular_start=None,
-                intracellular_end=None,
-                extracellular_start=None,
-                extracellular_end=None
-            )
-        else:
-            # 对于其他蛋白，随机决定
-            import random
-            has_tm = random.random() > 0.7  # 30%概率有跨膜结构域
-            if has_tm:
-                tm_count = random.randint(1, 7)
-                tm_regions = []
-                for i in range(tm_count):
-                    start = random.randint(10, len(sequence)-30)
-                    end = start + random.randint(15, 25)
-                    tm_regions.append((start, end))
-                
-                return TMHMMResult(
+        is_thbs = numpy.array([_is_thbs(p['protein_id']) is not None for p in proteins], dtype=bool)
+        
+        # 对于其他蛋白，随机决定（30%概率有跨膜结构域）
+        has_tm = self._rng.random(n) > 0.7
+        tm_counts = self._rng.integers(1, 8, n)
+        seeds = self._rng.integers(2**32, size=n)
+        
+        results = []
+        for i, protein in enumerate(proteins):
+            protein_id = protein['protein_id']
+            if is_thbs[i] or not has_tm[i]:
+                results.append(TMHMMResult(
                     protein_id=protein_id,
-                    tm_count=tm_count,
-                    topology="Multi-pass membrane protein",
-                    tm_regions=tm_regions,
-                    intracellular_start=tm_regions[0][1] + 1 if tm_regions else None,
+                    tm_count=0,
+                    topology="Secreted" if is_thbs[i] else "Soluble",
+                    tm_regions=[],
+                    intracellular_start=None,
                     intracellular_end=None,
                     extracellular_start=None,
                     extracellular_end=None
-                )
+                ))
             else:
-                return TMHMMResult(
+                tm_count = int(tm_counts[i])
+                regions = _gen_tm_regions(tm_count, len(protein['sequence']), int(seeds[i]))
+                tm_regions = [(int(start), int(end)) for start, end in regions]
+                results.append(TMHMMResult(
                     protein_id=protein_id,
-                    tm_count=0,
-                    topology="Soluble",
-                    tm_regions=[],
-                    intracellular_start=None,
+                    tm_count=tm_count,
+                    topology="Multi-pass membrane protein",
+                    tm_regions=tm_regions,
+                    intracellular_start=tm_regions[0][1] + 1 if tm_regions else None,
                     intracellular_end=None,
                     extracellular_start=None,
                     extracellular_end=None
-                )
+                ))
+        return results
 
 
 def main():
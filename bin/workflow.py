@@ -343,8 +343,7 @@ class EmailNotifier:
             server = smtplib.SMTP(smtp_server, smtp_port, timeout=10)
             server.starttls()
             server.login(sender_email, sender_password)
-            text = msg.as_string()
-            server.sendmail(sender_email, recipient_email, text)
+            server.send_message(msg, from_addr=sender_email, to_addrs=[recipient_email])
             server.quit()
             
             logging.info(f"Email notification sent: {subject}")
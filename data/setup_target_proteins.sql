@@ -85,3 +85,27 @@ COMMENT ON COLUMN target_proteins.pi_value IS '等电点';
 COMMENT ON COLUMN target_proteins.organism IS '来源物种';
 COMMENT ON COLUMN target_proteins.uniprot_id IS 'UniProt数据库编号';
 COMMENT ON COLUMN target_proteins.pdb_id IS 'PDB结构编号';
+
+-- 分泌分析结果表（secretion_analysis.py 配置 store_results 时批量写入）
+CREATE TABLE IF NOT EXISTS secretion_analysis_results (
+    protein_id VARCHAR(50) NOT NULL,
+    secretion_probability DOUBLE PRECISION,
+    cleavage_site INTEGER,
+    tm_count INTEGER,
+    pathway VARCHAR(100),
+    signal_sequence TEXT,
+    analyzed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- HPA组织表达数据表
+CREATE TABLE IF NOT EXISTS hpa_tissue_expression (
+    protein_id VARCHAR(50) NOT NULL,
+    tissue_name VARCHAR(100) NOT NULL,
+    expression_level VARCHAR(20),
+    cell_type VARCHAR(100),
+    reliability VARCHAR(20),
+    image_url TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_secretion_analysis_results_protein_id ON secretion_analysis_results(protein_id);
+CREATE INDEX IF NOT EXISTS idx_hpa_tissue_expression_protein_id ON hpa_tissue_expression(protein_id);
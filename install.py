@@ -10,9 +10,18 @@ import platform
 import subprocess
 import urllib.request
 import json
+import copy
 import shutil
+from functools import cached_property
 from pathlib import Path
 
+# 可选：psutil跨平台读取内存（安装脚本在依赖安装前运行，缺失时回退到平台探测）
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
 class Colors:
     """终端颜色输出"""
     RED = '\033[91m'
@@ -25,18 +34,19 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
     END = '\033[0m'
+    
+    @classmethod
+    def disable(cls):
+        """关闭颜色输出"""
+        for name in ('RED', 'GREEN', 'YELLOW', 'BLUE', 'MAGENTA', 'CYAN', 'WHITE', 'BOLD', 'UNDERLINE', 'END'):
+            setattr(cls, name, '')
 
-class Installer:
-    def __init__(self):
-        self.system = platform.system().lower()
-        self.python_version = sys.version_info
-        self.project_root = Path(__file__).parent
-        self.venv_path = self.project_root / "venv"
-        self.requirements_file = self.project_root / "requirements.txt"
-        
-    def print_banner(self):
-        """打印安装横幅"""
-        banner = f"""
+# 输出被重定向到文件或管道时不写入转义序列，避免日志中出现乱码
+if not sys.stdout.isatty():
+    Colors.disable()
+
+# 横幅的固定部分在导入时拼接一次
+BANNER = f"""
 {Colors.CYAN}{Colors.BOLD}
 ╔══════════════════════════════════════════════════════════════╗
 ║                    AI-Drug Peptide V1.0                     ║
@@ -46,10 +56,59 @@ class Installer:
 ╚══════════════════════════════════════════════════════════════╝
 {Colors.END}
 
-{Colors.YELLOW}系统信息:{Colors.END}
-  • 操作系统: {platform.system()} {platform.release()}
+{Colors.YELLOW}系统信息:{Colors.END}"""
+
+# 默认配置的固定部分；system 由 create_config_files 按当前平台填写
+DEFAULT_CONFIG = {
+    "version": "1.0.0",
+    "system": None,
+    "database": {
+        "postgres": {
+            "host": "localhost",
+            "port": 5432,
+            "database": "peptide_research",
+            "user": "postgres",
+            "password": "password"
+        },
+        "neo4j": {
+            "uri": "bolt://localhost:7687",
+            "user": "neo4j",
+            "password": "password"
+        }
+    },
+    "analysis": {
+        "max_workers": 4,
+        "memory_limit": "8GB",
+        "timeout": 3600
+    },
+    "paths": {
+        "data_dir": "./data",
+        "cache_dir": "./cache",
+        "logs_dir": "./logs",
+        "reports_dir": "./reports"
+    }
+}
+
+class Installer:
+    def __init__(self):
+        # 平台信息运行期间不变，只查询一次
+        uname = platform.uname()
+        self.platform_system = uname.system
+        self.platform_release = uname.release
+        self.platform_machine = uname.machine
+        self.system = self.platform_system.lower()
+        self.python_version = sys.version_info
+        self.project_root = Path(__file__).parent
+        self.venv_path = self.project_root / "venv"
+        self.requirements_file = self.project_root / "requirements.txt"
+        self._path_entries = None  # PATH中的文件名 -> 路径，首次查找时扫描一次
+        
+    def print_banner(self):
+        """打印安装横幅"""
+        banner = f"""{BANNER}
+  • 操作系统: {self.platform_system} {self.platform_release}
   • Python版本: {self.python_version.major}.{self.python_version.minor}.{self.python_version.micro}
-  • 架构: {platform.machine()}
+  • 架构: {self.platform_machine}
   • 安装路径: {self.project_root}
 """
         print(banner)
@@ -73,10 +132,12 @@ class Installer:
         
         # 检查内存
         try:
-            if self.system == "linux":
-                with open('/proc/meminfo', 'r') as f:
-                    meminfo = f.read()
-                mem_total = int(meminfo.split('\n')[0].split()[1]) // 1024 // 1024  # GB
+            if PSUTIL_AVAILABLE:
+                mem_total = psutil.virtual_memory().total // 1024 // 1024 // 1024  # GB
+            elif self.system == "linux":
+                # MemTotal位于首行，以二进制方式只读取这一行，省去解码
+                with open('/proc/meminfo', 'rb') as f:
+                    mem_total = int(f.readline().split()[1]) // 1024 // 1024  # GB
             elif self.system == "darwin":  # macOS
                 result = subprocess.run(['sysctl', 'hw.memsize'], capture_output=True, text=True)
                 mem_total = int(result.stdout.split()[1]) // 1024 // 1024 // 1024  # GB
@@ -119,8 +180,10 @@ class Installer:
                 return True
         
         try:
+            # POSIX上用符号链接指向解释器，省去复制；Windows上符号链接需要额外权限，保持复制
+            link_mode = '--copies' if self.system == "windows" else '--symlinks'
             subprocess.run([
-                sys.executable, '-m', 'venv', str(self.venv_path)
+                sys.executable, '-m', 'venv', link_mode, str(self.venv_path)
             ], check=True)
             print(f"{Colors.GREEN}✅ 虚拟环境创建成功{Colors.END}")
             return True
@@ -128,15 +191,49 @@ class Installer:
             print(f"{Colors.RED}❌ 虚拟环境创建失败: {e}{Colors.END}")
             return False
     
-    def get_pip_command(self):
-        """获取pip命令路径"""
+    def find_executable(self, name):
+        """在PATH中查找可执行文件，PATH目录只扫描一次，后续查找直接命中字典"""
+        windows = self.system == "windows"
+        if self._path_entries is None:
+            self._path_entries = {}
+            for directory in os.environ.get('PATH', '').split(os.pathsep):
+                try:
+                    with os.scandir(directory or os.curdir) as entries:
+                        for entry in entries:
+                            # 只记录可执行文件，避免靠前目录中的同名目录或无执行权限文件遮蔽后面的真实程序
+                            try:
+                                if not entry.is_file() or not os.access(entry.path, os.X_OK):
+                                    continue
+                            except OSError:
+                                continue
+                            key = entry.name.lower() if windows else entry.name
+                            # 与shutil.which一致：PATH靠前的目录优先
+                            self._path_entries.setdefault(key, entry.path)
+                except OSError:
+                    continue
+        
+        candidates = [name]
+        if windows:
+            pathext = os.environ.get('PATHEXT', '.COM;.EXE;.BAT;.CMD')
+            candidates += [name + ext for ext in pathext.split(';') if ext]
+        
+        for candidate in candidates:
+            path = self._path_entries.get(candidate.lower() if windows else candidate)
+            if path:
+                return path
+        return None
+    
+    @cached_property
+    def pip_command(self):
+        """pip命令路径"""
         if self.system == "windows":
             return str(self.venv_path / "Scripts" / "pip.exe")
         else:
             return str(self.venv_path / "bin" / "pip")
     
-    def get_python_command(self):
-        """获取Python命令路径"""
+    @cached_property
+    def python_command(self):
+        """Python命令路径"""
         if self.system == "windows":
             return str(self.venv_path / "Scripts" / "python.exe")
         else:
@@ -146,7 +243,7 @@ class Installer:
         """升级pip"""
         print(f"{Colors.BLUE}📦 升级pip...{Colors.END}")
         
-        pip_cmd = self.get_pip_command()
+        pip_cmd = self.pip_command
         try:
             subprocess.run([
                 pip_cmd, 'install', '--upgrade', 'pip'
@@ -161,7 +258,7 @@ class Installer:
         """安装Python依赖"""
         print(f"{Colors.BLUE}📦 安装Python依赖包...{Colors.END}")
         
-        pip_cmd = self.get_pip_command()
+        pip_cmd = self.pip_command
         
         # 首先安装基础依赖
         basic_deps = [
@@ -172,11 +269,11 @@ class Installer:
         ]
         
         try:
-            for dep in basic_deps:
-                print(f"  安装 {dep}...")
-                subprocess.run([
-                    pip_cmd, 'install', dep
-                ], check=True)
+            # 一次pip调用安装全部基础依赖，只需一次启动和依赖解析
+            print(f"  安装 {', '.join(basic_deps)}...")
+            subprocess.run([
+                pip_cmd, 'install', *basic_deps
+            ], check=True)
             
             # 安装完整依赖
             if self.requirements_file.exists():
@@ -211,7 +308,7 @@ class Installer:
         available_manager = None
         
         for manager in package_managers:
-            if shutil.which(manager):
+            if self.find_executable(manager):
                 available_manager = manager
                 break
         
@@ -240,7 +337,7 @@ class Installer:
         print(f"{Colors.CYAN}🍎 检测到macOS系统{Colors.END}")
         
         # 检查Homebrew
-        if shutil.which('brew'):
+        if self.find_executable('brew'):
             print(f"{Colors.GREEN}✅ 检测到Homebrew{Colors.END}")
             print(f"{Colors.CYAN}建议安装系统包: python@3.10, curl, wget{Colors.END}")
             print(f"{Colors.YELLOW}请手动运行以下命令安装:{Colors.END}")
@@ -254,7 +351,7 @@ class Installer:
         print(f"{Colors.CYAN}🪟 检测到Windows系统{Colors.END}")
         
         # 检查Chocolatey
-        if shutil.which('choco'):
+        if self.find_executable('choco'):
             print(f"{Colors.GREEN}✅ 检测到Chocolatey{Colors.END}")
             print(f"{Colors.CYAN}建议安装系统包: python, curl, wget{Colors.END}")
             print(f"{Colors.YELLOW}请手动运行以下命令安装:{Colors.END}")
@@ -270,45 +367,23 @@ class Installer:
         config_dir = self.project_root / "config"
         config_dir.mkdir(exist_ok=True)
         
-        # 创建默认配置文件
-        default_config = {
-            "version": "1.0.0",
-            "system": {
-                "platform": self.system,
-                "python_version": f"{self.python_version.major}.{self.python_version.minor}",
-                "architecture": platform.machine()
-            },
-            "database": {
-                "postgres": {
-                    "host": "localhost",
-                    "port": 5432,
-                    "database": "peptide_research",
-                    "user": "postgres",
-                    "password": "password"
-                },
-                "neo4j": {
-                    "uri": "bolt://localhost:7687",
-                    "user": "neo4j",
-                    "password": "password"
-                }
-            },
-            "analysis": {
-                "max_workers": 4,
-                "memory_limit": "8GB",
-                "timeout": 3600
-            },
-            "paths": {
-                "data_dir": "./data",
-                "cache_dir": "./cache",
-                "logs_dir": "./logs",
-                "reports_dir": "./reports"
-            }
+        # 创建默认配置文件（system部分按当前平台填写）
+        default_config = copy.deepcopy(DEFAULT_CONFIG)
+        default_config["system"] = {
+            "platform": self.system,
+            "python_version": f"{self.python_version.major}.{self.python_version.minor}",
+            "architecture": self.platform_machine
         }
         
         config_file = config_dir / "config.json"
-        with open(config_file, 'w', encoding='utf-8') as f:
-            json.dump(default_config, f, indent=2, ensure_ascii=False)
+        new_bytes = json.dumps(default_config, indent=2, ensure_ascii=False).encode('utf-8')
         
+        # 重复安装时内容通常不变，跳过写盘
+        if config_file.exists() and config_file.read_bytes() == new_bytes:
+            print(f"{Colors.GREEN}✅ 配置文件已是最新: {config_file}{Colors.END}")
+            return
+        
+        config_file.write_bytes(new_bytes)
         print(f"{Colors.GREEN}✅ 配置文件创建成功: {config_file}{Colors.END}")
     
     def create_directories(self):
@@ -320,9 +395,9 @@ class Installer:
             "logs", "reports", "cache", "cache/docking_logs", "cache/receptors"
         ]
         
-        for directory in directories:
-            dir_path = self.project_root / directory
-            dir_path.mkdir(parents=True, exist_ok=True)
+        # 去重后按深度由浅到深创建，父目录已存在时每个子目录只需一次mkdir
+        for directory in sorted(set(directories), key=lambda d: (d.count('/'), d)):
+            os.makedirs(self.project_root / directory, exist_ok=True)
         
         print(f"{Colors.GREEN}✅ 项目目录创建成功{Colors.END}")
     
@@ -330,7 +405,7 @@ class Installer:
         """验证安装"""
         print(f"{Colors.BLUE}🔍 验证安装...{Colors.END}")
         
-        python_cmd = self.get_python_command()
+        python_cmd = self.python_command
         
         try:
             # 测试Python导入
@@ -338,13 +413,30 @@ class Installer:
                 'numpy', 'pandas', 'requests', 'yaml'
             ]
             
+            # 在同一个子进程中依次导入，以JSON返回各模块版本（导入失败为null）
+            script = (
+                "import importlib, json, sys\n"
+                "versions = {}\n"
+                "for name in sys.argv[1:]:\n"
+                "    try:\n"
+                "        versions[name] = getattr(importlib.import_module(name), '__version__', 'unknown')\n"
+                "    except Exception:\n"
+                "        versions[name] = None\n"
+                "print(json.dumps(versions))\n"
+            )
+            result = subprocess.run([
+                python_cmd, '-c', script, *test_imports
+            ], capture_output=True, text=True)
+            
+            try:
+                versions = json.loads(result.stdout) if result.returncode == 0 else {}
+            except ValueError:
+                versions = {}
+            
             for module in test_imports:
-                result = subprocess.run([
-                    python_cmd, '-c', f'import {module}; print(f"{module} version: {{getattr({module}, \"__version__\", \"unknown\")}}")'
-                ], capture_output=True, text=True)
-                
-                if result.returncode == 0:
-                    print(f"{Colors.GREEN}✅ {module}: {result.stdout.strip()}{Colors.END}")
+                version = versions.get(module)
+                if version is not None:
+                    print(f"{Colors.GREEN}✅ {module}: {module} version: {version}{Colors.END}")
                 else:
                     print(f"{Colors.RED}❌ {module}: 导入失败{Colors.END}")
             
@@ -357,7 +449,7 @@ class Installer:
     
     def print_success_message(self):
         """打印成功消息"""
-        python_cmd = self.get_python_command()
+        python_cmd = self.python_command
         
         success_message = f"""
 {Colors.GREEN}{Colors.BOLD}
@@ -113,6 +113,7 @@ setup(
         ],
         "database": [
             "psycopg2-binary>=2.9.0",
+            "psycopg[binary]>=3.1",
             "neo4j>=4.4.0",
             "sqlalchemy>=1.4.0",
             "redis>=4.0.0",
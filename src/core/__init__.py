@@ -2,25 +2,63 @@
 """
 AI-Drug Peptide - 核心模块
 包含数据管理、分析引擎、工作流编排、报告生成和工具管理
+
+各子模块依赖numpy/pandas/matplotlib等重量级库，按需在首次访问时导入（PEP 562）
 """
 
-from .data.manager import DataManager
-from .analysis.engine import AnalysisEngine
-from .workflow.orchestrator import WorkflowOrchestrator
-from .reporting.generator import (
-    ReportGenerator,
-    VisualizationEngine,
-    ExportManager,
-    ReportGeneratorFactory
-)
-from .utils.manager import (
-    ToolManager,
-    FileManager,
-    NetworkManager,
-    ValidationUtils,
-    ProgressTracker,
-    ToolFactory
-)
+import importlib
+from typing import TYPE_CHECKING
+
+# 导出名称 -> 所在子模块
+_LAZY_IMPORTS = {
+    'DataManager': '.data.manager',
+    'AnalysisEngine': '.analysis.engine',
+    'WorkflowOrchestrator': '.workflow.orchestrator',
+    'ReportGenerator': '.reporting.generator',
+    'VisualizationEngine': '.reporting.generator',
+    'ExportManager': '.reporting.generator',
+    'ReportGeneratorFactory': '.reporting.generator',
+    'ToolManager': '.utils.manager',
+    'FileManager': '.utils.manager',
+    'NetworkManager': '.utils.manager',
+    'ValidationUtils': '.utils.manager',
+    'ProgressTracker': '.utils.manager',
+    'ToolFactory': '.utils.manager',
+}
+
+if TYPE_CHECKING:
+    from .data.manager import DataManager
+    from .analysis.engine import AnalysisEngine
+    from .workflow.orchestrator import WorkflowOrchestrator
+    from .reporting.generator import (
+        ReportGenerator,
+        VisualizationEngine,
+        ExportManager,
+        ReportGeneratorFactory
+    )
+    from .utils.manager import (
+        ToolManager,
+        FileManager,
+        NetworkManager,
+        ValidationUtils,
+        ProgressTracker,
+        ToolFactory
+    )
+
+
+def __getattr__(name):
+    """首次访问导出名称时导入对应子模块，并缓存到模块命名空间"""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
+
 
 __all__ = [
     # 数据管理
@@ -7,15 +7,26 @@ AI-Drug Peptide - 分析引擎模块
 import os
 import json
 import logging
+import sqlite3
+import threading
+import contextlib
 import pandas as pd
 import numpy as np
 from pathlib import Path
+from collections import OrderedDict
 from typing import Dict, List, Any, Optional, Tuple, Union
 from dataclasses import dataclass, asdict
 from datetime import datetime
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
+import random
+import zlib
+import multiprocessing
 from abc import ABC, abstractmethod
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # 生物信息学工具
 try:
@@ -30,7 +41,7 @@ except ImportError:
 
 # 数据库接口
 try:
-    from bioservices import UniProt, String
+    from bioservices import UniProt
     BIOSERVICES_AVAILABLE = True
 except ImportError:
     BIOSERVICES_AVAILABLE = False
@@ -42,8 +53,60 @@ try:
 except ImportError:
     NEO4J_AVAILABLE = False
 
+# orjson（更快的JSON序列化，用于中间结果缓存）
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Numba
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# 模拟物种变体使用的保守氨基酸替换（每个残基两个候选）
+AA_SUBSTITUTIONS = {
+    'A': ['S', 'T'], 'V': ['L', 'I'], 'L': ['I', 'V'],
+    'S': ['T', 'A'], 'T': ['S', 'A'], 'N': ['Q', 'S'],
+    'Q': ['N', 'E'], 'E': ['Q', 'D'], 'D': ['N', 'E'],
+    'K': ['R', 'Q'], 'R': ['K', 'Q'], 'H': ['Y', 'N'],
+    'Y': ['H', 'F'], 'F': ['Y', 'L'], 'W': ['F', 'Y'],
+    'C': ['S', 'A'], 'G': ['A', 'S'], 'P': ['A', 'S'],
+    'M': ['L', 'I']
+}
+
+def _build_substitution_lut() -> np.ndarray:
+    """按ASCII码索引的 (128, 2) 替换查找表，没有替换规则的残基映射为自身"""
+    lut = np.repeat(np.arange(128, dtype=np.uint8)[:, None], 2, axis=1)
+    for aa, candidates in AA_SUBSTITUTIONS.items():
+        lut[ord(aa)] = [ord(candidate) for candidate in candidates]
+    return lut
+
+SUBSTITUTION_LUT = _build_substitution_lut()
+
+# STRING REST API（get_string_ids 与 interaction_partners 都支持一次查询多个蛋白）
+STRING_API_URL = "https://string-db.org/api/json"
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _pairwise_identity(seq_matrix, pair_i, pair_j, lengths):
+        """逐对统计等长序列的一致性，每对只顺序读取两行，不生成 (S, S, L) 中间数组"""
+        identity = np.empty(pair_i.shape[0], dtype=np.float64)
+        for p in prange(pair_i.shape[0]):
+            i = pair_i[p]
+            j = pair_j[p]
+            matches = 0
+            for k in range(lengths[i]):
+                if seq_matrix[i, k] == seq_matrix[j, k]:
+                    matches += 1
+            identity[p] = matches / lengths[i]
+        return identity
+
 @dataclass
 class InteractionResult:
     """相互作用分析结果"""
@@ -87,6 +150,74 @@ class SecretionResult:
     pathway: str
     analysis_timestamp: str
 
+class CacheStore:
+    """基于SQLite的中间结果键值存储，同一数据库文件在进程内共享一个连接"""
+    
+    _instances: Dict[str, 'CacheStore'] = {}
+    _instances_lock = threading.Lock()
+    
+    # 进程内最近使用条目的内存缓存上限，命中时不访问数据库
+    MEMORY_CACHE_SIZE = 4096
+    
+    def __init__(self, db_path: Path):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._memory: 'OrderedDict[str, bytes]' = OrderedDict()
+        self._conn = sqlite3.connect(str(db_path), isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # key为主键，查询直接走SQLite自动建立的B树索引
+        self._conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+    
+    @classmethod
+    def for_path(cls, db_path: Path) -> 'CacheStore':
+        """获取数据库文件对应的共享实例"""
+        key = str(Path(db_path).resolve())
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(Path(db_path))
+            return cls._instances[key]
+    
+    def save(self, key: str, value: bytes):
+        """写入（覆盖）一条缓存"""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO cache (key, value) VALUES (?, ?)", (key, value))
+            self._remember(key, value)
+    
+    def load(self, key: str) -> Optional[bytes]:
+        """读取一条缓存，不存在时返回None"""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return self._memory[key]
+            
+            row = self._conn.execute("SELECT value FROM cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+    
+    def _remember(self, key: str, value: bytes):
+        """记入内存缓存，超出上限时淘汰最久未使用的条目"""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+    
+    @contextlib.contextmanager
+    def transaction(self):
+        """批量写入时合并为一次提交"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                yield self
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                # 回滚的写入可能已记入内存缓存，整体清空
+                self._memory.clear()
+                raise
+            self._conn.execute("COMMIT")
+
 class BaseAnalyzer(ABC):
     """分析器基类"""
     
@@ -94,112 +225,185 @@ class BaseAnalyzer(ABC):
         self.config = config or {}
         self.cache_dir = Path(self.config.get('cache_dir', './data/cache'))
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache_store = CacheStore.for_path(self.cache_dir / "analysis_cache.sqlite")
     
     @abstractmethod
     def analyze(self, input_data: Dict[str, Any]) -> Any:
         """执行分析"""
         pass
     
-    def _save_intermediate_result(self, result: Any, filename: str) -> Path:
-        """保存中间结果"""
-        file_path = self.cache_dir / filename
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(result, f, default=str, indent=2, ensure_ascii=False)
-        return file_path
+    def _save_intermediate_result(self, result: Any, filename: str):
+        """保存中间结果（以文件名为键写入SQLite缓存）"""
+        if ORJSON_AVAILABLE:
+            value = orjson.dumps(result, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+        else:
+            value = json.dumps(result, default=str, ensure_ascii=False).encode('utf-8')
+        self.cache_store.save(filename, value)
     
     def _load_intermediate_result(self, filename: str) -> Optional[Any]:
         """加载中间结果"""
-        file_path = self.cache_dir / filename
-        if file_path.exists():
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        value = self.cache_store.load(filename)
+        if value is None:
+            # 兼容此前写入缓存目录的JSON文件
+            file_path = self.cache_dir / filename
+            if not file_path.exists():
+                return None
+            value = file_path.read_bytes()
+        return orjson.loads(value) if ORJSON_AVAILABLE else json.loads(value)
 
 class StringAnalyzer(BaseAnalyzer):
     """STRING相互作用分析器"""
     
+    # 所有实例共享的HTTP会话，复用到STRING的TCP/TLS连接
+    _shared_session: Optional[requests.Session] = None
+    
     def __init__(self, config: Dict[str, Any] = None):
         super().__init__(config)
         self.species_id = self.config.get('species_id', 9606)  # 默认人类
         self.confidence_threshold = self.config.get('confidence_threshold', 0.9)
-        
-        if BIOSERVICES_AVAILABLE:
-            self.string_service = String(verbose=False)
-        else:
-            logger.warning("Bioservices not available, using mock data")
-            self.string_service = None
+        # 默认使用模拟数据，不访问网络；需要在线查询STRING时显式设置 use_string_api
+        self.use_api = self.config.get('use_string_api', False)
+        self.timeout = self.config.get('timeout', 30)
+        self._session = self._get_session()
+    
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        """获取共享HTTP会话（首次调用时创建）"""
+        if cls._shared_session is None:
+            session = requests.Session()
+            
+            # 配置重试策略（STRING查询是幂等的，POST也可重试）
+            retry_strategy = Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=frozenset(['GET', 'POST'])
+            )
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry_strategy)
+            session.mount("https://", adapter)
+            
+            # requests默认已发送 Accept-Encoding: gzip, deflate，响应压缩传输
+            session.headers.update({'User-Agent': 'AI-Drug-Peptide/1.0'})
+            cls._shared_session = session
+        return cls._shared_session
     
     def analyze(self, input_data: Dict[str, Any]) -> InteractionResult:
         """执行STRING相互作用分析"""
         protein_id = input_data['protein_id']
-        logger.info(f"Starting STRING analysis for protein: {protein_id}")
+        return self.analyze_batch([protein_id])[protein_id]
+    
+    def analyze_batch(self, protein_ids: List[str]) -> Dict[str, InteractionResult]:
+        """批量执行STRING相互作用分析，未缓存的蛋白合并为一次STRING请求"""
+        logger.info(f"Starting STRING analysis for {len(protein_ids)} proteins")
         
         # 检查缓存
-        cache_file = f"string_analysis_{protein_id}_{self.species_id}.json"
-        cached_result = self._load_intermediate_result(cache_file)
-        if cached_result:
-            logger.info("Using cached STRING analysis result")
-            return InteractionResult(**cached_result)
+        results = {}
+        pending = []
+        for protein_id in dict.fromkeys(protein_ids):
+            cached_result = self._load_intermediate_result(self._cache_filename(protein_id))
+            if cached_result:
+                logger.info(f"Using cached STRING analysis result for {protein_id}")
+                results[protein_id] = InteractionResult(**cached_result)
+            else:
+                pending.append(protein_id)
         
-        try:
-            # 获取相互作用数据
-            interactions = self._get_interactions(protein_id)
-            
-            # 过滤高置信度相互作用
-            filtered_interactions = self._filter_interactions(interactions)
-            
-            # 获取文献支持
-            literature_support = self._get_literature_support(protein_id, filtered_interactions)
-            
-            # 创建结果
-            result = InteractionResult(
-                protein_id=protein_id,
-                interacting_proteins=filtered_interactions,
-                confidence_scores=[interaction.get('confidence', 0.0) for interaction in filtered_interactions],
-                literature_support=literature_support,
-                analysis_timestamp=datetime.now().isoformat(),
-                total_interactions=len(filtered_interactions)
-            )
-            
-            # 保存结果
-            self._save_intermediate_result(asdict(result), cache_file)
-            
-            logger.info(f"STRING analysis completed: {len(filtered_interactions)} interactions found")
-            return result
-            
-        except Exception as e:
-            logger.error(f"STRING analysis failed: {e}")
-            raise
-    
-    def _get_interactions(self, protein_id: str) -> List[Dict[str, Any]]:
-        """获取蛋白质相互作用"""
-        if self.string_service:
+        if pending:
             try:
-                # 使用STRING数据库API
-                network_df = self.string_service.network(
-                    identifiers=protein_id,
-                    species=self.species_id,
-                    required_score=int(self.confidence_threshold * 1000),
-                    limit=None
-                )
+                # 一次请求获取所有待分析蛋白的相互作用，再按蛋白分发
+                interactions_by_protein = self._get_interactions_batch(pending)
                 
-                if network_df is not None and not network_df.empty:
-                    interactions = []
-                    for _, row in network_df.iterrows():
-                        interaction = {
-                            'protein_id_a': row.get('proteinId_A', ''),
-                            'protein_id_b': row.get('proteinId_B', ''),
-                            'confidence': row.get('score', 0) / 1000.0,
-                            'predicted_value': row.get('predictedValue', 0)
-                        }
-                        interactions.append(interaction)
-                    return interactions
+                with self.cache_store.transaction():
+                    for protein_id in pending:
+                        interactions = interactions_by_protein.get(protein_id) or self._generate_mock_interactions(protein_id)
+                        results[protein_id] = self._build_result(protein_id, interactions)
                     
             except Exception as e:
-                logger.warning(f"STRING API error: {e}, using mock data")
+                logger.error(f"STRING analysis failed: {e}")
+                raise
         
-        # 使用模拟数据
-        return self._generate_mock_interactions(protein_id)
+        return {protein_id: results[protein_id] for protein_id in protein_ids}
+    
+    def _cache_filename(self, protein_id: str) -> str:
+        """单个蛋白的缓存文件名"""
+        return f"string_analysis_{protein_id}_{self.species_id}.json"
+    
+    def _build_result(self, protein_id: str, interactions: List[Dict[str, Any]]) -> InteractionResult:
+        """过滤相互作用、补充文献支持并缓存单个蛋白的结果"""
+        # 过滤高置信度相互作用
+        filtered_interactions = self._filter_interactions(interactions)
+        
+        # 获取文献支持
+        literature_support = self._get_literature_support(protein_id, filtered_interactions)
+        
+        # 创建结果
+        result = InteractionResult(
+            protein_id=protein_id,
+            interacting_proteins=filtered_interactions,
+            confidence_scores=[interaction.get('confidence', 0.0) for interaction in filtered_interactions],
+            literature_support=literature_support,
+            analysis_timestamp=datetime.now().isoformat(),
+            total_interactions=len(filtered_interactions)
+        )
+        
+        # 保存结果
+        self._save_intermediate_result(asdict(result), self._cache_filename(protein_id))
+        
+        logger.info(f"STRING analysis completed for {protein_id}: {len(filtered_interactions)} interactions found")
+        return result
+    
+    def _get_interactions_batch(self, protein_ids: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """批量获取多个蛋白的相互作用，按查询蛋白分组；失败时返回空字典（使用模拟数据）"""
+        if not self.use_api:
+            return {}
+        
+        try:
+            # 先将输入ID（基因名、UniProt登录号或STRING ID）解析为STRING ID，再一次查询全部相互作用
+            id_rows = self._post_string('get_string_ids', {
+                'identifiers': '\r'.join(protein_ids),
+                'species': self.species_id,
+                'limit': 1
+            })
+            string_ids = {}
+            for row in id_rows:
+                string_ids.setdefault(row['stringId'], protein_ids[row['queryIndex']])
+            
+            unresolved = set(protein_ids) - set(string_ids.values())
+            if unresolved:
+                logger.warning(f"STRING could not resolve identifiers, using mock data: {', '.join(sorted(unresolved))}")
+            if not string_ids:
+                return {}
+            
+            rows = self._post_string('interaction_partners', {
+                'identifiers': '\r'.join(string_ids),
+                'species': self.species_id,
+                'required_score': int(self.confidence_threshold * 1000)
+            })
+        except (requests.RequestException, ValueError, KeyError, IndexError) as e:
+            logger.warning(f"STRING API error: {e}, using mock data")
+            return {}
+        
+        # 返回行的A端为查询蛋白，按STRING ID对应回输入ID
+        interactions_by_protein: Dict[str, List[Dict[str, Any]]] = {}
+        for row in rows:
+            protein_id = string_ids.get(row.get('stringId_A'))
+            if protein_id is None:
+                continue
+            interactions_by_protein.setdefault(protein_id, []).append({
+                'protein_id_a': protein_id,
+                'protein_id_b': row.get('preferredName_B', ''),
+                'confidence': float(row.get('score', 0.0)),
+                'predicted_value': float(row.get('escore', 0.0))
+            })
+        
+        return interactions_by_protein
+    
+    def _post_string(self, endpoint: str, data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """向STRING API的指定端点发送POST请求并返回JSON行"""
+        response = self._session.post(f"{STRING_API_URL}/{endpoint}",
+                                      data={**data, 'caller_identity': 'AI-Drug-Peptide'},
+                                      timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
     
     def _generate_mock_interactions(self, protein_id: str) -> List[Dict[str, Any]]:
         """生成模拟相互作用数据"""
@@ -239,16 +443,26 @@ class StringAnalyzer(BaseAnalyzer):
     
     def _filter_interactions(self, interactions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """过滤相互作用"""
-        filtered = []
-        for interaction in interactions:
-            if interaction['confidence'] >= self.confidence_threshold:
-                # 添加额外信息
-                interaction['receptor_id'] = interaction['protein_id_b']
-                interaction['gene_name'] = interaction['protein_id_b']
-                interaction['organism'] = 'Homo sapiens'
-                interaction['uniprot_id'] = f"P{np.random.randint(10000, 99999)}"
-                interaction['pdb_id'] = f"{np.random.randint(1, 9)}{chr(np.random.randint(65, 91))}{np.random.randint(10, 99)}"
-                filtered.append(interaction)
+        filtered = [
+            interaction for interaction in interactions
+            if interaction['confidence'] >= self.confidence_threshold
+        ]
+        
+        # 模拟的UniProt/PDB编号一次性批量抽取
+        n = len(filtered)
+        rng = np.random.default_rng()
+        uniprot_numbers = rng.integers(10000, 99999, n)
+        pdb_digits = rng.integers(1, 9, n)
+        pdb_letters = rng.integers(65, 91, n)
+        pdb_numbers = rng.integers(10, 99, n)
+        
+        for k, interaction in enumerate(filtered):
+            # 添加额外信息
+            interaction['receptor_id'] = interaction['protein_id_b']
+            interaction['gene_name'] = interaction['protein_id_b']
+            interaction['organism'] = 'Homo sapiens'
+            interaction['uniprot_id'] = f"P{uniprot_numbers[k]}"
+            interaction['pdb_id'] = f"{pdb_digits[k]}{chr(pdb_letters[k])}{pdb_numbers[k]}"
         
         return filtered
     
@@ -263,6 +477,26 @@ class StringAnalyzer(BaseAnalyzer):
         
         return literature_support
 
+def _run_docking(protein_id: str, receptor: Dict[str, Any], energy_threshold: float) -> DockingResult:
+    """运行分子对接（模块级函数，可在子进程中执行）"""
+    # 模拟对接过程；每次调用独立取随机种子，避免fork出的子进程继承相同的随机状态
+    rng = random.Random()
+    
+    # 生成模拟结合能
+    base_energy = rng.uniform(-12.0, -5.0)
+    success_rate = rng.uniform(0.7, 1.0)
+    conformations = rng.randint(5, 15)
+    
+    return DockingResult(
+        protein_id=protein_id,
+        receptor_id=receptor['receptor_id'],
+        binding_energy=base_energy,
+        success_rate=success_rate,
+        conformations=conformations,
+        high_affinity=base_energy < energy_threshold,
+        docking_timestamp=datetime.now().isoformat()
+    )
+
 class DockingPredictor(BaseAnalyzer):
     """分子对接预测器"""
     
@@ -271,6 +505,9 @@ class DockingPredictor(BaseAnalyzer):
         self.energy_threshold = self.config.get('energy_threshold', -7.0)
         self.max_runs = self.config.get('max_runs', 3)
         self.box_size = self.config.get('box_size', [20, 20, 20])
+        # 当前对接为模拟计算，默认在本进程执行；接入真实对接程序后可配置 workers 并行
+        self.workers = self.config.get('workers') or 1
+        self._executor: Optional[ProcessPoolExecutor] = None
     
     def analyze(self, input_data: Dict[str, Any]) -> List[DockingResult]:
         """执行分子对接预测"""
@@ -279,54 +516,70 @@ class DockingPredictor(BaseAnalyzer):
         
         logger.info(f"Starting docking prediction for protein: {protein_id}")
         
-        results = []
-        for receptor in receptors:
+        # 检查缓存（在主进程中完成，命中缓存的受体不提交到进程池）
+        results: Dict[int, DockingResult] = {}
+        pending = []
+        for index, receptor in enumerate(receptors):
             try:
-                # 检查缓存
                 cache_file = f"docking_{protein_id}_{receptor['receptor_id']}.json"
                 cached_result = self._load_intermediate_result(cache_file)
                 
                 if cached_result:
                     logger.info(f"Using cached docking result for {receptor['receptor_id']}")
-                    results.append(DockingResult(**cached_result))
-                    continue
-                
-                # 执行对接
-                docking_result = self._run_docking(protein_id, receptor)
-                
-                # 保存结果
-                self._save_intermediate_result(asdict(docking_result), cache_file)
-                results.append(docking_result)
-                
+                    results[index] = DockingResult(**cached_result)
+                else:
+                    pending.append((index, receptor, cache_file))
+                    
             except Exception as e:
                 logger.error(f"Docking failed for receptor {receptor['receptor_id']}: {e}")
                 continue
         
-        logger.info(f"Docking prediction completed: {len(results)} results")
-        return results
-    
-    def _run_docking(self, protein_id: str, receptor: Dict[str, Any]) -> DockingResult:
-        """运行分子对接"""
-        # 模拟对接过程
-        import random
-        
-        # 生成模拟结合能
-        base_energy = random.uniform(-12.0, -5.0)
-        success_rate = random.uniform(0.7, 1.0)
-        conformations = random.randint(5, 15)
-        
-        result = DockingResult(
-            protein_id=protein_id,
-            receptor_id=receptor['receptor_id'],
-            binding_energy=base_energy,
-            success_rate=success_rate,
-            conformations=conformations,
-            high_affinity=base_energy < self.energy_threshold,
-            docking_timestamp=datetime.now().isoformat()
-        )
-        
-        logger.info(f"Docking completed for {receptor['receptor_id']}: {base_energy:.2f} kcal/mol")
-        return result
+        if self.workers <= 1 or len(pending) <= 1:
+            # 单进程配置或只有一个待对接受体时直接在当前进程执行
+            for index, receptor, cache_file in pending:
+                try:
+                    docking_result = _run_docking(protein_id, receptor, self.energy_threshold)
+                    results[index] = self._store_docking_result(docking_result, cache_file)
+                except Exception as e:
+                    logger.error(f"Docking failed for receptor {receptor['receptor_id']}: {e}")
+        else:
+            # 各受体的对接相互独立，分发到预测器共用的进程池并行执行
+            executor = self._get_executor()
+            futures = {
+                executor.submit(_run_docking, protein_id, receptor, self.energy_threshold): (index, receptor, cache_file)
+                for index, receptor, cache_file in pending
+            }
+            for future in as_completed(futures):
+                index, receptor, cache_file = futures[future]
+                try:
+                    results[index] = self._store_docking_result(future.result(), cache_file)
+                except Exception as e:
+                    logger.error(f"Docking failed for receptor {receptor['receptor_id']}: {e}")
+        
+        # 按输入受体顺序返回
+        docking_results = [results[index] for index in sorted(results)]
+        logger.info(f"Docking prediction completed: {len(docking_results)} results")
+        return docking_results
+    
+    def _store_docking_result(self, docking_result: DockingResult, cache_file: str) -> DockingResult:
+        """记录并缓存单个对接结果（只在主进程写缓存，避免并发写入）"""
+        logger.info(f"Docking completed for {docking_result.receptor_id}: {docking_result.binding_energy:.2f} kcal/mol")
+        self._save_intermediate_result(asdict(docking_result), cache_file)
+        return docking_result
+    
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """获取预测器共用的进程池（首次使用时创建）"""
+        if self._executor is None:
+            # spawn启动的子进程不继承父进程的SQLite连接和锁
+            ctx = multiprocessing.get_context('spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=ctx)
+        return self._executor
+    
+    def close(self):
+        """关闭进程池"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
 
 class ConservationAnalyzer(BaseAnalyzer):
     """保守性分析器"""
@@ -336,6 +589,10 @@ class ConservationAnalyzer(BaseAnalyzer):
         self.target_species = self.config.get('target_species', ['human', 'mouse'])
         self.conservation_threshold = self.config.get('conservation_threshold', 0.8)
         self.binding_window = self.config.get('binding_window', 30)
+        
+        if NUMBA_AVAILABLE:
+            # 预热JIT，避免首次分析时的编译延迟
+            _pairwise_identity(np.zeros((2, 4), dtype=np.uint8), np.array([0]), np.array([1]), np.array([4, 4]))
     
     def analyze(self, input_data: Dict[str, Any]) -> ConservationResult:
         """执行保守性分析"""
@@ -399,32 +656,23 @@ class ConservationAnalyzer(BaseAnalyzer):
     
     def _generate_species_variant(self, sequence: str, species: str) -> str:
         """生成物种特异的序列变体"""
-        import random
-        
-        # 设置随机种子以确保可重现性
-        random.seed(hash(species) % 2**32)
-        
-        sequence_list = list(sequence)
         mutation_rate = 0.05 if species == 'mouse' else 0.03  # 小鼠变异率稍高
+        return self._mutate_sequence(sequence, species, mutation_rate)
+    
+    @staticmethod
+    @lru_cache(maxsize=512)
+    def _mutate_sequence(sequence: str, species: str, mutation_rate: float) -> str:
+        """按突变率对序列施加随机保守替换；结果只由参数决定，相同输入直接复用缓存"""
+        # 以物种名的CRC32作为随机种子，跨进程可重现（内置hash受PYTHONHASHSEED影响）
+        rng = np.random.default_rng(zlib.crc32(species.encode('utf-8')))
         
-        # 应用随机突变
-        for i in range(len(sequence_list)):
-            if random.random() < mutation_rate:
-                # 简单的氨基酸替换
-                current_aa = sequence_list[i]
-                substitutions = {
-                    'A': ['S', 'T'], 'V': ['L', 'I'], 'L': ['I', 'V'],
-                    'S': ['T', 'A'], 'T': ['S', 'A'], 'N': ['Q', 'S'],
-                    'Q': ['N', 'E'], 'E': ['Q', 'D'], 'D': ['N', 'E'],
-                    'K': ['R', 'Q'], 'R': ['K', 'Q'], 'H': ['Y', 'N'],
-                    'Y': ['H', 'F'], 'F': ['Y', 'L'], 'W': ['F', 'Y'],
-                    'C': ['S', 'A'], 'G': ['A', 'S'], 'P': ['A', 'S'],
-                    'M': ['L', 'I']
-                }
-                if current_aa in substitutions:
-                    sequence_list[i] = random.choice(substitutions[current_aa])
+        # 一次抽取所有突变位点及其替换候选，通过查找表完成简单的氨基酸替换
+        residues = np.frombuffer(sequence.encode('ascii'), dtype=np.uint8).copy()
+        positions = np.flatnonzero(rng.random(residues.size) < mutation_rate)
+        choices = rng.integers(0, 2, positions.size)
+        residues[positions] = SUBSTITUTION_LUT[residues[positions], choices]
         
-        return ''.join(sequence_list)
+        return residues.tobytes().decode('ascii')
     
     def _locate_binding_pockets(self, homolog_sequences: Dict[str, str]) -> Dict[str, str]:
         """定位结合口袋区域"""
@@ -476,19 +724,25 @@ class ConservationAnalyzer(BaseAnalyzer):
         if len(sequence_list) < 2:
             return [0.0]
         
-        conservation_scores = []
+        # 序列以0填充到相同长度，堆叠为 (S, L) 的字节矩阵
+        lengths = np.array([len(seq) for seq in sequence_list])
+        seq_matrix = np.zeros((len(sequence_list), lengths.max()), dtype=np.uint8)
+        for k, seq in enumerate(sequence_list):
+            seq_matrix[k, :len(seq)] = np.frombuffer(seq.encode('ascii'), dtype=np.uint8)
         
-        # 计算每对序列的一致性
-        for i in range(len(sequence_list)):
-            for j in range(i + 1, len(sequence_list)):
-                seq1, seq2 = sequence_list[i], sequence_list[j]
-                
-                if len(seq1) == len(seq2):
-                    matches = sum(1 for a, b in zip(seq1, seq2) if a == b)
-                    identity = matches / len(seq1)
-                    conservation_scores.append(identity)
+        # 按 (i, j), i < j 的顺序取序列对，只比较等长序列
+        i, j = np.triu_indices(len(sequence_list), k=1)
+        comparable = (lengths[i] == lengths[j]) & (lengths[i] > 0)
+        i, j = i[comparable], j[comparable]
+        
+        if NUMBA_AVAILABLE:
+            return _pairwise_identity(seq_matrix, i, j, lengths).tolist()
+        
+        # 一次广播比较所有序列对，填充位不计入匹配
+        matches = (seq_matrix[:, None, :] == seq_matrix[None, :, :]) & (seq_matrix[None, :, :] != 0)
+        match_counts = matches.sum(axis=2)
         
-        return conservation_scores
+        return (match_counts[i, j] / lengths[i]).tolist()
 
 class SecretionAnalyzer(BaseAnalyzer):
     """分泌分析器"""
@@ -4,13 +4,66 @@ Test script for Secretion Analysis System
 测试分泌分析系统的基本功能
 """
 
+import io
 import os
 import sys
+import logging
 import tempfile
+from dataclasses import replace
 from pathlib import Path
 
-# 添加当前目录到Python路径
+# 添加当前目录和 bin/ 目录到Python路径
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'bin'))
+
+# SignalP 6.0 short格式多序列输出（P3 使用逗号小数点，P4 带描述）
+SIGNALP_BATCH_OUTPUT = """# SignalP-6.0	Organism: Eukarya	Timestamp: 20240101000000
+# ID	Prediction	SP(Sec/SPI)	OTHER	CS Position	Pr(SP)
+P1	SP	0.97	0.85	22	0.99
+P2	OTHER	0.03	0.01	-	0.02
+P3	SP	0,88	0,70	19	0,90
+P4 secreted protein	SP	0.75	0.60	25	0.80
+"""
+
+# TMHMM 长格式多序列输出（P1 两个跨膜螺旋，P2 无跨膜螺旋，P3 不在输出中）
+TMHMM_BATCH_OUTPUT = """# P1 Length: 300
+# P1 Number of predicted TMHs:  2
+P1	TMHMM2.0	outside	1	40
+P1	TMHMM2.0	TMhelix	41	63
+P1	TMHMM2.0	inside	64	100
+P1	TMHMM2.0	TMhelix	101	123
+P1	TMHMM2.0	outside	124	300
+# P2 Length: 200
+# P2 Number of predicted TMHs:  0
+P2	TMHMM2.0	outside	1	200
+"""
+
+
+def _bare_analyzer(temp_dir: Path):
+    """不连接数据库、只带批量预测所需属性的分析器"""
+    from secretion_analysis import SecretionAnalyzer
+    
+    analyzer = SecretionAnalyzer.__new__(SecretionAnalyzer)
+    analyzer.logger = logging.getLogger("test_secretion_analysis")
+    analyzer.cache_dir = temp_dir / "cache"
+    tools_dir = temp_dir / "tools"
+    tools_dir.mkdir(exist_ok=True)
+    analyzer.signalp_path = str(tools_dir / "signalp")
+    analyzer.tmhmm_path = str(tools_dir / "tmhmm")
+    return analyzer
+
+
+def _fake_tool(path: Path, output: str) -> None:
+    """写一个把固定输出打印到stdout的假外部工具"""
+    fixture = path.with_suffix('.out')
+    fixture.write_text(output)
+    path.write_text(f"#!/bin/sh\ncat '{fixture}'\n")
+    path.chmod(0o755)
+
+
+def _test_proteins(*protein_ids):
+    return [{'protein_id': protein_id, 'sequence': 'MKVLLA' * (i + 5)}
+            for i, protein_id in enumerate(protein_ids)]
 
 def test_import_modules():
     """测试模块导入"""
@@ -219,6 +272,167 @@ TMhelix: 100-120 119-139
         print(f"✗ TMHMM parsing test failed: {e}")
         return False
 
+def test_signalp_batch_parsing():
+    """测试SignalP多序列输出的批量解析"""
+    print("\nTesting SignalP batch output parsing...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        analyzer = _bare_analyzer(Path(temp_dir))
+        results = analyzer._signalp_results(analyzer._read_signalp_table(io.StringIO(SIGNALP_BATCH_OUTPUT)))
+    
+    # 输出中的每个ID都记为已预测，非分泌蛋白为None
+    assert set(results) == {'P1', 'P2', 'P3', 'P4'}
+    assert results['P2'] is None
+    assert results['P4'] is None  # 概率 0.75 低于 0.8 阈值
+    
+    assert results['P1'].protein_id == 'P1'
+    assert results['P1'].secretion_probability == 0.97
+    assert results['P1'].cleavage_site == 22
+    assert results['P1'].confidence == "High"
+    
+    # 逗号小数点按本地化数值解析
+    assert results['P3'].secretion_probability == 0.88
+    assert results['P3'].cleavage_site == 19
+    assert results['P3'].confidence == "Medium"
+    print("✓ SignalP batch parsing successful")
+
+
+def test_signalp_batch_run():
+    """测试一次调用SignalP处理多个蛋白（流式解析stdout）"""
+    print("\nTesting SignalP batch run...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        analyzer = _bare_analyzer(temp_dir)
+        _fake_tool(Path(analyzer.signalp_path), SIGNALP_BATCH_OUTPUT)
+        
+        results = analyzer._run_signalp_batch(_test_proteins('P1', 'P2', 'P3', 'P5'), temp_dir)
+    
+    # P5 不在输出中，留给逐个回退
+    assert set(results) == {'P1', 'P2', 'P3', 'P4'}
+    assert results['P1'].cleavage_site == 22
+    assert results['P2'] is None
+    print("✓ SignalP batch run successful")
+
+
+def test_tmhmm_batch_parsing():
+    """测试TMHMM多序列输出的分块解析"""
+    print("\nTesting TMHMM batch output parsing...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        analyzer = _bare_analyzer(Path(temp_dir))
+        # 块大小小于单个蛋白的记录数，验证跨块拼接
+        chunks = list(analyzer._iter_tmhmm_table(io.StringIO(TMHMM_BATCH_OUTPUT), chunksize=2))
+    
+    assert len(chunks) > 1
+    helices = [analyzer._tm_helices(chunk) for chunk in chunks]
+    regions = [(protein_id, start, end) for h in helices
+               for protein_id, start, end in zip(h['id'], h['start'].tolist(), h['end'].tolist())]
+    assert regions == [('P1', 41, 63), ('P1', 101, 123)]
+    print("✓ TMHMM batch parsing successful")
+
+
+def test_tmhmm_batch_run():
+    """测试一次调用TMHMM处理多个蛋白，按蛋白整理跨膜螺旋"""
+    print("\nTesting TMHMM batch run...")
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        analyzer = _bare_analyzer(temp_dir)
+        _fake_tool(Path(analyzer.tmhmm_path), TMHMM_BATCH_OUTPUT)
+        
+        results = analyzer._run_tmhmm_batch(_test_proteins('P1', 'P2', 'P3'), temp_dir)
+    
+    # P3 不在输出中，不计入批量结果
+    assert set(results) == {'P1', 'P2'}
+    assert results['P1'].tm_count == 2
+    assert results['P1'].tm_regions == [(41, 63), (101, 123)]
+    assert results['P1'].topology == "2-pass membrane protein"
+    assert results['P1'].intracellular_start == 64
+    assert results['P2'].tm_count == 0
+    assert results['P2'].topology == "Soluble"
+    print("✓ TMHMM batch run successful")
+
+
+def test_prediction_cache():
+    """测试按序列哈希的预测结果缓存"""
+    print("\nTesting prediction result cache...")
+    from secretion_analysis import SignalPeptideResult
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        analyzer = _bare_analyzer(Path(temp_dir))
+        p1, p2, p3 = _test_proteins('P1', 'P2', 'P3')
+        result = SignalPeptideResult(
+            protein_id='P1', signal_peptide_start=1, signal_peptide_end=22, cleavage_site=22,
+            secretion_probability=0.97, signal_sequence="", confidence="High"
+        )
+        analyzer._store_cached_result('signalp', analyzer.signalp_path, p1, result)
+        analyzer._store_cached_result('signalp', analyzer.signalp_path, p2, None)
+        
+        # 相同序列、不同ID的蛋白命中同一缓存，结果改用自己的ID
+        same_sequence = {'protein_id': 'P1_ALIAS', 'sequence': p1['sequence']}
+        hits = analyzer._load_cached_results('signalp', analyzer.signalp_path, [p1, p2, p3, same_sequence])
+        assert hits['P1'] == result
+        assert hits['P1_ALIAS'] == replace(result, protein_id='P1_ALIAS')
+        assert 'P2' in hits and hits['P2'] is None  # 非分泌蛋白也缓存
+        assert 'P3' not in hits
+        
+        # 更换工具路径后缓存失效
+        assert analyzer._load_cached_results('signalp', '/other/signalp', [p1]) == {}
+        
+        # 损坏的缓存文件被忽略
+        analyzer._cache_file('signalp', analyzer.signalp_path, p1['sequence']).write_bytes(b'not a pickle')
+        assert 'P1' not in analyzer._load_cached_results('signalp', analyzer.signalp_path, [p1])
+    print("✓ Prediction cache successful")
+
+
+def test_bulk_insert():
+    """测试批量写入：psycopg3 使用COPY逐行写入，空数据不执行任何语句"""
+    print("\nTesting bulk insert...")
+    import secretion_analysis
+    
+    class FakeCopy:
+        def __init__(self, statement, written):
+            self.statement = statement
+            self.written = written
+        
+        def __enter__(self):
+            return self
+        
+        def __exit__(self, *exc):
+            return False
+        
+        def write_row(self, row):
+            self.written.append(row)
+    
+    class FakeCursor:
+        def __init__(self):
+            self.statements = []
+            self.written = []
+        
+        def copy(self, statement):
+            self.statements.append(statement)
+            return FakeCopy(statement, self.written)
+    
+    saved = secretion_analysis.PSYCOPG3_AVAILABLE
+    secretion_analysis.PSYCOPG3_AVAILABLE = True
+    try:
+        cursor = FakeCursor()
+        rows = [('P1', 0.97, 22), ('P2', 0.2, 0)]
+        secretion_analysis.SecretionAnalyzer._bulk_insert(
+            cursor, 'secretion_analysis_results', ['protein_id', 'secretion_probability', 'cleavage_site'], rows)
+        assert cursor.statements == [
+            "COPY secretion_analysis_results (protein_id, secretion_probability, cleavage_site) FROM STDIN"
+        ]
+        assert cursor.written == rows
+        
+        empty_cursor = FakeCursor()
+        secretion_analysis.SecretionAnalyzer._bulk_insert(empty_cursor, 'hpa_tissue_expression', ['protein_id'], [])
+        assert empty_cursor.statements == [] and empty_cursor.written == []
+    finally:
+        secretion_analysis.PSYCOPG3_AVAILABLE = saved
+    print("✓ Bulk insert successful")
+
 def test_visualization():
     """测试可视化组件"""
     print("\nTesting visualization components...")
@@ -262,6 +476,12 @@ def run_all_tests():
         test_config_loading,
         test_signalp_simulation,
         test_tmhmm_simulation,
+        test_signalp_batch_parsing,
+        test_signalp_batch_run,
+        test_tmhmm_batch_parsing,
+        test_tmhmm_batch_run,
+        test_prediction_cache,
+        test_bulk_insert,
         test_visualization
     ]
     
@@ -269,8 +489,12 @@ def run_all_tests():
     total = len(tests)
     
     for test in tests:
-        if test():
-            passed += 1
+        # 基于assert的测试成功时返回None，失败时抛出异常
+        try:
+            if test() is not False:
+                passed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__} failed: {e!r}")
         print()
     
     print("="*60)
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+分析引擎单元测试：SQLite中间结果缓存与保守性打分
+"""
+
+import json
+
+import pytest
+
+from src.core.analysis import engine
+from src.core.analysis.engine import CacheStore, ConservationAnalyzer
+
+
+def _baseline_conservation(sequence_list):
+    """向量化之前的逐对循环实现，作为保守性得分的参照"""
+    conservation_scores = []
+    for i in range(len(sequence_list)):
+        for j in range(i + 1, len(sequence_list)):
+            seq1, seq2 = sequence_list[i], sequence_list[j]
+            if len(seq1) == len(seq2):
+                matches = sum(1 for a, b in zip(seq1, seq2) if a == b)
+                conservation_scores.append(matches / len(seq1))
+    return conservation_scores
+
+
+CONSERVATION_SEQUENCES = {
+    'human': "MKWVTFISLLFLFSSAYSRGVFRRDAHKSE",
+    'mouse': "MKWVTFISLLLLFSSAYSRGVFRRDAHKSQ",
+    'rat': "MKWVTLISLLFLFSSAYSRGVFRRDTHKSE",
+    'zebrafish': "MKWVT",  # 长度不同，不参与比较
+    'macaque': "AKWVTFISLLFLFSSAYSRGVFRRDAHKSE",
+}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CacheStore.for_path(tmp_path / "analysis_cache.sqlite")
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return ConservationAnalyzer({'cache_dir': str(tmp_path / "cache")})
+
+
+@pytest.mark.unit
+class TestCacheStore:
+    def test_save_load_round_trip(self, store):
+        assert store.load("missing") is None
+
+        store.save("key", b"value")
+        assert store.load("key") == b"value"
+
+        store.save("key", b"replaced")
+        assert store.load("key") == b"replaced"
+
+    def test_values_persist_across_instances(self, tmp_path):
+        db_path = tmp_path / "persist.sqlite"
+        CacheStore(db_path).save("key", b"value")
+        assert CacheStore(db_path).load("key") == b"value"
+
+    def test_for_path_shares_instance(self, tmp_path):
+        db_path = tmp_path / "shared.sqlite"
+        assert CacheStore.for_path(db_path) is CacheStore.for_path(tmp_path / "." / "shared.sqlite")
+
+    def test_memory_cache_serves_hits_without_sqlite(self, store):
+        store.save("key", b"value")
+        # 直接删除数据库中的行，内存缓存仍然命中
+        store._conn.execute("DELETE FROM cache WHERE key = ?", ("key",))
+        assert store.load("key") == b"value"
+
+    def test_memory_cache_evicts_least_recently_used(self, store):
+        store.MEMORY_CACHE_SIZE = 2
+        store.save("a", b"1")
+        store.save("b", b"2")
+        store.load("a")  # a 变为最近使用
+        store.save("c", b"3")
+
+        assert list(store._memory) == ["a", "c"]
+        # 被淘汰的条目仍可从SQLite读取，并重新记入内存缓存
+        assert store.load("b") == b"2"
+        assert list(store._memory) == ["c", "b"]
+
+    def test_transaction_commits(self, store):
+        with store.transaction():
+            store.save("a", b"1")
+            store.save("b", b"2")
+
+        store._memory.clear()
+        assert store.load("a") == b"1"
+        assert store.load("b") == b"2"
+
+    def test_transaction_rolls_back_on_error(self, store):
+        store.save("kept", b"old")
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                store.save("kept", b"new")
+                store.save("dropped", b"value")
+                raise RuntimeError("abort")
+
+        # 回滚后内存缓存不能返回未提交的写入
+        assert store.load("kept") == b"old"
+        assert store.load("dropped") is None
+
+
+@pytest.mark.unit
+class TestIntermediateResults:
+    def test_round_trip(self, analyzer):
+        result = {'protein_id': 'P1', 'scores': [0.5, 0.75], 'nested': {'ok': True}}
+        analyzer._save_intermediate_result(result, "result_P1.json")
+        assert analyzer._load_intermediate_result("result_P1.json") == result
+
+    def test_missing_result(self, analyzer):
+        assert analyzer._load_intermediate_result("missing.json") is None
+
+    def test_legacy_json_file_fallback(self, analyzer):
+        legacy = {'protein_id': 'P2', 'avg_conservation': 0.9}
+        (analyzer.cache_dir / "legacy_P2.json").write_text(json.dumps(legacy), encoding='utf-8')
+        assert analyzer._load_intermediate_result("legacy_P2.json") == legacy
+
+    def test_store_takes_precedence_over_legacy_file(self, analyzer):
+        (analyzer.cache_dir / "result_P3.json").write_text(json.dumps({'source': 'file'}), encoding='utf-8')
+        analyzer._save_intermediate_result({'source': 'store'}, "result_P3.json")
+        assert analyzer._load_intermediate_result("result_P3.json") == {'source': 'store'}
+
+
+@pytest.mark.unit
+class TestConservation:
+    def _scores(self, analyzer):
+        return analyzer._calculate_conservation({'sequences': dict(CONSERVATION_SEQUENCES)})
+
+    def test_numpy_path_matches_baseline(self, analyzer, monkeypatch):
+        monkeypatch.setattr(engine, 'NUMBA_AVAILABLE', False)
+        expected = _baseline_conservation(list(CONSERVATION_SEQUENCES.values()))
+        assert self._scores(analyzer) == pytest.approx(expected)
+
+    @pytest.mark.skipif(not engine.NUMBA_AVAILABLE, reason="numba not installed")
+    def test_numba_path_matches_baseline(self, analyzer):
+        expected = _baseline_conservation(list(CONSERVATION_SEQUENCES.values()))
+        assert self._scores(analyzer) == pytest.approx(expected)
+
+    def test_single_sequence(self, analyzer):
+        assert analyzer._calculate_conservation({'sequences': {'human': "MKWVT"}}) == [0.0]
+
+    def test_identical_sequences(self, analyzer, monkeypatch):
+        monkeypatch.setattr(engine, 'NUMBA_AVAILABLE', False)
+        sequences = {'human': "MKWVT", 'mouse': "MKWVT", 'rat': "MKWVT"}
+        assert analyzer._calculate_conservation({'sequences': sequences}) == [1.0, 1.0, 1.0]